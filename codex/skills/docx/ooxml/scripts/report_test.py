@@ -0,0 +1,142 @@
+import unittest
+import contextlib
+import io
+from types import SimpleNamespace
+from validation.report import ValidationReport, _errors_from_output
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestErrorsFromOutput(unittest.TestCase):
+
+    def test_errors_and_details(self):
+        """Test that two-space lines are errors and four-space lines their details"""
+        lines = [
+            "FAILED - Found 2 XSD validation errors:",
+            "  word/document.xml: Line 3: Element 'w:bogus': This element is not expected.",
+            "    Expected is one of ( w:p, w:tbl ).",
+            "    Second detail",
+            "",
+            "  word/styles.xml: Line 1: Missing attribute",
+        ]
+        self.assertEqual(
+            _errors_from_output(lines),
+            [
+                {
+                    "message": "word/document.xml: Line 3: Element 'w:bogus': "
+                    "This element is not expected.",
+                    "details": ["Expected is one of ( w:p, w:tbl ).", "Second detail"],
+                },
+                {
+                    "message": "word/styles.xml: Line 1: Missing attribute",
+                    "details": [],
+                },
+            ],
+        )
+
+    def test_failure_without_errors(self):
+        """Test that a FAILED line listing no errors is reported itself"""
+        self.assertEqual(
+            _errors_from_output(["FAILED - Could not open the original document"]),
+            [{"message": "Could not open the original document", "details": []}],
+        )
+        self.assertEqual(
+            _errors_from_output(
+                ["FAILED - No workbook", "Hint: check _rels/.rels", "  not an error"]
+            ),
+            [{"message": "No workbook", "details": []}],
+        )
+        self.assertEqual(
+            _errors_from_output(["FAILED - First", "FAILED - Second", "  error"]),
+            [
+                {"message": "First", "details": []},
+                {"message": "error", "details": []},
+            ],
+        )
+
+    def test_lines_outside_failures(self):
+        """Test that indented lines outside a failure are not errors"""
+        lines = [
+            "PASSED - All references are valid",
+            "  note: 3 parts checked",
+            "FAILED - Found 1 error:",
+            "  the error",
+            "Remove the stale entries and try again",
+            "  not an error",
+            "    not a detail",
+        ]
+        self.assertEqual(
+            _errors_from_output(lines), [{"message": "the error", "details": []}]
+        )
+        self.assertEqual(_errors_from_output(lines[:2]), [])
+
+
+class TestValidationReport(unittest.TestCase):
+
+    def test_run(self):
+        """Test the measurements recorded for passed, failed and skipped checks"""
+        report = ValidationReport(echo=False)
+        package = SimpleNamespace(parse_count=0, bytes_read=0)
+
+        def failing_check():
+            package.parse_count += 2
+            package.bytes_read += 100
+            print("FAILED - Found 2 errors:\n  first\n    detail\n  second")
+            return False
+
+        def skipped_check():
+            report.mark_skipped()
+            print("SKIPPED - unchanged")
+            return True
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertFalse(report.run("DOCX", "xml", package, failing_check))
+            self.assertTrue(report.run("DOCX", "ids", None, skipped_check))
+            self.assertTrue(report.run("DOCX", "rels", package, lambda: True))
+        self.assertEqual(output.getvalue(), "")
+
+        failed, skipped, passed = report.checks
+        self.assertEqual(failed["passed"], False)
+        self.assertEqual(failed["parts_parsed"], 2)
+        self.assertEqual(failed["bytes_read"], 100)
+        self.assertEqual(failed["error_count"], 2)
+        self.assertEqual(
+            failed["errors"][0], {"message": "first", "details": ["detail"]}
+        )
+        self.assertTrue(skipped["skipped"])
+        self.assertEqual(skipped["parts_parsed"], 0)
+        self.assertEqual(skipped["output"], ["SKIPPED - unchanged"])
+        self.assertFalse(passed["skipped"])
+        self.assertEqual(passed["error_count"], 0)
+
+        summary = report.to_dict(False)
+        self.assertEqual(summary["error_count"], 2)
+        self.assertEqual(summary["parts_parsed"], 2)
+        self.assertEqual(summary["bytes_read"], 100)
+        self.assertEqual(len(summary["checks"]), 3)
+
+    def test_echo(self):
+        """Test that check output is passed through, and recorded, when echoing"""
+        report = ValidationReport()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            report.run("PPTX", "layouts", None, lambda: print("PASSED - ok"))
+        self.assertEqual(output.getvalue(), "PASSED - ok\n")
+        self.assertEqual(report.checks[0]["output"], ["PASSED - ok"])
+
+    def test_recorded_on_exception(self):
+        """Test that a check raising an exception is still recorded"""
+        report = ValidationReport(echo=False)
+
+        def check():
+            print("FAILED - Found 1 error:\n  partial")
+            raise ValueError("broken")
+
+        with self.assertRaises(ValueError):
+            report.run("DOCX", "xml", None, check)
+        self.assertIsNone(report.checks[0]["passed"])
+        self.assertEqual(report.checks[0]["error_count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,286 @@
+"""
+Single-pass rule engine for checks that look at every element of a part.
+"""
+
+import contextlib
+from collections import Counter
+
+import lxml.etree
+
+from .archive import open_part
+
+
+class Rule:
+    """A check that observes elements during one shared pass over a part.
+
+    Subclasses set ``tags`` to the Clark-notation tags they want to see (None
+    for every element) and override start() and/or end(). Attributes and
+    sourceline are available in start(); text is complete only in end(). When
+    a part is streamed, the children of an element have already been freed by
+    the time its end() runs, so rules must collect what they need as they go.
+    """
+
+    tags = None
+
+    def __init__(self, part):
+        self.part = part  # Path of the part relative to the package root
+        self.errors = []
+
+    def start(self, elem, context):
+        pass
+
+    def end(self, elem, context):
+        pass
+
+
+class PassContext:
+    """Ancestor state shared by all rules during a pass."""
+
+    def __init__(self):
+        self.stack = []  # Open ancestors of the current element, outermost first
+        self.depth = Counter()  # Open ancestors by tag
+
+    def inside(self, tag):
+        """Return True if the current element has an ancestor with this tag."""
+        return self.depth[tag] > 0
+
+
+def run_rules(rules, source, tree=None):
+    """Run rules over a part in a single pass.
+
+    Args:
+        rules: Rule instances to run
+        source: Path (or ArchivePath) of the part, streamed with iterparse when
+            no tree is given; elements are freed as soon as every rule has seen them
+        tree: Already parsed tree to walk instead (left untouched)
+
+    Raises:
+        lxml.etree.XMLSyntaxError: If the streamed part is not well-formed
+    """
+    # Dispatch tables: tag -> rules, plus rules that want every element
+    start_rules, end_rules = {}, {}
+    all_start, all_end = [], []
+    for rule in rules:
+        overrides_start = type(rule).start is not Rule.start
+        overrides_end = type(rule).end is not Rule.end
+        if rule.tags is None:
+            if overrides_start:
+                all_start.append(rule)
+            if overrides_end:
+                all_end.append(rule)
+            continue
+        for tag in rule.tags:
+            if overrides_start:
+                start_rules.setdefault(tag, []).append(rule)
+            if overrides_end:
+                end_rules.setdefault(tag, []).append(rule)
+
+    if tree is not None:
+        events = lxml.etree.iterwalk(tree, events=("start", "end"))
+        _dispatch(events, start_rules, end_rules, all_start, all_end, free=False)
+        return
+
+    with open_part(source) as f:
+        events = lxml.etree.iterparse(f, events=("start", "end"))
+        _dispatch(events, start_rules, end_rules, all_start, all_end, free=True)
+
+
+def _dispatch(events, start_rules, end_rules, all_start, all_end, free):
+    """Feed start/end events to the rules, freeing elements if requested."""
+    context = PassContext()
+    for event, elem in events:
+        tag = elem.tag
+        if event == "start":
+            for rule in all_start:
+                rule.start(elem, context)
+            for rule in start_rules.get(tag, ()):
+                rule.start(elem, context)
+            context.stack.append(elem)
+            context.depth[tag] += 1
+            continue
+
+        context.stack.pop()
+        context.depth[tag] -= 1
+        for rule in all_end:
+            rule.end(elem, context)
+        for rule in end_rules.get(tag, ()):
+            rule.end(elem, context)
+
+        if free:
+            # Free the element and any earlier siblings that are still attached
+            elem.clear(keep_tail=True)
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+
+class UniqueIdRule(Rule):
+    """Collects the IDs that UNIQUE_ID_REQUIREMENTS says must be unique.
+
+    Elements inside mc:AlternateContent are ignored, since their alternatives
+    legitimately repeat IDs.
+    """
+
+    def __init__(self, part, requirements, mc_namespace):
+        super().__init__(part)
+        self.requirements = requirements
+        self.alternate_content_tag = f"{{{mc_namespace}}}AlternateContent"
+        self.ids = []  # (tag, attr_name, id_value, scope, line) in document order
+        self._names = {}  # Clark tag -> required element name, or None
+
+    def start(self, elem, context):
+        # Get the element name without namespace, once per distinct tag
+        tag = self._names.get(elem.tag, "")
+        if tag == "":
+            tag = elem.tag.split("}")[-1].lower()
+            if tag not in self.requirements:
+                tag = None
+            self._names[elem.tag] = tag
+        if tag is None or context.inside(self.alternate_content_tag):
+            return
+
+        # Look for the specified attribute
+        attr_name, scope = self.requirements[tag]
+        for attr, value in elem.attrib.items():
+            if attr.split("}")[-1].lower() == attr_name:
+                self.ids.append((tag, attr_name, value, scope, elem.sourceline))
+                break
+
+
+class RootRule(Rule):
+    """Records the root's tag, the prefixes it declares and its Ignorable attributes."""
+
+    def __init__(self, part):
+        super().__init__(part)
+        self.tag = None
+        self.declared = set()  # Prefixes declared on the root, without the default
+        self.ignorable = []  # Values of the root's Ignorable attributes
+
+    def start(self, elem, context):
+        if context.stack:
+            return
+        self.tag = elem.tag
+        self.declared = set(elem.nsmap.keys()) - {None}
+        self.ignorable = [
+            value for name, value in elem.attrib.items() if name.endswith("Ignorable")
+        ]
+
+
+def sniff_root(part, source):
+    """Return a RootRule for a part, reading it only up to the root's start tag.
+
+    The parser is dropped right after the first start event, so the cost does
+    not depend on the size of the part. Only the start of the part is checked
+    for well-formedness.
+
+    Raises:
+        lxml.etree.XMLSyntaxError: If the part has no well-formed root start tag
+    """
+    rule = RootRule(part)
+    with open_part(source) as f, contextlib.ExitStack() as stack:
+        # iterparse only closes files it opened itself once it reaches the end
+        if isinstance(f, str):
+            f = stack.enter_context(open(f, "rb"))
+        events = lxml.etree.iterparse(f, events=("start",))
+        for _, elem in events:
+            rule.start(elem, PassContext())
+            break
+    return rule
+
+
+class RelationshipIdRule(Rule):
+    """Collects the r:id references of a part."""
+
+    def __init__(self, part, relationships_namespace):
+        super().__init__(part)
+        self.id_attribute = f"{{{relationships_namespace}}}id"
+        self.references = []  # (element_name, r_id, line) in document order
+
+    def start(self, elem, context):
+        rid = elem.get(self.id_attribute)
+        if rid:
+            tag = elem.tag
+            name = tag.split("}")[-1] if "}" in tag else tag
+            self.references.append((name, rid, elem.sourceline))
+
+
+class TrackedTextRule(Rule):
+    """Collects the text of each paragraph with one author's tracked changes undone.
+
+    The author's w:ins content is skipped and the w:delText inside their w:del
+    is read as regular text, so the result is the text the document had before
+    that author's changes. Empty paragraphs are left out. A paragraph nested
+    in another (e.g. in a text box) counts towards both, and paragraphs are
+    listed in the order they start.
+    """
+
+    def __init__(self, part, author, wordprocessing_namespace):
+        super().__init__(part)
+        w = f"{{{wordprocessing_namespace}}}"
+        self.ins_tag, self.del_tag = f"{w}ins", f"{w}del"
+        self.p_tag, self.t_tag, self.del_text_tag = f"{w}p", f"{w}t", f"{w}delText"
+        self.tags = (
+            self.ins_tag,
+            self.del_tag,
+            self.p_tag,
+            self.t_tag,
+            self.del_text_tag,
+        )
+        self.author = author
+        self.author_attribute = f"{w}author"
+        self.paragraphs = []
+        self.changes = 0  # Number of w:ins and w:del elements by the author
+
+        self._marks = []  # Whether each open w:ins/w:del is by the author
+        self._inserted = 0  # Open w:ins by the author
+        self._deleted = 0  # Open w:del by the author
+        self._open = []  # Text parts of the open paragraphs, innermost last
+        self._pending = []  # Text parts of the paragraphs of the outermost one
+
+    def start(self, elem, context):
+        tag = elem.tag
+        if tag == self.p_tag:
+            if not self._inserted:
+                parts = []
+                self._open.append(parts)
+                self._pending.append(parts)
+            return
+        if tag != self.ins_tag and tag != self.del_tag:
+            return
+        by_author = elem.get(self.author_attribute) == self.author
+        self._marks.append(by_author)
+        if by_author:
+            self.changes += 1
+            if tag == self.ins_tag:
+                self._inserted += 1
+            else:
+                self._deleted += 1
+
+    def end(self, elem, context):
+        tag = elem.tag
+        if tag == self.t_tag or tag == self.del_text_tag:
+            if self._inserted or (tag == self.del_text_tag and not self._deleted):
+                return
+            if elem.text:
+                for parts in self._open:
+                    parts.append(elem.text)
+        elif tag == self.p_tag:
+            if self._inserted:
+                return
+            self._open.pop()
+            if not self._open:
+                for parts in self._pending:
+                    text = "".join(parts)
+                    if text:
+                        self.paragraphs.append(text)
+                self._pending = []
+        elif self._marks.pop():
+            if tag == self.ins_tag:
+                self._inserted -= 1
+            else:
+                self._deleted -= 1
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
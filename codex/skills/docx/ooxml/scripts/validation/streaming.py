@@ -0,0 +1,199 @@
+"""
+Streaming XSD validation of parts too large to hold as a tree.
+"""
+
+import lxml.etree
+
+# Raw parser events handled per refill of the preprocessed stream
+EVENTS_PER_READ = 2000
+
+XML_ATTRIBUTE_PREFIX = "{http://www.w3.org/XML/1998/namespace}"
+
+
+def stream_validate(source, schema, template_pattern, drop_attribute, namespaces=None):
+    """Validate a part against a schema while streaming it, without keeping a tree.
+
+    The part is preprocessed on the fly exactly like the tree path does before
+    schema.validate(): template tags are stripped from text outside t elements,
+    drop_attribute is removed from the root and, if namespaces is given,
+    elements and attributes outside those namespaces are removed.
+
+    Args:
+        source: File name or binary file object to read the part from
+        schema: Compiled lxml.etree.XMLSchema
+        template_pattern: Compiled pattern of the template tags to strip
+        drop_attribute: Clark-notation name of the root attribute to remove
+        namespaces: Namespaces to keep, or None to keep every namespace
+
+    Returns:
+        tuple: (is_valid, errors_set) with the schema error messages
+
+    Raises:
+        lxml.etree.XMLSyntaxError: If the part is not well-formed
+    """
+    stream = _PreprocessedStream(source, template_pattern, drop_attribute, namespaces)
+    events = lxml.etree.iterparse(stream, events=("end",), schema=schema)
+    try:
+        for _, elem in events:
+            # Keep only the path to the current element
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    except lxml.etree.XMLSyntaxError:
+        if stream.error is not None:
+            raise stream.error
+        errors = {
+            error.message
+            for error in events.error_log
+            if error.domain == lxml.etree.ErrorDomains.SCHEMASV
+        }
+        if not errors:
+            raise
+        return False, errors
+    if stream.error is not None:
+        raise stream.error
+    return True, set()
+
+
+class _PreprocessedStream:
+    """Binary file object yielding a part's preprocessed serialization.
+
+    The raw part is read with iterparse as the consumer asks for more bytes, and
+    each raw element is dropped once its content and tail have been written, so
+    neither side ever holds more than the path to the current element.
+    """
+
+    def __init__(self, source, template_pattern, drop_attribute, namespaces):
+        self.template_pattern = template_pattern
+        self.drop_attribute = drop_attribute
+        self.namespaces = namespaces
+        self.error = None  # Parse error of the raw part, re-raised by the consumer
+
+        self._events = lxml.etree.iterparse(
+            source, events=("start-ns", "start", "end", "comment", "pi")
+        )
+        self._declarations = {}  # Namespaces declared on the next element
+        self._chunks = []
+        self._buffer = b""
+        self._done = False
+        self._writer = lxml.etree.xmlfile(self, encoding="utf-8")
+        self._xf = self._writer.__enter__()
+        # Open raw elements as [element, context, text_written, last_child, skipped]
+        self._stack = []
+        self._foreign_names = {}  # Clark name -> whether it is outside namespaces
+
+    def write(self, data):
+        """Receive serialized output from xmlfile."""
+        self._chunks.append(bytes(data))
+
+    def read(self, size=-1):
+        while not self._done and (size < 0 or len(self._buffer) < size):
+            self._advance()
+            if self._chunks:
+                self._buffer += b"".join(self._chunks)
+                self._chunks = []
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def _advance(self):
+        try:
+            for _ in range(EVENTS_PER_READ):
+                event, node = next(self._events)
+                if event == "start":
+                    self._start(node)
+                elif event == "end":
+                    self._end(node)
+                elif event == "start-ns":
+                    prefix, uri = node
+                    self._declarations[prefix or None] = uri
+                elif self._stack:
+                    self._other(node)
+            self._xf.flush()
+        except StopIteration:
+            self._writer.__exit__(None, None, None)
+            self._done = True
+        except lxml.etree.XMLSyntaxError as e:
+            # Stop the output; the consumer raises the error once it sees the end
+            self.error = e
+            self._done = True
+
+    def _start(self, elem):
+        skipped = False
+        if self._stack:
+            frame = self._stack[-1]
+            self._flush_content(frame)
+            skipped = frame[4] or self._foreign(elem.tag)
+            frame[3] = elem
+
+        nsmap, self._declarations = self._declarations, {}
+        context = None
+        if not skipped:
+            attrib = {}
+            for name, value in elem.attrib.items():
+                if name[0] == "{":
+                    if self._foreign(name) or (
+                        name == self.drop_attribute and not self._stack
+                    ):
+                        continue
+                    # xmlfile would bind the xml namespace to a generated prefix
+                    if name.startswith(XML_ATTRIBUTE_PREFIX):
+                        name = f"xml:{name[len(XML_ATTRIBUTE_PREFIX) :]}"
+                attrib[name] = value
+            context = self._xf.element(elem.tag, attrib, nsmap=nsmap)
+            context.__enter__()
+        self._stack.append([elem, context, False, None, skipped])
+
+    def _end(self, elem):
+        frame = self._stack.pop()
+        self._flush_content(frame)
+        if frame[1] is not None:
+            frame[1].__exit__(None, None, None)
+        elem.clear(keep_tail=True)
+
+    def _other(self, node):
+        """Handle a comment or processing instruction inside the root."""
+        frame = self._stack[-1]
+        self._flush_content(frame)
+        frame[3] = node
+        if not frame[4]:
+            self._xf.write(node, with_tail=False)
+
+    def _flush_content(self, frame):
+        """Write the text preceding the next node of an open element."""
+        elem, _, text_written, last_child, skipped = frame
+        if not text_written:
+            frame[2] = True
+            if not skipped:
+                self._write_text(elem.text, elem.tag)
+        elif last_child is not None:
+            frame[3] = None
+            # Removed elements take their tail with them
+            if not skipped and not (
+                isinstance(last_child.tag, str) and self._foreign(last_child.tag)
+            ):
+                self._write_text(last_child.tail, last_child.tag)
+            elem.remove(last_child)
+
+    def _write_text(self, text, tag):
+        if not text:
+            return
+        # Template tags are kept in w:t elements and in the tails of other nodes
+        if isinstance(tag, str) and not (tag.endswith("}t") or tag == "t"):
+            text = self.template_pattern.sub("", text)
+        self._xf.write(text)
+
+    def _foreign(self, name):
+        """Return True if a Clark-notation name is outside the kept namespaces."""
+        if self.namespaces is None or not name.startswith("{"):
+            return False
+        foreign = self._foreign_names.get(name)
+        if foreign is None:
+            foreign = name[1:].split("}")[0] not in self.namespaces
+            self._foreign_names[name] = foreign
+        return foreign
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,100 @@
+import unittest
+import tempfile
+from pathlib import Path, PurePosixPath
+import lxml.etree
+from validation import DOCXSchemaValidator
+
+MAIN_PART = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"
+    xmlns:w14="http://schemas.microsoft.com/office/word/2010/wordml"
+    xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"
+    mc:Ignorable="w14">
+  <!-- {{ comment }} -->
+  <w:body>{{ body_tag }}
+    <w:p w14:paraId="1A2B3C4D" w14:textId="77777777">
+      <w:pPr>{{ in_ppr }}<w:jc w:val="center"/>{{ tail }}</w:pPr>
+      <w:r><w:t xml:space="preserve">Kept {{ in_text }} tag</w:t></w:r>
+      <w14:foreign><w:r><w:t>Inside foreign</w:t></w:r></w14:foreign>{{ after_foreign }}
+      <mc:AlternateContent>
+        <mc:Choice Requires="w14"><w:r><w:t>Choice</w:t></w:r></mc:Choice>
+        <mc:Fallback><w:r><w:t>Fallback</w:t></w:r></mc:Fallback>
+      </mc:AlternateContent>
+      <?custom {{ pi }}?>
+      <w:r><w:drawing><wp:inline w14:anchorId="0001"/></w:drawing></w:r>
+    </w:p>
+  </w:body>
+</w:document>
+"""
+
+OTHER_PART = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties"
+    xmlns:dc="http://purl.org/dc/elements/1.1/"
+    xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"
+    xmlns:x="urn:example:extension"
+    mc:Ignorable="x" x:flag="1">
+  <dc:title>Report {{ title }}</dc:title>{{ tail }}
+  <x:extra>{{ extension }}</x:extra>
+</cp:coreProperties>
+"""
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestPreprocessForXsd(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        root = Path(temp_dir.name)
+        (root / "word").mkdir()
+        (root / "word/document.xml").write_text(MAIN_PART, encoding="utf-8")
+        self.validator = DOCXSchemaValidator(root, root / "original.docx")
+
+    def assert_same_as_reference(self, xml, relative_path):
+        """Helper to compare the single pass with the reference pipeline"""
+        relative_path = PurePosixPath(relative_path)
+        xml_doc = lxml.etree.ElementTree(lxml.etree.fromstring(xml.encode("utf-8")))
+        before = lxml.etree.tostring(xml_doc)
+
+        expected = lxml.etree.tostring(
+            self.validator._preprocess_for_xsd_reference(xml_doc, relative_path)
+        )
+        shared = self.validator._preprocess_for_xsd(xml_doc, relative_path)
+        self.assertEqual(lxml.etree.tostring(shared), expected)
+        # A shared tree is left as it was
+        self.assertEqual(lxml.etree.tostring(xml_doc), before)
+
+        owned = self.validator._preprocess_for_xsd(xml_doc, relative_path, owned=True)
+        self.assertEqual(lxml.etree.tostring(owned), expected)
+        return expected.decode("utf-8")
+
+    def test_main_content_part(self):
+        """Test template tags, mc:Ignorable and foreign namespaces in word/"""
+        result = self.assert_same_as_reference(MAIN_PART, "word/document.xml")
+        self.assertNotIn("Ignorable", result)
+        self.assertNotIn("w14:", result)
+        self.assertNotIn("AlternateContent", result)
+        self.assertNotIn("body_tag", result)
+        self.assertNotIn("in_ppr", result)
+        self.assertNotIn("after_foreign", result)
+        self.assertIn("Kept {{ in_text }} tag", result)
+
+    def test_part_outside_main_content(self):
+        """Test that parts outside the main folders keep foreign namespaces"""
+        result = self.assert_same_as_reference(OTHER_PART, "docProps/core.xml")
+        self.assertNotIn("Ignorable", result)
+        self.assertNotIn("{{", result)
+        self.assertIn('x:flag="1"', result)
+        self.assertIn("<x:extra></x:extra>", result)
+
+    def test_part_without_changes(self):
+        """Test a part with nothing to strip"""
+        self.assert_same_as_reference(
+            '<w:styles xmlns:w="http://schemas.openxmlformats.org/'
+            'wordprocessingml/2006/main"><w:style w:type="paragraph"/></w:styles>',
+            "word/styles.xml",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
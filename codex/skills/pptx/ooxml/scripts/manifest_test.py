@@ -0,0 +1,130 @@
+import unittest
+import contextlib
+import io
+import tempfile
+from pathlib import Path
+from validation import DOCXSchemaValidator
+from validation.manifest import ValidationManifest
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+PARTS = {
+    "[Content_Types].xml": '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+    "</Types>",
+    "_rels/.rels": '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{R}/officeDocument" Target="word/document.xml"/>'
+    "</Relationships>",
+    "word/_rels/document.xml.rels": '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{R}/styles" Target="styles.xml"/>'
+    "</Relationships>",
+    "word/document.xml": f'<w:document xmlns:w="{W}"><w:body><w:p/></w:body></w:document>',
+    "word/styles.xml": f'<w:styles xmlns:w="{W}"/>',
+}
+
+
+class RecordingValidator(DOCXSchemaValidator):
+    """Validator with a per-part check that records the parts it runs on"""
+
+    def validate_parts(self):
+        self.checked = sorted(
+            xml_file.relative_to(self.unpacked_dir).as_posix()
+            for xml_file in self.xml_files
+        )
+        return True
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestIncrementalValidation(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+        self.package = self.root / "doc"
+        for name, content in PARTS.items():
+            path = self.package / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+        # Only hashed, for the manifest
+        (self.root / "original.docx").write_bytes(b"original")
+
+    def run_checks(self):
+        """Helper to run one per-part and two cross-part checks incrementally.
+
+        Returns the parts the per-part check ran on and the skipped checks.
+        """
+        validator = RecordingValidator(
+            self.package, self.root / "original.docx", verbose=True, incremental=True
+        )
+        validator.checked = None
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            for check in (
+                validator.validate_parts,
+                validator.validate_file_references,
+                validator.validate_content_types,
+            ):
+                self.assertTrue(validator.run_check(check), output.getvalue())
+        skipped = {
+            line.split()[2].rstrip(":")
+            for line in output.getvalue().splitlines()
+            if line.startswith("SKIPPED")
+        }
+        return validator.checked, skipped
+
+    def edit(self, name, old, new):
+        """Helper to change the content of a part"""
+        path = self.package / name
+        path.write_text(path.read_text(encoding="utf-8").replace(old, new))
+
+    def test_unchanged_package_is_skipped(self):
+        """Test that checks are skipped once they passed on unchanged parts"""
+        checked, skipped = self.run_checks()
+        self.assertEqual(len(checked), 5)
+        self.assertEqual(skipped, set())
+
+        checked, skipped = self.run_checks()
+        self.assertIsNone(checked)
+        self.assertEqual(
+            skipped,
+            {"validate_parts", "validate_file_references", "validate_content_types"},
+        )
+
+    def test_part_edit(self):
+        """Test that editing a part reruns the checks that read it"""
+        self.run_checks()
+        self.edit("word/styles.xml", "/>", "></w:styles>")
+        checked, skipped = self.run_checks()
+        self.assertEqual(checked, ["word/styles.xml"])
+        self.assertEqual(skipped, {"validate_file_references"})
+
+    def test_rels_edit(self):
+        """Test that editing a .rels file reruns the checks on its source part"""
+        self.run_checks()
+        self.edit("word/_rels/document.xml.rels", 'Id="rId1"', 'Id="rId2"')
+        checked, skipped = self.run_checks()
+        self.assertEqual(checked, ["word/_rels/document.xml.rels", "word/document.xml"])
+        self.assertEqual(skipped, {"validate_content_types"})
+
+    def test_section_key(self):
+        """Test that results are dropped when the original, schemas or code change"""
+        key = {"original_digest": "o", "schemas_digest": "s", "code_digest": "c"}
+        manifest = ValidationManifest(self.package, "Validator", **key)
+        manifest.record_inputs("validate_files", "inputs", True)
+        manifest.save()
+
+        manifest = ValidationManifest(self.package, "Validator", **key)
+        self.assertTrue(manifest.inputs_unchanged("validate_files", "inputs"))
+        for name in key:
+            changed = dict(key, **{name: "changed"})
+            manifest = ValidationManifest(self.package, "Validator", **changed)
+            self.assertFalse(manifest.inputs_unchanged("validate_files", "inputs"))
+
+
+if __name__ == "__main__":
+    unittest.main()
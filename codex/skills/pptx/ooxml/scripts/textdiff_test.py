@@ -0,0 +1,68 @@
+import unittest
+from validation.textdiff import CHAR_DIFF_LIMIT, word_diff
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestWordDiff(unittest.TestCase):
+
+    def test_same_text(self):
+        """Test that identical texts have an empty diff"""
+        self.assertEqual(word_diff("First\nSecond", "First\nSecond"), "")
+
+    def test_inserted_paragraph(self):
+        """Test a paragraph added between unchanged ones"""
+        self.assertEqual(
+            word_diff("First\nThird", "First\nSecond\nThird"), "{+Second+}"
+        )
+
+    def test_removed_paragraph(self):
+        """Test a paragraph removed between unchanged ones"""
+        self.assertEqual(
+            word_diff("First\nSecond\nThird", "First\nThird"), "[-Second-]"
+        )
+
+    def test_replaced_paragraph(self):
+        """Test a changed paragraph, diffed character by character"""
+        self.assertEqual(
+            word_diff("First\nThe quick fox\nThird", "First\nThe quack fox!\nThird"),
+            "The qu[-i-]{+a+}ck fox{+!+}",
+        )
+
+    def test_replaced_and_added_paragraphs(self):
+        """Test replaced paragraphs paired in order, with the extra ones added whole"""
+        self.assertEqual(
+            word_diff("Start\nOne\nEnd", "Start\nOnce\nTwo\nEnd"),
+            "On{+c+}e\n{+Two+}",
+        )
+
+    def test_long_paragraph_word_diff(self):
+        """Test that paragraphs past CHAR_DIFF_LIMIT are diffed word by word"""
+        prefix = "word " * (CHAR_DIFF_LIMIT // 5)
+        self.assertEqual(word_diff("The cat sat", "The cart sat"), "The ca{+r+}t sat")
+        diff = word_diff(prefix + "cat sat", prefix + "cart sat")
+        self.assertEqual(diff, prefix + "[-cat-]{+cart+} sat")
+
+    def test_budget(self):
+        """Test that whole paragraphs are dropped once the budget is spent"""
+        original = "\n".join(f"Paragraph {i}" for i in range(5))
+        modified = "\n".join(f"Paragraph {i} changed" for i in range(5))
+        lines = word_diff(original, modified, budget=None).split("\n")
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(lines[0], "Paragraph 0{+ changed+}")
+
+        budget = len(lines[0]) + len(lines[1]) + 2
+        self.assertEqual(
+            word_diff(original, modified, budget=budget),
+            "\n".join(lines[:2] + ["... 3 more changed paragraph(s) not shown"]),
+        )
+
+    def test_budget_smaller_than_first_change(self):
+        """Test that the start of the first change is shown even past the budget"""
+        self.assertEqual(
+            word_diff("Old text\nKept", "New text entirely\nKept too", budget=8),
+            "[-Old-]{...\n... 1 more changed paragraph(s) not shown",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,25 +3,43 @@
 Command line tool to validate Office document XML files against XSD schemas and tracked changes.
 
 Usage:
-    python validate.py <dir> --original <original_file>
+    python validate.py <dir or office_file> --original <original_file>
+    python validate.py <dir or office_file> --original <file> --fail-fast
+    python validate.py --batch <manifest.jsonl> [-j N] [--max-failures N]
+    python validate.py --batch-glob '<pattern>' --original <original_file>
+    python validate.py --daemon  # Keep schemas warm for later calls
+
+When a daemon started with --daemon is listening, validate.py hands the
+request to it and prints its result; otherwise it validates in-process.
 """
 
 import argparse
+import contextlib
+import glob
+import json
+import os
+import socket
+import stat
 import sys
+import tempfile
+import zipfile
 from pathlib import Path
 
-from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+# Bump when the request or response format of the daemon, or the options
+# it accepts, change
+DAEMON_PROTOCOL = 2
 
 
-def main():
+def build_parser():
     parser = argparse.ArgumentParser(description="Validate Office document XML files")
     parser.add_argument(
         "unpacked_dir",
-        help="Path to unpacked Office document directory",
+        nargs="?",
+        help="Path to unpacked Office document directory, or to a packed "
+        ".docx/.pptx/.xlsx file to validate without unpacking",
     )
     parser.add_argument(
         "--original",
-        required=True,
         help="Path to original file (.docx/.pptx/.xlsx)",
     )
     parser.add_argument(
@@ -30,39 +48,315 @@ def main():
         action="store_true",
         help="Enable verbose output",
     )
+    parser.add_argument(
+        "--schema-bundle",
+        help="Path to a pre-resolved XSD schema bundle (created if missing)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for XSD validation, or for documents in batch "
+        "mode (0 = one per CPU, default: 1)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-validate what changed since the last run (manifest stored "
+        "next to the unpacked directory or packed file)",
+    )
+    parser.add_argument(
+        "--report",
+        choices=["text", "json"],
+        default="text",
+        help="Output format: text (default), or json with per-check timing, "
+        "parse counts and errors",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="MANIFEST",
+        help='Validate every document listed in a JSON Lines manifest of '
+        '{"candidate": ..., "original": ...} objects',
+    )
+    parser.add_argument(
+        "--batch-glob",
+        metavar="PATTERN",
+        help="Validate every directory or file matching a glob pattern against "
+        "--original",
+    )
+    parser.add_argument(
+        "--max-failures",
+        type=int,
+        default=0,
+        help="In batch mode, stop starting new documents after this many have "
+        "failed (default: 0, never stop)",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop at the first failing check, cancelling the remaining checks "
+        "and pending XSD work",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        default=0,
+        help="Skip the remaining checks after this many errors in total "
+        "(default: 0, no limit)",
+    )
+    parser.add_argument(
+        "--max-errors-per-check",
+        type=int,
+        default=0,
+        help="Show at most this many errors per check; the rest are counted "
+        "(default: 0, no limit)",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run a validation daemon with warm schemas instead of validating",
+    )
+    parser.add_argument(
+        "--socket",
+        default=default_socket_path(),
+        help="Unix socket of the validation daemon, in a directory only the "
+        "current user can write to (default: $OOXML_VALIDATE_SOCKET, or one in "
+        "$XDG_RUNTIME_DIR or in a private directory under the temp directory)",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Always validate in-process, even if a daemon is running",
+    )
+    return parser
+
+
+def default_socket_path():
+    """Return the daemon socket path for the current user."""
+    if os.environ.get("OOXML_VALIDATE_SOCKET"):
+        return os.environ["OOXML_VALIDATE_SOCKET"]
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return str(Path(os.environ["XDG_RUNTIME_DIR"]) / "ooxml-validate.sock")
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return str(Path(tempfile.gettempdir()) / f"ooxml-validate-{uid}" / "daemon.sock")
+
+
+def trusted_socket(socket_path):
+    """Return True if a socket can be trusted to be the current user's daemon.
+
+    That is a socket owned by the current user, in a directory no one else
+    can write to.
+    """
+    if not hasattr(os, "getuid"):
+        return True
+    try:
+        directory = os.stat(os.path.dirname(os.path.abspath(socket_path)))
+        info = os.lstat(socket_path)
+    except OSError:
+        return False
+    uid = os.getuid()
+    return (
+        stat.S_ISSOCK(info.st_mode)
+        and info.st_uid == uid
+        and directory.st_uid == uid
+        and not directory.st_mode & 0o022
+    )
+
+
+def request_daemon(socket_path, argv):
+    """Run a command line on the daemon.
+
+    Returns:
+        dict: Exit code and captured output, or None if no daemon could serve it
+    """
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return None
+    if not trusted_socket(socket_path):
+        print(
+            f"Warning: ignoring daemon socket {socket_path}, which is not owned by "
+            "the current user or is in a directory others can write to",
+            file=sys.stderr,
+        )
+        return None
+
+    request = {"protocol": DAEMON_PROTOCOL, "argv": argv, "cwd": os.getcwd()}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(1)
+            client.connect(socket_path)
+            client.settimeout(None)  # Validation itself may take a while
+            client.sendall(json.dumps(request).encode("utf-8"))
+            client.shutdown(socket.SHUT_WR)
+            chunks = []
+            while chunk := client.recv(65536):
+                chunks.append(chunk)
+        response = json.loads(b"".join(chunks).decode("utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    if "exit" not in response:
+        return None  # E.g. a daemon speaking another protocol version
+    return response
+
+
+def main():
+    parser = build_parser()
     args = parser.parse_args()
 
+    if args.daemon:
+        from validation.daemon import serve
+
+        try:
+            serve(args.socket, run_command_line, DAEMON_PROTOCOL)
+        except RuntimeError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    if args.batch and args.batch_glob:
+        parser.error("--batch and --batch-glob cannot be combined")
+    if args.batch_glob and args.original is None:
+        parser.error("--batch-glob requires --original")
+    if not (args.batch or args.batch_glob) and (
+        args.unpacked_dir is None or args.original is None
+    ):
+        parser.error("unpacked_dir and --original are required")
+
+    if not args.no_daemon:
+        response = request_daemon(args.socket, sys.argv[1:])
+        if response is not None:
+            sys.stdout.write(response["stdout"])
+            sys.stderr.write(response["stderr"])
+            sys.exit(response["exit"])
+
+    if args.batch or args.batch_glob:
+        sys.exit(run_batch(args))
+    sys.exit(run(args))
+
+
+def run_command_line(argv):
+    """Validate in-process as for the given arguments. Returns the exit code."""
+    args = build_parser().parse_args(argv)
+    if args.batch or args.batch_glob:
+        return run_batch(args)
+    return run(args)
+
+
+def error_limits(args):
+    """Return the ErrorBudget arguments given on the command line, or None."""
+    if not (args.fail_fast or args.max_errors or args.max_errors_per_check):
+        return None
+    return {
+        "max_errors": args.max_errors,
+        "max_errors_per_check": args.max_errors_per_check,
+        "fail_fast": args.fail_fast,
+    }
+
+
+def run(args):
+    """Validate in-process. Returns the exit code."""
+    from validation import ErrorBudget, ValidationReport, validate_document
+
     # Validate paths
     unpacked_dir = Path(args.unpacked_dir)
     original_file = Path(args.original)
     file_extension = original_file.suffix.lower()
-    assert unpacked_dir.is_dir(), f"Error: {unpacked_dir} is not a directory"
+    assert unpacked_dir.is_dir() or zipfile.is_zipfile(unpacked_dir), (
+        f"Error: {unpacked_dir} is not a directory or an Office file"
+    )
     assert original_file.is_file(), f"Error: {original_file} is not a file"
     assert file_extension in [".docx", ".pptx", ".xlsx"], (
         f"Error: {original_file} must be a .docx, .pptx, or .xlsx file"
     )
 
-    # Run validations
-    match file_extension:
-        case ".docx":
-            validators = [DOCXSchemaValidator, RedliningValidator]
-        case ".pptx":
-            validators = [PPTXSchemaValidator]
-        case _:
-            print(f"Error: Validation not supported for file type {file_extension}")
-            sys.exit(1)
+    # With a JSON report, check output goes into the report and any other
+    # output to stderr, so stdout carries only the JSON document
+    report = ValidationReport(echo=False) if args.report == "json" else None
+    limits = error_limits(args)
+    error_budget = ErrorBudget(**limits) if limits else None
+    stdout = sys.stdout
+    output = contextlib.redirect_stdout(sys.stderr) if report else contextlib.nullcontext()
 
-    # Run validators
-    success = True
-    for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
-        if not validator.validate():
-            success = False
+    # Run validations
+    with output:
+        try:
+            success = validate_document(
+                unpacked_dir,
+                original_file,
+                verbose=args.verbose,
+                schema_bundle=args.schema_bundle,
+                jobs=args.jobs,
+                incremental=args.incremental,
+                report=report,
+                error_budget=error_budget,
+            )
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
 
-    if success:
+    if report:
+        json.dump(report.to_dict(success), stdout, indent=2, ensure_ascii=False)
+        stdout.write("\n")
+    elif success:
         print("All validations PASSED!")
 
-    sys.exit(0 if success else 1)
+    return 0 if success else 1
+
+
+def run_batch(args):
+    """Validate a batch of documents in-process. Returns the exit code."""
+    from validation import BatchValidator
+    from validation.batch import read_batch_manifest
+
+    if args.batch:
+        pairs = read_batch_manifest(args.batch)
+    else:
+        pairs = [(path, args.original) for path in sorted(glob.glob(args.batch_glob))]
+
+    def progress(result):
+        if args.report == "json":
+            return
+        status = result["status"].upper()
+        if result["status"] == "error":
+            print(f"{status} - {result['candidate']}: {result['error']}")
+        elif result["status"] == "failed":
+            print(
+                f"{status} - {result['candidate']}: {result['error_count']} error(s) "
+                f"({result['seconds']:.2f}s)"
+            )
+        else:
+            print(f"{status} - {result['candidate']} ({result['seconds']:.2f}s)")
+
+    batch = BatchValidator(
+        pairs,
+        workers=args.jobs,
+        max_failures=args.max_failures,
+        schema_bundle=args.schema_bundle,
+        incremental=args.incremental,
+        progress=progress,
+        error_limits=error_limits(args),
+    )
+    try:
+        summary = batch.run()
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    if args.report == "json":
+        json.dump(summary, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+    else:
+        counts = summary["counts"]
+        print(
+            f"Validated {summary['documents']} documents in {summary['seconds']:.2f}s: "
+            f"{counts['passed']} passed, {counts['failed']} failed, "
+            f"{counts['error']} errors, {counts['skipped']} skipped"
+        )
+        if summary["stopped_early"]:
+            print(f"Stopped after {args.max_failures} failure(s) (--max-failures)")
+
+    return 0 if summary["passed"] else 1
 
 
 if __name__ == "__main__":
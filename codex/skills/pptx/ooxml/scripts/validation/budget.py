@@ -0,0 +1,135 @@
+"""
+Error budget and fail-fast policy shared by the validators of one validation run.
+"""
+
+import contextlib
+import io
+import sys
+
+
+class ErrorBudget:
+    """Limits on how many errors a validation run reports.
+
+    Checks run through run() have their output filtered: error lines (those
+    indented by two spaces under a FAILED line) beyond the check's limit are
+    replaced by a count. Once max_errors errors were reported in total, or a
+    check failed in fail-fast mode, exhausted() is True and validators skip
+    their remaining checks. Expensive checks ask stop_after() how many errors
+    they may find before stopping early, so a broken document is rejected
+    without validating every part.
+    """
+
+    def __init__(self, max_errors=0, max_errors_per_check=0, fail_fast=False):
+        """
+        Args:
+            max_errors: Errors reported in total before the remaining checks
+                are skipped (0: no limit)
+            max_errors_per_check: Errors reported by any one check (0: no limit)
+            fail_fast: Skip the remaining checks as soon as one check fails
+        """
+        self.max_errors = max_errors
+        self.max_errors_per_check = max_errors_per_check
+        self.fail_fast = fail_fast
+        self.errors = 0  # Errors reported so far, including those not shown
+        self.failed = False  # Whether any check failed
+        self._limit = None  # Errors the running check may show (None: no limit)
+
+    def exhausted(self):
+        """Return True once the remaining checks should be skipped."""
+        if self.fail_fast and self.failed:
+            return True
+        return bool(self.max_errors) and self.errors >= self.max_errors
+
+    def stop_after(self):
+        """Return how many errors the running check may find before stopping.
+
+        None means the check should run to completion.
+        """
+        if self._limit is not None:
+            return self._limit
+        return 1 if self.fail_fast else None
+
+    def run(self, check):
+        """Run check() with its error output limited. Returns its result."""
+        limits = []
+        if self.max_errors_per_check:
+            limits.append(self.max_errors_per_check)
+        if self.max_errors:
+            limits.append(max(self.max_errors - self.errors, 0))
+        self._limit = min(limits) if limits else None
+
+        output = _LimitedOutput(sys.stdout, self._limit)
+        result = None
+        try:
+            with contextlib.redirect_stdout(output):
+                result = check()
+            return result
+        finally:
+            output.close_check()
+            self._limit = None
+            self.errors += output.error_count
+            if result is False:
+                self.failed = True
+
+
+class _LimitedOutput(io.TextIOBase):
+    """Text stream passing check output on, minus the errors beyond a limit."""
+
+    def __init__(self, stream, limit):
+        self.stream = stream
+        self.limit = limit
+        self.error_count = 0
+        self._shown = 0
+        self._hidden = 0  # Errors not shown since the last note
+        self._in_failure = False
+        self._hiding = False  # Whether the current error (and its details) is hidden
+        self._partial = ""
+
+    def write(self, text):
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._line(line)
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def close_check(self):
+        """Write any pending partial line and the note about hidden errors."""
+        if self._partial:
+            self._line(self._partial, newline=False)
+            self._partial = ""
+        self._note_hidden()
+
+    def _line(self, line, newline=True):
+        if line.startswith("FAILED"):
+            self._note_hidden()
+            self._in_failure = True
+            self._hiding = False
+        elif self._in_failure and line.startswith("    "):
+            if self._hiding:
+                return  # Detail of a hidden error
+        elif self._in_failure and line.startswith("  ") and line.strip():
+            self.error_count += 1
+            self._hiding = self.limit is not None and self._shown >= self.limit
+            if self._hiding:
+                self._hidden += 1
+                return
+            self._shown += 1
+        else:
+            self._note_hidden()
+            if line.strip():
+                self._in_failure = False
+        self.stream.write(f"{line}\n" if newline else line)
+
+    def _note_hidden(self):
+        if self._hidden:
+            self.stream.write(
+                f"... {self._hidden} more error(s) not shown (error limit reached)\n"
+            )
+            self._hidden = 0
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,158 @@
+"""
+Long-lived validation server answering validate.py requests over a Unix socket.
+"""
+
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import traceback
+
+from .base import warm_schema_cache
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.read().decode("utf-8"))
+        except ValueError:
+            return
+        response = self.server.process(request)
+        self.wfile.write(json.dumps(response).encode("utf-8"))
+
+
+class ValidationDaemon(socketserver.UnixStreamServer):
+    """Runs validate.py command lines in one warm process.
+
+    Compiled schemas and original-document baselines are cached process-wide,
+    so only the first request pays for them. A request is a JSON object with
+    the protocol version, the command line arguments and the client's working
+    directory; the response carries the exit code and the captured stdout and
+    stderr. Requests are served one at a time, since checks report through
+    the process-wide stdout.
+
+    The socket is created in a directory only the current user can write to,
+    and where the platform reports peer credentials, connections from other
+    users are refused.
+    """
+
+    def __init__(self, socket_path, handler, protocol):
+        """
+        Args:
+            socket_path: Path of the Unix socket to listen on
+            handler: Callable taking the argument list and returning an exit code
+            protocol: Version clients must send; others are told to fall back
+        """
+        self.socket_path = str(socket_path)
+        self.handler = handler
+        self.protocol = protocol
+        _prepare_socket_dir(self.socket_path)
+        _remove_stale_socket(self.socket_path)
+
+        # Only the owner may connect
+        old_umask = os.umask(0o077)
+        try:
+            super().__init__(self.socket_path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+
+    def verify_request(self, request, client_address):
+        uid = _peer_uid(request)
+        return uid is None or uid == os.getuid()
+
+    def process(self, request):
+        if request.get("protocol") != self.protocol:
+            return {"error": f"unsupported protocol {request.get('protocol')!r}"}
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        cwd = os.getcwd()
+        try:
+            os.chdir(request["cwd"])
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    code = self.handler(request["argv"])
+                except SystemExit as e:
+                    code = e.code if isinstance(e.code, int) else 1
+                except Exception:
+                    traceback.print_exc()
+                    code = 1
+        except OSError as e:
+            stderr.write(f"Error: {e}\n")
+            code = 1
+        finally:
+            os.chdir(cwd)
+
+        return {"exit": code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+    def server_close(self):
+        super().server_close()
+        with contextlib.suppress(OSError):
+            os.unlink(self.socket_path)
+
+
+def serve(socket_path, handler, protocol):
+    """Warm the schema cache and serve requests until interrupted or terminated."""
+    warm_schema_cache()
+
+    # Exit through the with block below, so the socket file is removed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    with ValidationDaemon(socket_path, handler, protocol) as server:
+        print(f"Validation daemon listening on {socket_path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def _prepare_socket_dir(socket_path):
+    """Create the socket's directory (mode 0700) and check that it is private."""
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not hasattr(os, "getuid"):
+        return
+    info = os.stat(directory)
+    if info.st_uid != os.getuid() or info.st_mode & 0o022:
+        raise RuntimeError(
+            f"{directory} must be owned by the current user and not writable by "
+            "others to hold the daemon socket"
+        )
+
+
+def _peer_uid(connection):
+    """Return the user ID of a connected client, or None if it cannot be known."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    credentials = connection.getsockopt(
+        socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+    )
+    _, uid, _ = struct.unpack("3i", credentials)
+    return uid
+
+
+def _remove_stale_socket(socket_path):
+    """Remove a socket file left behind by a daemon that is no longer running."""
+    try:
+        info = os.lstat(socket_path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(info.st_mode):
+        raise RuntimeError(f"{socket_path} exists and is not a socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.unlink(socket_path)
+    else:
+        raise RuntimeError(f"A validation daemon is already listening on {socket_path}")
+    finally:
+        probe.close()
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,143 @@
+"""
+Relationship graph of an OPC package: its parts, their content types and the
+relationships between them, read once.
+"""
+
+import posixpath
+from collections import namedtuple
+
+from .index import PackageIndex
+
+CONTENT_TYPES_PART = "[Content_Types].xml"
+
+
+class Relationship(
+    namedtuple(
+        "Relationship",
+        ["rels_part", "id", "type", "target_ref", "target", "external", "line"],
+    )
+):
+    """One Relationship element of a .rels part.
+
+    target_ref is the Target attribute as written; target is the part name it
+    resolves to (None if it points outside the package), whether or not that
+    part exists. external is True for TargetMode="External".
+    """
+
+    __slots__ = ()
+
+    @property
+    def type_name(self):
+        """Last segment of the relationship type URI (e.g. "slideLayout")."""
+        return self.type.split("/")[-1]
+
+
+class RelationshipGraph:
+    """Parts of a package as nodes and their relationships as edges.
+
+    Every .rels part is parsed once (through the shared ParsedPackage) into
+    per-part adjacency lists, so relationship checks become lookups instead of
+    each check globbing and reading the .rels parts again. A .rels part that
+    cannot be parsed keeps its error, raised when its relationships are asked
+    for.
+    """
+
+    def __init__(
+        self, file_index, package, relationships_namespace, content_types_namespace
+    ):
+        self.file_index = file_index
+        self._relationship_tag = f"{{{relationships_namespace}}}Relationship"
+        self._override_tag = f"{{{content_types_namespace}}}Override"
+        self._default_tag = f"{{{content_types_namespace}}}Default"
+
+        # .rels part name -> list of Relationship in document order, or the error
+        self._outgoing = {}
+        for rels_part in file_index.with_suffix(".rels"):
+            try:
+                self._outgoing[rels_part] = self._read_rels(package, rels_part)
+            except Exception as e:
+                self._outgoing[rels_part] = e
+
+        # Content types: part name -> Override type, lower-cased extension -> Default type
+        self.overrides = {}
+        self.defaults = {}
+        self.content_types_error = None
+        if CONTENT_TYPES_PART in file_index:
+            try:
+                self._read_content_types(package)
+            except Exception as e:
+                self.content_types_error = e
+
+    @staticmethod
+    def rels_part_of(part):
+        """Return the name of the .rels part holding a part's relationships.
+
+        The package itself is the empty name, whose relationships are in _rels/.rels.
+        """
+        directory, name = posixpath.split(part)
+        return posixpath.join(directory, "_rels", f"{name}.rels")
+
+    @staticmethod
+    def base_dir(rels_part):
+        """Return the directory relative targets of a .rels part resolve from."""
+        if posixpath.basename(rels_part) == ".rels":
+            return ""
+        # e.g. word/_rels/document.xml.rels -> targets relative to word/
+        return posixpath.dirname(posixpath.dirname(rels_part))
+
+    def has_relationships(self, part):
+        """Return True if a part (or "" for the package) has a .rels part."""
+        return self.rels_part_of(part) in self._outgoing
+
+    def relationships(self, part):
+        """Return the relationships of a part, [] if it has no .rels part.
+
+        Raises:
+            Exception: The error its .rels part failed to parse with
+        """
+        return self.relationships_in(self.rels_part_of(part))
+
+    def relationships_in(self, rels_part):
+        """Return the relationships listed in a .rels part (see relationships)."""
+        relationships = self._outgoing.get(rels_part, [])
+        if isinstance(relationships, Exception):
+            raise relationships
+        return relationships
+
+    def of_type(self, part, type_name):
+        """Return a part's relationships whose type URI contains type_name."""
+        return [rel for rel in self.relationships(part) if type_name in rel.type]
+
+    def _read_rels(self, package, rels_part):
+        root = package.getroot(self.file_index.path(rels_part))
+        base_dir = self.base_dir(rels_part)
+        relationships = []
+        for rel in root.iter(self._relationship_tag):
+            target_ref = rel.get("Target")
+            relationships.append(
+                Relationship(
+                    rels_part,
+                    rel.get("Id"),
+                    rel.get("Type", ""),
+                    target_ref,
+                    PackageIndex.resolve_target(base_dir, target_ref or ""),
+                    rel.get("TargetMode") == "External",
+                    rel.sourceline,
+                )
+            )
+        return relationships
+
+    def _read_content_types(self, package):
+        root = package.getroot(self.file_index.path(CONTENT_TYPES_PART))
+        for override in root.iter(self._override_tag):
+            part_name = override.get("PartName")
+            if part_name is not None:
+                self.overrides[part_name.lstrip("/")] = override.get("ContentType")
+        for default in root.iter(self._default_tag):
+            extension = default.get("Extension")
+            if extension is not None:
+                self.defaults[extension.lower()] = default.get("ContentType")
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,154 @@
+"""
+Shared parsed view of an unpacked Office document package.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import lxml.etree
+
+from .archive import MAX_OPEN_ARCHIVES, open_part, package_root
+from .rules import run_rules
+
+# Parsed trees kept per original package; the least recently used go first
+MAX_ORIGINAL_TREES = 16
+
+# Size of the parts whose parsed trees a package keeps, by default
+MAX_TREE_BYTES = 64 * 1024 * 1024
+
+# (pid, path, size, mtime_ns) -> ParsedPackage of an original document
+_originals = OrderedDict()
+_lock = threading.Lock()
+
+
+class ParsedPackage:
+    """Parsed XML parts of an unpacked package, each parsed at most once.
+
+    Every check of every validator constructed with the same package gets the
+    same tree objects, so trees must be treated as read-only; callers that need
+    to modify a tree must work on a copy. A part is parsed again only if its
+    size or modification time changed since it was last parsed. Trees are
+    dropped least recently used first once the parts they were parsed from
+    add up to more than max_bytes, or once there are more than max_trees; the
+    tree just parsed is always kept.
+    """
+
+    def __init__(self, unpacked_dir, max_trees=None, max_bytes=MAX_TREE_BYTES):
+        self.unpacked_dir = package_root(unpacked_dir).resolve()
+        self.max_trees = max_trees
+        self.max_bytes = max_bytes
+        # path -> (stat signature, ElementTree or XMLSyntaxError), oldest use first
+        self._trees = OrderedDict()
+        self._tree_bytes = 0  # Size of the parts in self._trees
+        self.parse_count = 0
+        self.bytes_read = 0
+
+    def parse(self, path):
+        """Return the parsed tree of a part.
+
+        Args:
+            path: Absolute path of the part (or an ArchivePath), or a path
+                relative to the package root
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the part is not well-formed (cached too)
+        """
+        path = self._absolute(path)
+        stat = path.stat()
+        signature = (stat.st_size, stat.st_mtime_ns)
+        cached = self._trees.get(path)
+        if cached is None or cached[0] != signature:
+            try:
+                with open_part(path) as source:
+                    result = lxml.etree.parse(source)
+            except lxml.etree.XMLSyntaxError as e:
+                result = e
+            self.count_read(stat.st_size)
+            self._forget(path)
+            cached = (signature, result)
+            self._trees[path] = cached
+            self._tree_bytes += stat.st_size
+            self._evict()
+        self._trees.move_to_end(path)
+
+        if isinstance(cached[1], Exception):
+            raise cached[1]
+        return cached[1]
+
+    def apply_rules(self, rules, path, streaming_threshold):
+        """Run rules over a part in one pass (see rules.run_rules).
+
+        Parts smaller than streaming_threshold bytes are walked through their
+        shared parsed tree; larger ones are streamed without building a tree.
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the part is not well-formed
+        """
+        path = self._absolute(path)
+        size = path.stat().st_size
+        if size < streaming_threshold:
+            run_rules(rules, path, tree=self.parse(path))
+        else:
+            self.count_read(size)
+            run_rules(rules, path)
+
+    def count_read(self, size):
+        """Count a part read in full, including parts streamed without a tree."""
+        self.parse_count += 1
+        self.bytes_read += size
+
+    def getroot(self, path):
+        """Return the root element of a part (see parse)."""
+        return self.parse(path).getroot()
+
+    def _forget(self, path):
+        """Drop the tree of a part, if one is kept."""
+        cached = self._trees.pop(path, None)
+        if cached is not None:
+            self._tree_bytes -= cached[0][0]
+
+    def _evict(self):
+        """Drop the least recently used trees until the limits are met."""
+        while len(self._trees) > 1 and (
+            (self.max_trees is not None and len(self._trees) > self.max_trees)
+            or (self.max_bytes is not None and self._tree_bytes > self.max_bytes)
+        ):
+            self._forget(next(iter(self._trees)))
+
+    def _absolute(self, path):
+        if isinstance(path, str):
+            path = Path(path)
+        if not path.is_absolute():
+            path = self.unpacked_dir / path
+        return path
+
+
+def original_package(original_file):
+    """Return the ParsedPackage of an original document, shared process-wide.
+
+    The original's archive is opened once and its parts are decompressed only
+    when read, so every validator (and every validation against the same
+    original) reuses both the open archive and up to MAX_ORIGINAL_TREES parsed
+    parts. The package is replaced when the original file changes.
+    """
+    path = Path(original_file).resolve()
+    stat = path.stat()
+    signature = (os.getpid(), str(path), stat.st_size, stat.st_mtime_ns)
+    with _lock:
+        package = _originals.get(signature)
+        if package is not None:
+            _originals.move_to_end(signature)
+            return package
+
+    package = ParsedPackage(path, max_trees=MAX_ORIGINAL_TREES)
+    with _lock:
+        package = _originals.setdefault(signature, package)
+        while len(_originals) > MAX_OPEN_ARCHIVES:
+            _originals.popitem(last=False)
+    return package
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
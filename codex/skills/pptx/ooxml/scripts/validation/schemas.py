@@ -0,0 +1,208 @@
+"""
+Process-wide registry of compiled XSD schemas.
+"""
+
+import hashlib
+import threading
+import zipfile
+from pathlib import Path
+
+import lxml.etree
+
+# Entry every schema bundle starts with, so only bundles are ever rewritten
+BUNDLE_MARKER = ".ooxml-schema-bundle"
+
+
+class _SchemaSourceResolver(lxml.etree.Resolver):
+    """Resolve XSD imports from memory, recording every source that is read."""
+
+    def __init__(self, registry):
+        super().__init__()
+        self.registry = registry
+
+    def resolve(self, url, pubid, context):
+        data = self.registry._read_source(url)
+        if data is None:
+            return None
+        return self.resolve_string(data, context, base_url=url)
+
+
+class SchemaRegistry:
+    """Compiles each XSD schema at most once and shares it across validators.
+
+    Compiled ``lxml.etree.XMLSchema`` objects cannot be serialized, so the
+    optional on-disk bundle stores the resolved import closure of every schema
+    instead. Loading a bundle lets a cold process compile without touching the
+    dozens of individual XSD files in the schemas directory.
+
+    ``XMLSchema.validate`` keeps its error log on the schema object, so a
+    compiled schema must not be used from several threads at once.
+    """
+
+    def __init__(self, schemas_dir):
+        self.schemas_dir = Path(schemas_dir).resolve()
+        self._schemas = {}  # schema path -> compiled XMLSchema or compile error
+        self._sources = {}  # path relative to schemas_dir -> XSD bytes
+        self._bundle_loaded = False
+        self._digest = None  # Hash of the sources schemas are compiled from
+        self._lock = threading.RLock()
+
+    def get(self, schema_path):
+        """Return the compiled schema for schema_path, compiling it on first use.
+
+        Schemas that fail to compile raise the same error on every call without
+        being compiled again.
+        """
+        schema_path = Path(schema_path).resolve()
+        schema = self._schemas.get(schema_path)
+        if schema is None:
+            with self._lock:
+                if schema_path not in self._schemas:
+                    try:
+                        self._schemas[schema_path] = self._compile(schema_path)
+                    except Exception as e:
+                        self._schemas[schema_path] = e
+                schema = self._schemas[schema_path]
+
+        if isinstance(schema, Exception):
+            raise schema
+        return schema
+
+    def _compile(self, schema_path):
+        """Compile a schema, resolving its imports through the source cache."""
+        parser = lxml.etree.XMLParser()
+        parser.resolvers.add(_SchemaSourceResolver(self))
+        data = self._read_source(str(schema_path))
+        if data is None:
+            raise FileNotFoundError(f"Schema not found: {schema_path}")
+        xsd_doc = lxml.etree.fromstring(data, parser=parser, base_url=str(schema_path))
+        return lxml.etree.XMLSchema(lxml.etree.ElementTree(xsd_doc))
+
+    def _read_source(self, url):
+        """Return the bytes of a schema source, or None if it is not ours to serve."""
+        try:
+            key = Path(url).resolve().relative_to(self.schemas_dir).as_posix()
+        except ValueError:
+            return None  # Outside the schemas directory, let lxml handle it
+
+        data = self._sources.get(key)
+        if data is None:
+            source_path = self.schemas_dir / key
+            if not source_path.is_file():
+                return None
+            data = source_path.read_bytes()
+            self._sources[key] = data
+        return data
+
+    def digest(self):
+        """Return a hash identifying the schema sources in use.
+
+        That is the sources of the loaded bundle, or else every XSD file in the
+        schemas directory. It is computed once per process, like the compiled
+        schemas it describes.
+        """
+        with self._lock:
+            if self._digest is None:
+                sources = {
+                    path.relative_to(self.schemas_dir).as_posix(): path.read_bytes()
+                    for path in self.schemas_dir.rglob("*.xsd")
+                }
+                self._digest = _sources_digest(sources)
+            return self._digest
+
+    def use_bundle(self, bundle_path, schema_paths=()):
+        """Load a pre-resolved schema bundle, building it first if it does not exist.
+
+        A corrupt bundle is rebuilt, but an existing file is only ever replaced
+        if it is a zip archive holding BUNDLE_MARKER.
+
+        Args:
+            bundle_path: Path to the bundle archive
+            schema_paths: Schemas to compile when the bundle has to be built
+
+        Raises:
+            ValueError: If bundle_path exists and is not a schema bundle
+        """
+        bundle_path = Path(bundle_path)
+        with self._lock:
+            if self._bundle_loaded:
+                return
+            if bundle_path.exists():
+                if not _is_bundle(bundle_path):
+                    raise ValueError(
+                        f"{bundle_path} exists and is not a schema bundle; "
+                        "refusing to overwrite it"
+                    )
+                try:
+                    self.load_bundle(bundle_path)
+                    return
+                except (OSError, zipfile.BadZipFile):
+                    pass  # Corrupt bundle, rebuild it below
+
+            for schema_path in schema_paths:
+                try:
+                    self.get(schema_path)
+                except Exception:
+                    continue  # Reported when a part using this schema is validated
+            self.save_bundle(bundle_path)
+
+    def load_bundle(self, bundle_path):
+        """Read every schema source from a bundle created by save_bundle."""
+        with zipfile.ZipFile(bundle_path, "r") as zf:
+            sources = {
+                name: zf.read(name) for name in zf.namelist() if name != BUNDLE_MARKER
+            }
+        with self._lock:
+            self._sources.update(sources)
+            self._bundle_loaded = True
+            self._digest = _sources_digest(sources)
+
+    def save_bundle(self, bundle_path):
+        """Write all schema sources resolved so far to a single archive."""
+        bundle_path = Path(bundle_path)
+        bundle_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary name first so concurrent readers never see a partial file
+        temp_path = bundle_path.with_name(f"{bundle_path.name}.tmp")
+        with self._lock:
+            with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_DEFLATED) as zf:
+                zf.writestr(BUNDLE_MARKER, b"")
+                for key in sorted(self._sources):
+                    zf.writestr(key, self._sources[key])
+            temp_path.replace(bundle_path)
+            self._bundle_loaded = True
+
+
+def _is_bundle(path):
+    """Return True if path is a zip archive written by save_bundle."""
+    try:
+        with zipfile.ZipFile(path, "r") as zf:
+            return BUNDLE_MARKER in zf.namelist()
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+
+def _sources_digest(sources):
+    """Return the SHA-256 hex digest of schema sources keyed by relative path."""
+    digest = hashlib.sha256()
+    for key in sorted(sources):
+        digest.update(key.encode("utf-8") + b"\0")
+        digest.update(hashlib.sha256(sources[key]).digest())
+    return digest.hexdigest()
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_schema_registry(schemas_dir):
+    """Return the process-wide SchemaRegistry for a schemas directory."""
+    schemas_dir = Path(schemas_dir).resolve()
+    with _registries_lock:
+        if schemas_dir not in _registries:
+            _registries[schemas_dir] = SchemaRegistry(schemas_dir)
+        return _registries[schemas_dir]
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,187 @@
+import unittest
+import contextlib
+import io
+import tempfile
+from pathlib import Path
+from validation import XLSXSchemaValidator
+
+S = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+CELL = '<c r="A1" t="s"><v>0</v></c><c r="B1" s="1"><v>2</v></c><c r="C1"><f>B1*2</f><v>4</v></c>'
+
+
+def relationships(*rels):
+    """Helper to build a .rels part from (id, type, target) tuples"""
+    items = "".join(
+        f'<Relationship Id="{r_id}" Type="{R}/{rel_type}" Target="{target}"/>'
+        for r_id, rel_type, target in rels
+    )
+    return f'<Relationships xmlns="{RELS}">{items}</Relationships>'
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestXLSXSchemaValidator(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+
+    def make_workbook(
+        self,
+        cells=CELL,
+        shared_strings=1,
+        cell_formats=2,
+        defined_names="",
+        calc_chain=None,
+        sheet_target="worksheets/sheet1.xml",
+    ):
+        """Helper to write a workbook with one worksheet and return its validator"""
+        sst = "".join("<si><t>text</t></si>" for _ in range(shared_strings))
+        xfs = "".join('<xf numFmtId="0"/>' for _ in range(cell_formats))
+        rels = [
+            ("rId1", "worksheet", sheet_target),
+            ("rId2", "sharedStrings", "sharedStrings.xml"),
+            ("rId3", "styles", "styles.xml"),
+        ]
+        parts = {
+            "_rels/.rels": relationships(("rId1", "officeDocument", "xl/workbook.xml")),
+            "xl/workbook.xml": f'<workbook xmlns="{S}" xmlns:r="{R}"><sheets>'
+            '<sheet name="Data" sheetId="1" r:id="rId1"/></sheets>'
+            f"{defined_names}</workbook>",
+            "xl/worksheets/sheet1.xml": f'<worksheet xmlns="{S}"><sheetData>'
+            f'<row r="1">{cells}</row></sheetData></worksheet>',
+            "xl/sharedStrings.xml": f'<sst xmlns="{S}">{sst}</sst>',
+            "xl/styles.xml": f'<styleSheet xmlns="{S}"><cellXfs>{xfs}</cellXfs></styleSheet>',
+        }
+        if calc_chain is not None:
+            rels.append(("rId4", "calcChain", "calcChain.xml"))
+            parts["xl/calcChain.xml"] = (
+                f'<calcChain xmlns="{S}">{calc_chain}</calcChain>'
+            )
+        parts["xl/_rels/workbook.xml.rels"] = relationships(*rels)
+        return self.make_package(parts)
+
+    def make_package(self, parts):
+        """Helper to write the parts of a package and return its validator"""
+        for name, content in parts.items():
+            path = self.root / "package" / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+        return XLSXSchemaValidator(self.root / "package", self.root / "original.xlsx")
+
+    def run_check(self, validator, check):
+        """Helper to run a check, returning its result and output lines"""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            result = getattr(validator, check)()
+        return result, output.getvalue().splitlines()
+
+    def assert_check(self, validator, check, *errors):
+        """Helper to assert the errors a check reports, in order"""
+        result, lines = self.run_check(validator, check)
+        self.assertEqual(result, not errors, lines)
+        reported = [line for line in lines if line.startswith("  ")]
+        self.assertEqual(len(reported), len(errors), lines)
+        for line, error in zip(reported, errors):
+            self.assertIn(error, line)
+
+    def test_valid_workbook(self):
+        """Test a workbook without errors"""
+        validator = self.make_workbook(
+            defined_names='<definedNames><definedName name="Total">Data!$B$1'
+            "</definedName></definedNames>",
+            calc_chain='<c r="C1" i="1"/>',
+        )
+        for check in (
+            "validate_sheet_relationships",
+            "validate_cell_indices",
+            "validate_defined_names",
+            "validate_calc_chain",
+        ):
+            self.assert_check(validator, check)
+
+    def test_shared_string_out_of_range(self):
+        """Test a cell referencing a shared string past the end of the table"""
+        validator = self.make_workbook(cells='<c r="D1" t="s"><v>1</v></c>')
+        self.assert_check(
+            validator,
+            "validate_cell_indices",
+            "Cell D1 references shared string '1', but the shared string table "
+            "has 1 string(s)",
+        )
+
+    def test_cell_format_out_of_range(self):
+        """Test a cell style index beyond cellXfs"""
+        validator = self.make_workbook(cells='<c r="A1" s="2"><v>1</v></c>')
+        self.assert_check(
+            validator,
+            "validate_cell_indices",
+            "Cell A1 uses cell format 2, but the stylesheet has 2 cell format(s)",
+        )
+
+    def test_sheet_part_missing(self):
+        """Test a sheet relationship pointing at a missing part"""
+        validator = self.make_workbook(sheet_target="worksheets/missing.xml")
+        self.assert_check(
+            validator,
+            "validate_sheet_relationships",
+            "Sheet 'Data' references 'rId1', whose target part does not exist",
+        )
+
+    def test_package_without_workbook(self):
+        """Test a package whose relationships do not lead to a workbook"""
+        validator = self.make_package(
+            {
+                "_rels/.rels": relationships(
+                    ("rId1", "officeDocument", "word/document.xml")
+                ),
+                "word/document.xml": '<w:document xmlns:w="http://schemas.'
+                'openxmlformats.org/wordprocessingml/2006/main"/>',
+            }
+        )
+        self.assert_check(
+            validator,
+            "validate_sheet_relationships",
+            "do not lead to a SpreadsheetML workbook part",
+        )
+
+    def test_defined_names(self):
+        """Test invalid and cell-like defined names"""
+        names = ["1st", "A1", "xfd1048576", "R1C1", "ZZZ1", "A1048577", "Q4.Sales"]
+        validator = self.make_workbook(
+            defined_names="<definedNames>"
+            + "".join(
+                f'<definedName name="{name}">Data!$A$1</definedName>' for name in names
+            )
+            + "</definedNames>"
+        )
+        self.assert_check(
+            validator,
+            "validate_defined_names",
+            "Invalid defined name '1st'",
+            "Invalid defined name 'A1'",
+            "Invalid defined name 'xfd1048576'",
+            "Invalid defined name 'R1C1'",
+        )
+
+    def test_calc_chain_errors(self):
+        """Test calcChain entries for missing cells, the wrong sheet or no sheet"""
+        validator = self.make_workbook(
+            calc_chain='<c r="C1"/><c r="C1" i="1"/><c r="A1"/><c r="E5"/>'
+            '<c r="C1" i="2"/>'
+        )
+        self.assert_check(
+            validator,
+            "validate_calc_chain",
+            "Line 1: Entry for C1 has no sheet id (i) to inherit",
+            "Line 1: Entry for A1 in xl/worksheets/sheet1.xml, but that cell has no formula",
+            "Line 1: Entry for E5 in xl/worksheets/sheet1.xml, but that cell has no formula",
+            "Line 1: Entry for C1 refers to sheet id 2, which is not a worksheet",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import unittest
+import contextlib
+import io
+from validation.budget import ErrorBudget
+
+
+def failing_check(count, details=0, result=False):
+    """Helper returning a check that prints count errors under a FAILED line"""
+
+    def check():
+        print(f"FAILED - Found {count} errors:")
+        for i in range(count):
+            print(f"  part.xml: Line {i + 1}: Error {i + 1}")
+            for j in range(details):
+                print(f"    Detail {j + 1} of error {i + 1}")
+        print("Hint printed after the errors")
+        return result
+
+    return check
+
+
+def passing_check():
+    print("PASSED - Nothing to report")
+    print("  indented, but not under a FAILED line")
+    return True
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestErrorBudget(unittest.TestCase):
+
+    def run_check(self, budget, check):
+        """Helper to run a check through the budget, returning its result and output"""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            result = budget.run(check)
+        return result, output.getvalue().splitlines()
+
+    def test_counts_errors_without_limit(self):
+        """Test that two-space lines under FAILED count as errors, four-space ones do not"""
+        budget = ErrorBudget()
+        result, lines = self.run_check(budget, failing_check(3, details=2))
+        self.assertFalse(result)
+        self.assertEqual(budget.errors, 3)
+        self.assertEqual(len(lines), 1 + 3 * 3 + 1)
+        self.assertFalse(budget.exhausted())
+        self.assertIsNone(budget.stop_after())
+
+    def test_lines_outside_failures(self):
+        """Test that indented lines after PASSED or after a failure's end are not errors"""
+        budget = ErrorBudget()
+        self.run_check(budget, passing_check)
+        self.assertEqual(budget.errors, 0)
+
+        def check():
+            print("FAILED - Found 1 error:")
+            print("  part.xml: Error")
+            print("")
+            print("  still part of the failure")
+            print("Summary line")
+            print("  not an error")
+            return False
+
+        _, lines = self.run_check(budget, check)
+        self.assertEqual(budget.errors, 2)
+        self.assertEqual(lines[-1], "  not an error")
+
+    def test_per_check_limit(self):
+        """Test that errors past the per-check limit are hidden with their details"""
+        budget = ErrorBudget(max_errors_per_check=2)
+        _, lines = self.run_check(budget, failing_check(5, details=1))
+        self.assertEqual(
+            lines,
+            [
+                "FAILED - Found 5 errors:",
+                "  part.xml: Line 1: Error 1",
+                "    Detail 1 of error 1",
+                "  part.xml: Line 2: Error 2",
+                "    Detail 1 of error 2",
+                "... 3 more error(s) not shown (error limit reached)",
+                "Hint printed after the errors",
+            ],
+        )
+        self.assertEqual(budget.errors, 5)
+        # The per-check limit does not end the run
+        self.assertFalse(budget.exhausted())
+        _, lines = self.run_check(budget, failing_check(1))
+        self.assertIn("  part.xml: Line 1: Error 1", lines)
+
+    def test_total_limit(self):
+        """Test that the total limit carries over between checks and ends the run"""
+        budget = ErrorBudget(max_errors=3)
+        self.run_check(budget, failing_check(2))
+        self.assertFalse(budget.exhausted())
+
+        stop_after = []
+
+        def check():
+            stop_after.append(budget.stop_after())
+            return failing_check(2)()
+
+        _, lines = self.run_check(budget, check)
+        self.assertEqual(stop_after, [1])
+        self.assertEqual(
+            [line for line in lines if line.startswith("  ")],
+            ["  part.xml: Line 1: Error 1"],
+        )
+        self.assertIn("... 1 more error(s) not shown (error limit reached)", lines)
+        self.assertEqual(budget.errors, 4)
+        self.assertTrue(budget.exhausted())
+        self.assertIsNone(budget.stop_after())
+
+    def test_fail_fast(self):
+        """Test that fail-fast ends the run after the first failed check"""
+        budget = ErrorBudget(fail_fast=True)
+        self.assertEqual(budget.stop_after(), 1)
+        self.run_check(budget, passing_check)
+        self.assertFalse(budget.exhausted())
+
+        # Errors reported by a check that still passes do not end the run
+        self.run_check(budget, failing_check(1, result=True))
+        self.assertFalse(budget.exhausted())
+
+        self.run_check(budget, failing_check(2))
+        self.assertTrue(budget.failed)
+        self.assertTrue(budget.exhausted())
+
+    def test_partial_lines(self):
+        """Test output written in pieces, without a final newline"""
+        budget = ErrorBudget(max_errors_per_check=1)
+
+        def check():
+            print("FAILED - Found 2 errors:\n  first", end="")
+            print(" error\n  second error", end="")
+            return False
+
+        _, lines = self.run_check(budget, check)
+        self.assertEqual(budget.errors, 2)
+        self.assertEqual(
+            lines,
+            [
+                "FAILED - Found 2 errors:",
+                "  first error",
+                "... 1 more error(s) not shown (error limit reached)",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import unittest
+import tempfile
+from pathlib import Path
+import lxml.etree
+from validation.rules import TrackedTextRule, run_rules
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+# Runs of text, inserted and deleted text by several authors, nested both ways
+BODY = """
+<w:p><w:r><w:t>Plain paragraph</w:t></w:r></w:p>
+<w:p>
+  <w:r><w:t xml:space="preserve">Keep </w:t></w:r>
+  <w:ins w:author="Claude"><w:r><w:t>added by Claude </w:t></w:r></w:ins>
+  <w:del w:author="Claude"><w:r><w:delText>removed by Claude </w:delText></w:r></w:del>
+  <w:ins w:author="Alice"><w:r><w:t>added by Alice </w:t></w:r></w:ins>
+  <w:del w:author="Alice"><w:r><w:delText>removed by Alice </w:delText></w:r></w:del>
+  <w:r><w:t>end</w:t></w:r>
+</w:p>
+<w:p>
+  <w:ins w:author="Alice">
+    <w:r><w:t xml:space="preserve">Alice inserted </w:t></w:r>
+    <w:del w:author="Claude"><w:r><w:delText>then Claude rejected </w:delText></w:r></w:del>
+  </w:ins>
+  <w:del w:author="Alice"><w:r><w:delText>Alice deleted </w:delText></w:r></w:del>
+  <w:ins w:author="Claude"><w:r><w:t>and Claude restored </w:t></w:r></w:ins>
+  <w:del w:author="Claude">
+    <w:ins w:author="Bob"><w:r><w:t>Bob inside Claude's deletion </w:t></w:r></w:ins>
+    <w:r><w:delText>Claude deleted</w:delText></w:r>
+  </w:del>
+</w:p>
+<w:p>
+  <w:del w:author="Bob">
+    <w:ins w:author="Claude"><w:r><w:t>Claude inside Bob's deletion</w:t></w:r></w:ins>
+    <w:r><w:delText>Bob deleted</w:delText></w:r>
+  </w:del>
+</w:p>
+<w:ins w:author="Claude"><w:p><w:r><w:t>Paragraph inserted by Claude</w:t></w:r></w:p></w:ins>
+<w:ins w:author="Alice"><w:p><w:r><w:t>Paragraph inserted by Alice</w:t></w:r></w:p></w:ins>
+<w:p>
+  <w:r><w:t xml:space="preserve">Outer </w:t></w:r>
+  <w:r><w:drawing><w:txbxContent>
+    <w:p><w:r><w:t>Text box </w:t></w:r>
+      <w:del w:author="Claude"><w:r><w:delText>with deletion</w:delText></w:r></w:del>
+    </w:p>
+    <w:ins w:author="Claude"><w:p><w:r><w:t>Inserted box paragraph</w:t></w:r></w:p></w:ins>
+  </w:txbxContent></w:drawing></w:r>
+  <w:r><w:t>after box</w:t></w:r>
+</w:p>
+<w:p><w:ins w:author="Claude"><w:r><w:t>Only inserted text</w:t></w:r></w:ins></w:p>
+<w:p><w:del w:author="Claude"><w:r><w:delText>Only deleted text</w:delText></w:r></w:del></w:p>
+"""
+
+DOCUMENT = f'<w:document xmlns:w="{W}"><w:body>{BODY}</w:body></w:document>'
+
+
+def reference_paragraphs(root, author):
+    """The ElementTree algorithm TrackedTextRule replaced: edit the tree, then read it.
+
+    The original walked root.iter() while removing elements, which stops the
+    walk inside the first removed w:ins and leaves later ones in place; the
+    elements are listed before they are edited here.
+    """
+    ins_tag, del_tag = f"{{{W}}}ins", f"{{{W}}}del"
+    author_attr = f"{{{W}}}author"
+
+    # Remove w:ins elements
+    for parent in list(root.iter()):
+        to_remove = []
+        for child in parent:
+            if child.tag == ins_tag and child.get(author_attr) == author:
+                to_remove.append(child)
+        for elem in to_remove:
+            parent.remove(elem)
+
+    # Unwrap content in w:del elements by the author
+    deltext_tag, t_tag = f"{{{W}}}delText", f"{{{W}}}t"
+    for parent in list(root.iter()):
+        to_process = []
+        for child in parent:
+            if child.tag == del_tag and child.get(author_attr) == author:
+                to_process.append((child, list(parent).index(child)))
+        for del_elem, del_index in reversed(to_process):
+            for elem in del_elem.iter():
+                if elem.tag == deltext_tag:
+                    elem.tag = t_tag
+            for child in reversed(list(del_elem)):
+                parent.insert(del_index, child)
+            parent.remove(del_elem)
+
+    paragraphs = []
+    for p_elem in root.findall(f".//{{{W}}}p"):
+        text = "".join(t.text for t in p_elem.findall(f".//{t_tag}") if t.text)
+        if text:
+            paragraphs.append(text)
+    return paragraphs
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestTrackedTextRule(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = Path(temp_dir.name) / "document.xml"
+        self.path.write_text(DOCUMENT, encoding="utf-8")
+
+    def tracked_text(self, author, streamed):
+        """Helper to run a TrackedTextRule over the document"""
+        rule = TrackedTextRule("word/document.xml", author, W)
+        tree = None if streamed else lxml.etree.parse(str(self.path))
+        run_rules([rule], self.path, tree=tree)
+        return rule
+
+    def test_matches_reference(self):
+        """Test the paragraphs against the ElementTree algorithm, for each author"""
+        for author in ("Claude", "Alice", "Bob", "Nobody"):
+            expected = reference_paragraphs(
+                lxml.etree.fromstring(DOCUMENT.encode("utf-8")), author
+            )
+            for streamed in (False, True):
+                with self.subTest(author=author, streamed=streamed):
+                    rule = self.tracked_text(author, streamed)
+                    self.assertEqual(rule.paragraphs, expected)
+
+    def test_changes(self):
+        """Test the count of tracked changes by the author"""
+        self.assertEqual(self.tracked_text("Claude", False).changes, 11)
+        self.assertEqual(self.tracked_text("Nobody", False).changes, 0)
+
+    def test_claude_text(self):
+        """Test the text before Claude's changes"""
+        self.assertEqual(
+            self.tracked_text("Claude", True).paragraphs,
+            [
+                "Plain paragraph",
+                "Keep removed by Claude added by Alice end",
+                "Alice inserted then Claude rejected "
+                "Bob inside Claude's deletion Claude deleted",
+                "Paragraph inserted by Alice",
+                "Outer Text box with deletionafter box",
+                "Text box with deletion",
+                "Only deleted text",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,14 +2,30 @@
 Validation modules for Word document processing.
 """
 
+from .archive import ArchivePath
 from .base import BaseSchemaValidator
+from .batch import BatchValidator, validate_document
+from .budget import ErrorBudget
 from .docx import DOCXSchemaValidator
+from .package import ParsedPackage
 from .pptx import PPTXSchemaValidator
 from .redlining import RedliningValidator
+from .report import ValidationReport
+from .schemas import SchemaRegistry, get_schema_registry
+from .xlsx import XLSXSchemaValidator
 
 __all__ = [
+    "ArchivePath",
     "BaseSchemaValidator",
+    "BatchValidator",
     "DOCXSchemaValidator",
+    "ErrorBudget",
+    "ParsedPackage",
     "PPTXSchemaValidator",
     "RedliningValidator",
+    "SchemaRegistry",
+    "ValidationReport",
+    "XLSXSchemaValidator",
+    "get_schema_registry",
+    "validate_document",
 ]
@@ -2,11 +2,52 @@
 Base validator with common validation logic for document files.
 """
 
+import copy
+import io
+import os
+import posixpath
 import re
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path, PurePosixPath
 
 import lxml.etree
 
+from .archive import open_part, package_root
+from .baseline import OriginalBaseline, code_digest, file_digest
+from .index import PackageIndex
+from .manifest import ValidationManifest
+from .opc import RelationshipGraph
+from .package import ParsedPackage
+from .rules import (
+    RelationshipIdRule,
+    RootRule,
+    UniqueIdRule,
+    run_rules,
+    sniff_root,
+)
+from .schemas import get_schema_registry
+from .streaming import stream_validate
+
+# XSD schemas shipped with the skill
+SCHEMAS_DIR = Path(__file__).parent.parent.parent / "schemas"
+
+
+def warm_schema_cache(schema_bundle=None):
+    """Compile every schema a validator may need into the process-wide cache.
+
+    Args:
+        schema_bundle: Optional schema bundle to load from (created if missing)
+    """
+    schema_paths = sorted(set(BaseSchemaValidator.SCHEMA_MAPPINGS.values()))
+    registry = get_schema_registry(SCHEMAS_DIR)
+    if schema_bundle:
+        registry.use_bundle(schema_bundle, [SCHEMAS_DIR / path for path in schema_paths])
+    for schema in schema_paths:
+        try:
+            registry.get(SCHEMAS_DIR / schema)
+        except Exception:
+            continue  # Reported when a part using this schema is validated
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -41,6 +82,27 @@ class BaseSchemaValidator:
     # Subclasses should override this with format-specific mappings
     ELEMENT_RELATIONSHIP_TYPES = {}
 
+    # Checks that read more than one part, for incremental validation:
+    # check name -> (regex of the parts they read, whether adding or removing any
+    # file affects them). They are skipped while those parts are unchanged since
+    # their last pass. All other checks run only on parts whose content (or .rels
+    # file) changed since they last passed on them, except that checks in
+    # GLOBAL_ID_CHECKS run on every part when a part with a global-scope ID changes.
+    CROSS_PART_CHECKS = {
+        "validate_file_references": (r"\.rels$", True),
+        # Reads [Content_Types].xml and the root element of every XML part
+        "validate_content_types": (r"\.xml$", True),
+    }
+    GLOBAL_ID_CHECKS = {"validate_unique_ids"}
+
+    # Template placeholders such as {{ name }}, removed from text before XSD validation
+    TEMPLATE_TAG_PATTERN = re.compile(r"\{\{[^}]*\}\}")
+
+    # Parts at least this large are streamed by the rule engine and by XSD
+    # validation instead of being built as a tree, keeping memory bounded for
+    # very large documents
+    STREAMING_THRESHOLD = 8 * 1024 * 1024
+
     # Unified schema mappings for all Office document types
     SCHEMA_MAPPINGS = {
         # Document type specific schemas
@@ -103,35 +165,194 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
-        self.unpacked_dir = Path(unpacked_dir).resolve()
+    def __init__(
+        self,
+        unpacked_dir,
+        original_file,
+        verbose=False,
+        schema_bundle=None,
+        cache_dir=None,
+        package=None,
+        jobs=1,
+        incremental=False,
+        report=None,
+        error_budget=None,
+    ):
+        # An unpacked directory, or the packed document itself (read in place)
+        self.unpacked_dir = package_root(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
 
-        # Set schemas directory
-        self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
+        # Optional ValidationReport recording the cost and errors of each check
+        self.report = report
+
+        # Optional ErrorBudget limiting the errors reported, shared across validators
+        self.error_budget = error_budget
+
+        # Number of worker processes for XSD validation (0 or less: one per CPU)
+        self.jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+        self.schema_bundle = schema_bundle
+
+        # Parsed parts, shared by every check (and by other validators if passed in)
+        if package is None:
+            package = ParsedPackage(self.unpacked_dir)
+        self.package = package
+
+        # XSD errors already present in the original, read from its archive on demand
+        self.original_baseline = OriginalBaseline(self, cache_dir=cache_dir)
+
+        # Set schemas directory and the process-wide compiled schema cache
+        self.schemas_dir = SCHEMAS_DIR
+        self.schema_registry = get_schema_registry(self.schemas_dir)
+        if schema_bundle:
+            self.schema_registry.use_bundle(
+                schema_bundle,
+                [self.schemas_dir / path for path in set(self.SCHEMA_MAPPINGS.values())],
+            )
+
+        # Every file in the package, listed once; later lookups use this index
+        self.file_index = PackageIndex(self.unpacked_dir)
 
         # Get all XML and .rels files
-        patterns = ["*.xml", "*.rels"]
         self.xml_files = [
-            f for pattern in patterns for f in self.unpacked_dir.rglob(pattern)
+            self.file_index.path(name)
+            for suffix in (".xml", ".rels")
+            for name in self.file_index.with_suffix(suffix)
         ]
 
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+        # Results of the single rule pass over each part (see _rule_results)
+        self._rule_cache = {}
+
+        # Parts, content types and relationships, read on first use
+        self._graph = None
+
+        # Results of earlier runs, used to re-validate only what changed
+        self.manifest = None
+        if incremental:
+            global_id_tags = "|".join(
+                tag
+                for tag, (_, scope) in self.UNIQUE_ID_REQUIREMENTS.items()
+                if scope == "global"
+            )
+            self.manifest = ValidationManifest(
+                self.unpacked_dir,
+                type(self).__name__,
+                file_digest(self.original_file),
+                id_pattern=re.compile(
+                    rf"<(?:[\w.-]+:)?(?:{global_id_tags})[\s/>]".encode(),
+                    re.IGNORECASE,
+                ),
+                schemas_digest=self.schema_registry.digest(),
+                code_digest=code_digest(type(self)),
+            )
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
 
+    def run_check(self, check):
+        """Run a validation check, limited to what changed when validating incrementally.
+
+        Args:
+            check: Bound validation method, e.g. self.validate_namespaces
+
+        Returns:
+            bool: Result of the check (True if it was skipped as unchanged or
+                because the error budget is exhausted)
+        """
+        if self.error_budget is None:
+            return self._measured(check.__name__, lambda: self._run_check(check))
+        return self._measured(check.__name__, lambda: self._run_budgeted(check))
+
+    def _run_budgeted(self, check):
+        """Run a check within the error budget, or skip it if the budget is spent."""
+        if self.error_budget.exhausted():
+            if self.verbose:
+                print(f"SKIPPED - {check.__name__}: error limit reached")
+            if self.report is not None:
+                self.report.mark_skipped()
+            return True
+        return self.error_budget.run(lambda: self._run_check(check))
+
+    def _stop_after(self):
+        """Return how many errors the running check may find before stopping early."""
+        if self.error_budget is None:
+            return None
+        return self.error_budget.stop_after()
+
+    def _measured(self, name, check):
+        """Call check(), recording it in self.report if there is one."""
+        if self.report is None:
+            return check()
+        return self.report.run(type(self).__name__, name, self.package, check)
+
+    def _run_check(self, check):
+        if self.manifest is None:
+            return check()
+
+        name = check.__name__
+        if name in self.CROSS_PART_CHECKS:
+            pattern, file_list = self.CROSS_PART_CHECKS[name]
+            digest = self.manifest.inputs_digest(pattern, file_list=file_list)
+            if self.manifest.inputs_unchanged(name, digest):
+                if self.verbose:
+                    print(f"SKIPPED - {name}: no relevant changes since last pass")
+                if self.report is not None:
+                    self.report.mark_skipped()
+                return True
+
+            passed = check()
+            self.manifest.record_inputs(name, digest, passed)
+            self.manifest.save()
+            return passed
+
+        # Per-part check: run it on the parts that changed since it passed on them
+        parts = {
+            xml_file.relative_to(self.unpacked_dir).as_posix(): xml_file
+            for xml_file in self.xml_files
+        }
+        dirty = self.manifest.dirty_parts(name, parts)
+        if name in self.GLOBAL_ID_CHECKS:
+            digest = self.manifest.inputs_digest(id_bearing=True)
+            if not self.manifest.inputs_unchanged(name, digest):
+                dirty = list(parts)
+
+        if not dirty:
+            if self.verbose:
+                print(f"SKIPPED - {name}: no parts changed since last pass")
+            if self.report is not None:
+                self.report.mark_skipped()
+            return True
+
+        all_xml_files = self.xml_files
+        self.xml_files = [parts[rel_path] for rel_path in dirty]
+        try:
+            passed = check()
+        finally:
+            self.xml_files = all_xml_files
+
+        self.manifest.record_parts(name, dirty, passed)
+        if name in self.GLOBAL_ID_CHECKS:
+            self.manifest.record_inputs(name, digest, passed)
+        self.manifest.save()
+        return passed
+
     def validate_xml(self):
         """Validate that all XML files are well-formed."""
         errors = []
+        stop_after = self._stop_after()
+        stopped = False
 
         for xml_file in self.xml_files:
+            if stop_after is not None and len(errors) >= stop_after:
+                stopped = True
+                break
             try:
-                # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
+                # Parse the XML file, running every element rule in the same pass
+                self._rule_results(xml_file)
             except lxml.etree.XMLSyntaxError as e:
                 errors.append(
                     f"  {xml_file.relative_to(self.unpacked_dir)}: "
@@ -147,6 +368,8 @@ class BaseSchemaValidator:
             print(f"FAILED - Found {len(errors)} XML violations:")
             for error in errors:
                 print(error)
+            if stopped:
+                print("Stopped at the error limit; remaining files were not checked.")
             return False
         else:
             if self.verbose:
@@ -159,12 +382,10 @@ class BaseSchemaValidator:
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
+                root = self._root_info(xml_file)
+                declared = root.declared  # Excludes the default namespace
 
-                for attr_val in [
-                    v for k, v in root.attrib.items() if k.endswith("Ignorable")
-                ]:
+                for attr_val in root.ignorable:
                     undeclared = set(attr_val.split()) - declared
                     errors.extend(
                         f"  {xml_file.relative_to(self.unpacked_dir)}: "
@@ -190,74 +411,41 @@ class BaseSchemaValidator:
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                ids = self._rule_results(xml_file)["unique_ids"].ids
                 file_ids = {}  # Track IDs that must be unique within this file
 
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
-                    # Get the element name without namespace
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
-                    )
-
-                    # Check if this element type has ID uniqueness requirements
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        # Look for the specified attribute
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
+                # IDs outside of mc:AlternateContent, in document order
+                for tag, attr_name, id_value, scope, line in ids:
+                    if scope == "global":
+                        # Check global uniqueness
+                        if id_value in global_ids:
+                            prev_file, prev_line, prev_tag = global_ids[id_value]
+                            errors.append(
+                                f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                                f"Line {line}: Global ID '{id_value}' in <{tag}> "
+                                f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
+                            )
+                        else:
+                            global_ids[id_value] = (
+                                xml_file.relative_to(self.unpacked_dir),
+                                line,
+                                tag,
+                            )
+                    elif scope == "file":
+                        # Check file-level uniqueness
+                        key = (tag, attr_name)
+                        if key not in file_ids:
+                            file_ids[key] = {}
+
+                        if id_value in file_ids[key]:
+                            prev_line = file_ids[key][id_value]
+                            errors.append(
+                                f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                                f"Line {line}: Duplicate {attr_name}='{id_value}' in <{tag}> "
+                                f"(first occurrence at line {prev_line})"
                             )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                # Check global uniqueness
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                # Check file-level uniqueness
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
+                        else:
+                            file_ids[key][id_value] = line
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
                 errors.append(
@@ -274,6 +462,72 @@ class BaseSchemaValidator:
                 print("PASSED - All required IDs are unique")
             return True
 
+    def _stream_rules(self, xml_file):
+        """Return the rules to run over a part in its single pass, keyed by name.
+
+        Subclasses extend this to plug in more rules without another tree walk.
+        """
+        part = xml_file.relative_to(self.unpacked_dir)
+        return {
+            "root": RootRule(part),
+            "unique_ids": UniqueIdRule(
+                part, self.UNIQUE_ID_REQUIREMENTS, self.MC_NAMESPACE
+            ),
+            "relationship_ids": RelationshipIdRule(
+                part, self.OFFICE_RELATIONSHIPS_NAMESPACE
+            ),
+        }
+
+    def _rule_results(self, xml_file):
+        """Run every rule over a part in one pass and return them by name.
+
+        Small parts are walked through the shared parsed tree; parts that
+        _streams_part selects are streamed without building a tree. Results
+        (or the parse error) are memoized for the lifetime of the validator.
+        """
+        results = self._rule_cache.get(xml_file)
+        if results is None:
+            rules = self._stream_rules(xml_file)
+            try:
+                tree = None
+                name = xml_file.relative_to(self.unpacked_dir).as_posix()
+                size = self.file_index.size(name)
+                if not self._streams_part(name, size):
+                    tree = self.package.parse(xml_file)
+                else:
+                    self.package.count_read(size)
+                run_rules(rules.values(), xml_file, tree=tree)
+                results = rules
+            except Exception as e:
+                results = e
+            self._rule_cache[xml_file] = results
+
+        if isinstance(results, Exception):
+            raise results
+        return results
+
+    def _streams_part(self, name, size):
+        """Return True if a part is streamed instead of parsed into a shared tree.
+
+        Parts of at least STREAMING_THRESHOLD bytes are streamed, both by the
+        rule pass and by XSD validation; subclasses may stream more parts.
+        """
+        return size >= self.STREAMING_THRESHOLD
+
+    def _root_info(self, xml_file):
+        """Return the RootRule of a part without a full parse if possible.
+
+        If the rule pass already ran over the part its RootRule (or parse error)
+        is reused; otherwise only the part's root start tag is read.
+        """
+        results = self._rule_cache.get(xml_file)
+        if results is None:
+            part = xml_file.relative_to(self.unpacked_dir)
+            return sniff_root(part, xml_file)
+        if isinstance(results, Exception):
+            raise results
+        return results["root"]
+
     def validate_file_references(self):
         """
         Validate that all .rels files properly reference files and that all files are referenced.
@@ -281,7 +535,7 @@ class BaseSchemaValidator:
         errors = []
 
         # Find all .rels files
-        rels_files = list(self.unpacked_dir.rglob("*.rels"))
+        rels_files = self.file_index.with_suffix(".rels")
 
         if not rels_files:
             if self.verbose:
@@ -289,14 +543,12 @@ class BaseSchemaValidator:
             return True
 
         # Get all files in the unpacked directory (excluding reference files)
-        all_files = []
-        for file_path in self.unpacked_dir.rglob("*"):
-            if (
-                file_path.is_file()
-                and file_path.name != "[Content_Types].xml"
-                and not file_path.name.endswith(".rels")
-            ):  # This file is not referenced by .rels
-                all_files.append(file_path.resolve())
+        all_files = [
+            name
+            for name in self.file_index
+            if posixpath.basename(name) != "[Content_Types].xml"
+            and not name.endswith(".rels")
+        ]  # These files are not referenced by .rels
 
         # Track all files that are referenced by any .rels file
         all_referenced_files = set()
@@ -307,66 +559,41 @@ class BaseSchemaValidator:
             )
 
         # Check each .rels file
+        graph = self._relationship_graph()
         for rels_file in rels_files:
             try:
-                # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Get the directory where this .rels file is located
-                rels_dir = rels_file.parent
-
                 # Find all relationships and their targets
-                referenced_files = set()
                 broken_refs = []
 
-                for rel in rels_root.findall(
-                    ".//ns:Relationship",
-                    namespaces={"ns": self.PACKAGE_RELATIONSHIPS_NAMESPACE},
-                ):
-                    target = rel.get("Target")
+                for rel in graph.relationships_in(rels_file):
+                    target = rel.target_ref
                     if target and not target.startswith(
                         ("http", "mailto:")
                     ):  # Skip external URLs
-                        # Resolve the target path relative to the .rels file location
-                        if rels_file.name == ".rels":
-                            # Root .rels file - targets are relative to unpacked_dir
-                            target_path = self.unpacked_dir / target
+                        # Targets resolve relative to the .rels file's source part
+                        if rel.target in self.file_index:
+                            all_referenced_files.add(rel.target)
                         else:
-                            # Other .rels files - targets are relative to their parent's parent
-                            # e.g., word/_rels/document.xml.rels -> targets relative to word/
-                            base_dir = rels_dir.parent
-                            target_path = base_dir / target
-
-                        # Normalize the path and check if it exists
-                        try:
-                            target_path = target_path.resolve()
-                            if target_path.exists() and target_path.is_file():
-                                referenced_files.add(target_path)
-                                all_referenced_files.add(target_path)
-                            else:
-                                broken_refs.append((target, rel.sourceline))
-                        except (OSError, ValueError):
-                            broken_refs.append((target, rel.sourceline))
+                            broken_refs.append((target, rel.line))
 
                 # Report broken references
                 if broken_refs:
-                    rel_path = rels_file.relative_to(self.unpacked_dir)
+                    rel_path = rels_file
                     for broken_ref, line_num in broken_refs:
                         errors.append(
                             f"  {rel_path}: Line {line_num}: Broken reference to {broken_ref}"
                         )
 
             except Exception as e:
-                rel_path = rels_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error parsing {rel_path}: {e}")
+                errors.append(f"  Error parsing {rels_file}: {e}")
 
         # Check for unreferenced files (files that exist but are not referenced anywhere)
         unreferenced_files = set(all_files) - all_referenced_files
 
         if unreferenced_files:
-            for unref_file in sorted(unreferenced_files):
-                unref_rel_path = unref_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Unreferenced file: {unref_rel_path}")
+            # Sort by path components, as pathlib does
+            for unref_file in sorted(unreferenced_files, key=lambda n: n.split("/")):
+                errors.append(f"  Unreferenced file: {unref_file}")
 
         if errors:
             print(f"FAILED - Found {len(errors)} relationship validation errors:")
@@ -390,9 +617,8 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
         errors = []
+        graph = self._relationship_graph()
 
         # Process each XML file that might contain r:id references
         for xml_file in self.xml_files:
@@ -400,73 +626,53 @@ class BaseSchemaValidator:
             if xml_file.suffix == ".rels":
                 continue
 
-            # Determine the corresponding .rels file
-            # For dir/file.xml, it's dir/_rels/file.xml.rels
-            rels_dir = xml_file.parent / "_rels"
-            rels_file = rels_dir / f"{xml_file.name}.rels"
-
             # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
+            part = xml_file.relative_to(self.unpacked_dir).as_posix()
+            if not graph.has_relationships(part):
                 continue
 
             try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                # Get valid relationship IDs and their types from the graph
                 rid_to_type = {}
 
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
+                for rel in graph.relationships(part):
+                    rid = rel.id
                     if rid:
                         # Check for duplicate rIds
                         if rid in rid_to_type:
-                            rels_rel_path = rels_file.relative_to(self.unpacked_dir)
                             errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
+                                f"  {rel.rels_part}: Line {rel.line}: "
                                 f"Duplicate relationship ID '{rid}' (IDs must be unique)"
                             )
-                        # Extract just the type name from the full URL
-                        type_name = (
-                            rel_type.split("/")[-1] if "/" in rel_type else rel_type
+                        # Just the type name from the full URL
+                        rid_to_type[rid] = rel.type_name
+
+                # Find all r:id references, collected in the single pass over the part
+                references = self._rule_results(xml_file)["relationship_ids"]
+                for elem_name, rid_attr, sourceline in references.references:
+                    xml_rel_path = xml_file.relative_to(self.unpacked_dir)
+
+                    # Check if the ID exists
+                    if rid_attr not in rid_to_type:
+                        errors.append(
+                            f"  {xml_rel_path}: Line {sourceline}: "
+                            f"<{elem_name}> references non-existent relationship '{rid_attr}' "
+                            f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
                         )
-                        rid_to_type[rid] = type_name
-
-                # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all elements with r:id attributes
-                for elem in xml_root.iter():
-                    # Check for r:id attribute (relationship ID)
-                    rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
-                    if rid_attr:
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                        elem_name = (
-                            elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
+                    # Check if we have type expectations for this element
+                    elif self.ELEMENT_RELATIONSHIP_TYPES:
+                        expected_type = self._get_expected_relationship_type(
+                            elem_name
                         )
-
-                        # Check if the ID exists
-                        if rid_attr not in rid_to_type:
-                            errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
-                            )
-                        # Check if we have type expectations for this element
-                        elif self.ELEMENT_RELATIONSHIP_TYPES:
-                            expected_type = self._get_expected_relationship_type(
-                                elem_name
-                            )
-                            if expected_type:
-                                actual_type = rid_to_type[rid_attr]
-                                # Check if the actual type matches or contains the expected type
-                                if expected_type not in actual_type.lower():
-                                    errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
-                                    )
+                        if expected_type:
+                            actual_type = rid_to_type[rid_attr]
+                            # Check if the actual type matches or contains the expected type
+                            if expected_type not in actual_type.lower():
+                                errors.append(
+                                    f"  {xml_rel_path}: Line {sourceline}: "
+                                    f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
+                                    f"but should point to a '{expected_type}' relationship"
+                                )
 
             except Exception as e:
                 xml_rel_path = xml_file.relative_to(self.unpacked_dir)
@@ -483,6 +689,17 @@ class BaseSchemaValidator:
                 print("PASSED - All relationship ID references are valid")
             return True
 
+    def _relationship_graph(self):
+        """Return the package's RelationshipGraph, built on first use."""
+        if self._graph is None:
+            self._graph = RelationshipGraph(
+                self.file_index,
+                self.package,
+                self.PACKAGE_RELATIONSHIPS_NAMESPACE,
+                self.CONTENT_TYPES_NAMESPACE,
+            )
+        return self._graph
+
     def _get_expected_relationship_type(self, element_name):
         """
         Get the expected relationship type for an element.
@@ -524,32 +741,17 @@ class BaseSchemaValidator:
         errors = []
 
         # Find [Content_Types].xml file
-        content_types_file = self.unpacked_dir / "[Content_Types].xml"
-        if not content_types_file.exists():
+        if "[Content_Types].xml" not in self.file_index:
             print("FAILED - [Content_Types].xml file not found")
             return False
 
         try:
-            # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
-            declared_parts = set()
-            declared_extensions = set()
-
-            # Get Override declarations (specific files)
-            for override in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Override"
-            ):
-                part_name = override.get("PartName")
-                if part_name is not None:
-                    declared_parts.add(part_name.lstrip("/"))
-
-            # Get Default declarations (by extension)
-            for default in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Default"
-            ):
-                extension = default.get("Extension")
-                if extension is not None:
-                    declared_extensions.add(extension.lower())
+            # Declared parts and extensions, read once with the relationship graph
+            graph = self._relationship_graph()
+            if graph.content_types_error is not None:
+                raise graph.content_types_error
+            declared_parts = set(graph.overrides)
+            declared_extensions = set(graph.defaults)
 
             # Root elements that require content type declaration
             declarable_roots = {
@@ -575,10 +777,6 @@ class BaseSchemaValidator:
                 "emf": "image/x-emf",
             }
 
-            # Get all files in the unpacked directory
-            all_files = list(self.unpacked_dir.rglob("*"))
-            all_files = [f for f in all_files if f.is_file()]
-
             # Check all XML files for Override declarations
             for xml_file in self.xml_files:
                 path_str = str(xml_file.relative_to(self.unpacked_dir)).replace(
@@ -593,7 +791,7 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
+                    root_tag = self._root_info(xml_file).tag
                     root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
 
                     if root_name in declarable_roots and path_str not in declared_parts:
@@ -604,24 +802,23 @@ class BaseSchemaValidator:
                 except Exception:
                     continue  # Skip unparseable files
 
-            # Check all non-XML files for Default extension declarations
-            for file_path in all_files:
-                # Skip XML files and metadata files (already checked above)
-                if file_path.suffix.lower() in {".xml", ".rels"}:
-                    continue
-                if file_path.name == "[Content_Types].xml":
+            # Check all non-XML files for Default extension declarations, by
+            # extension: only known media extensions that are undeclared matter
+            undeclared = (
+                set(self.file_index.extensions) & set(media_extensions)
+            ) - declared_extensions
+            for relative_path in self.file_index:
+                extension = PurePosixPath(relative_path).suffix.lstrip(".").lower()
+                if extension not in undeclared:
                     continue
-                if "_rels" in file_path.parts or "docProps" in file_path.parts:
+                # Skip metadata files
+                parts = relative_path.split("/")
+                if "_rels" in parts or "docProps" in parts:
                     continue
 
-                extension = file_path.suffix.lstrip(".").lower()
-                if extension and extension not in declared_extensions:
-                    # Check if it's a known media extension that should be declared
-                    if extension in media_extensions:
-                        relative_path = file_path.relative_to(self.unpacked_dir)
-                        errors.append(
-                            f'  {relative_path}: File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>'
-                        )
+                errors.append(
+                    f'  {relative_path}: File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>'
+                )
 
         except Exception as e:
             errors.append(f"  Error parsing [Content_Types].xml: {e}")
@@ -649,13 +846,26 @@ class BaseSchemaValidator:
             tuple: (is_valid, new_errors_set) where is_valid is True/False/None (skipped)
         """
         # Resolve both paths to handle symlinks
-        xml_file = Path(xml_file).resolve()
+        xml_file = self._part_path(xml_file)
         unpacked_dir = self.unpacked_dir.resolve()
 
         # Validate current file
         is_valid, current_errors = self._validate_single_file_xsd(
             xml_file, unpacked_dir
         )
+        return self._compare_with_original_errors(
+            xml_file, is_valid, current_errors, verbose=verbose
+        )
+
+    def _compare_with_original_errors(
+        self, xml_file, is_valid, current_errors, verbose=False
+    ):
+        """Reduce a part's XSD errors to those not already present in the original.
+
+        Returns:
+            tuple: (is_valid, new_errors_set) where is_valid is True/False/None (skipped)
+        """
+        unpacked_dir = self.unpacked_dir.resolve()
 
         if is_valid is None:
             return None, set()  # Skipped
@@ -691,12 +901,14 @@ class BaseSchemaValidator:
         original_error_count = 0
         valid_count = 0
         skipped_count = 0
+        failed_count = 0
+        checked_count = 0
+        stop_after = self._stop_after()
 
-        for xml_file in self.xml_files:
+        results = self._iter_xsd_results()
+        for xml_file, (is_valid, new_file_errors) in zip(self.xml_files, results):
+            checked_count += 1
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -711,15 +923,28 @@ class BaseSchemaValidator:
                 continue
 
             # Has new errors
+            failed_count += 1
             new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
             for error in list(new_file_errors)[:3]:  # Show first 3 errors
                 new_errors.append(
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
+            # Stop (cancelling pending pool work) once enough files failed
+            if stop_after is not None and failed_count >= stop_after:
+                break
+
+        results.close()
+        stopped = checked_count < len(self.xml_files)
 
         # Print summary
         if self.verbose:
-            print(f"Validated {len(self.xml_files)} files:")
+            if stopped:
+                print(
+                    f"Validated {checked_count} of {len(self.xml_files)} files "
+                    "(stopped at the error limit):"
+                )
+            else:
+                print(f"Validated {len(self.xml_files)} files:")
             print(f"  - Valid: {valid_count}")
             print(f"  - Skipped (no schema): {skipped_count}")
             if original_error_count:
@@ -732,12 +957,73 @@ class BaseSchemaValidator:
             print("\nFAILED - Found NEW validation errors:")
             for error in new_errors:
                 print(error)
+            if stopped:
+                print("Stopped at the error limit; remaining files were not checked.")
             return False
         else:
             if self.verbose:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _iter_xsd_results(self):
+        """Yield validate_file_against_xsd results for self.xml_files, in order.
+
+        With more than one job, schema validation of the parts is spread over a
+        process pool, as is validation of the original's parts once a part has
+        errors to compare; results are still yielded in the order of self.xml_files.
+        Closing the generator early cancels the work not yet started.
+        """
+        jobs = min(self.jobs, len(self.xml_files))
+        if jobs <= 1:
+            for xml_file in self.xml_files:
+                yield self.validate_file_against_xsd(xml_file, verbose=False)
+            return
+
+        xml_files = [self._part_path(xml_file) for xml_file in self.xml_files]
+        executor = ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_xsd_worker,
+            initargs=(
+                type(self),
+                self.unpacked_dir,
+                self.original_file,
+                self.schema_bundle,
+            ),
+        )
+        try:
+            results = executor.map(
+                _validate_xsd_in_worker,
+                xml_files,
+                chunksize=max(1, len(xml_files) // (jobs * 4)),
+            )
+            for xml_file, (is_valid, current_errors) in zip(xml_files, results):
+                if is_valid is False:
+                    # The original's parts are validated by the same workers,
+                    # queued behind the candidate's
+                    self.original_baseline.prepare(
+                        lambda names: executor.map(
+                            _original_xsd_errors_in_worker,
+                            names,
+                            chunksize=max(1, len(names) // (jobs * 4)),
+                        )
+                    )
+                yield self._compare_with_original_errors(
+                    xml_file, is_valid, current_errors
+                )
+        finally:
+            # If the caller stopped early, drop the parts not yet started
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def warm_schemas(self):
+        """Compile every schema in SCHEMA_MAPPINGS ahead of time."""
+        warm_schema_cache(self.schema_bundle)
+
+    def _part_path(self, xml_file):
+        """Return a resolved path for a part given as a path or a string."""
+        if isinstance(xml_file, str):
+            xml_file = Path(xml_file)
+        return xml_file.resolve()
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -762,6 +1048,81 @@ class BaseSchemaValidator:
 
         return None
 
+    def _preprocess_for_xsd(self, xml_doc, relative_path, owned=False):
+        """Prepare a part for XSD validation in a single pass over one tree.
+
+        Strips template tags from text, mc:Ignorable from the root and, for parts
+        in MAIN_CONTENT_FOLDERS, attributes and elements outside OOXML_NAMESPACES.
+        The result is equivalent to _preprocess_for_xsd_reference, which runs the
+        original copy-per-step implementation.
+
+        Args:
+            xml_doc: Parsed part
+            relative_path: Path of the part relative to the package root
+            owned: Whether xml_doc may be modified; otherwise it is copied once
+        """
+        root = xml_doc.getroot()
+        if not owned:
+            root = copy.deepcopy(root)
+        clean_namespaces = (
+            relative_path.parts and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
+        )
+
+        # Remove mc:Ignorable attribute from root
+        root.attrib.pop(f"{{{self.MC_NAMESPACE}}}Ignorable", None)
+
+        stack = [root]
+        while stack:
+            elem = stack.pop()
+            tag = elem.tag
+
+            # Strip template tags from text content, except in w:t elements
+            if not (tag.endswith("}t") or tag == "t"):
+                if elem.text and "{{" in elem.text:
+                    elem.text = self.TEMPLATE_TAG_PATTERN.sub("", elem.text)
+                if elem.tail and "{{" in elem.tail:
+                    elem.tail = self.TEMPLATE_TAG_PATTERN.sub("", elem.tail)
+
+            if not clean_namespaces:
+                stack.extend(
+                    child for child in elem if isinstance(child.tag, str)
+                )
+                continue
+
+            # Remove attributes not in allowed namespaces
+            for attr in [a for a in elem.attrib if a.startswith("{")]:
+                if attr[1:].split("}")[0] not in self.OOXML_NAMESPACES:
+                    del elem.attrib[attr]
+
+            # Remove child elements not in allowed namespaces, clean the rest
+            for child in list(elem):
+                # Skip non-element nodes (comments, processing instructions, etc.)
+                if not isinstance(child.tag, str):
+                    continue
+                if (
+                    child.tag.startswith("{")
+                    and child.tag[1:].split("}")[0] not in self.OOXML_NAMESPACES
+                ):
+                    elem.remove(child)
+                else:
+                    stack.append(child)
+
+        return lxml.etree.ElementTree(root)
+
+    def _preprocess_for_xsd_reference(self, xml_doc, relative_path):
+        """Reference implementation of _preprocess_for_xsd, one copy per step.
+
+        Not used for validation: base_test.py checks that both give the same
+        trees.
+        """
+        xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
+        xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
+
+        # Clean ignorable namespaces if needed
+        if relative_path.parts and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS:
+            xml_doc = self._clean_ignorable_namespaces(xml_doc)
+        return xml_doc
+
     def _clean_ignorable_namespaces(self, xml_doc):
         """Remove attributes and elements not in allowed namespaces."""
         # Create a clean copy
@@ -825,33 +1186,40 @@ class BaseSchemaValidator:
 
     def _validate_single_file_xsd(self, xml_file, base_path):
         """Validate a single XML file against XSD schema. Returns (is_valid, errors_set)."""
-        schema_path = self._get_schema_path(xml_file)
+        return self._validate_part_xsd(xml_file, xml_file.relative_to(base_path))
+
+    def _validate_part_xsd(self, source, relative_path):
+        """Validate one package part against its XSD schema.
+
+        Args:
+            source: Path to the part on disk, or the raw bytes of the part
+            relative_path: Path of the part relative to the package root
+
+        Returns:
+            tuple: (is_valid, errors_set) where is_valid is True/False/None (skipped)
+        """
+        schema_path = self._get_schema_path(relative_path)
         if not schema_path:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
-
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
-
-            xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
-            xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
+            # Load schema (compiled once per process)
+            schema = self.schema_registry.get(schema_path)
+
+            # Large parts are validated while streaming, without building a tree
+            if self._streams_xsd(source, relative_path):
+                return self._stream_validate_part_xsd(source, relative_path, schema)
+
+            # Load and preprocess XML; a tree parsed here is ours to modify,
+            # while the shared package tree is copied once
+            if isinstance(source, bytes):
+                xml_doc = lxml.etree.parse(io.BytesIO(source))
+                owned = True
+            else:
+                xml_doc = self.package.parse(source)
+                owned = False
 
-            # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
-            if (
-                relative_path.parts
-                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
-            ):
-                xml_doc = self._clean_ignorable_namespaces(xml_doc)
+            xml_doc = self._preprocess_for_xsd(xml_doc, relative_path, owned=owned)
 
             # Validate
             if schema.validate(xml_doc):
@@ -866,6 +1234,46 @@ class BaseSchemaValidator:
         except Exception as e:
             return False, {str(e)}
 
+    def _streams_xsd(self, source, relative_path):
+        """Return True if a part is validated while streaming instead of as a tree.
+
+        Parts of the package are streamed if _streams_part says so, like in the
+        rule pass; raw bytes of at least STREAMING_THRESHOLD bytes and open files
+        (large parts of the original) are always streamed.
+        """
+        if isinstance(source, bytes):
+            return len(source) >= self.STREAMING_THRESHOLD
+        if hasattr(source, "read"):
+            return True
+        name = relative_path.as_posix()
+        size = self.file_index.sizes.get(name)
+        if size is None:
+            size = source.stat().st_size
+        return self._streams_part(name, size)
+
+    def _stream_validate_part_xsd(self, source, relative_path, schema):
+        """Validate a part while streaming it, preprocessed as by _preprocess_for_xsd.
+
+        Reports the same schema error messages as the tree path; only their
+        order and line numbers may differ, and neither is compared.
+        """
+        namespaces = None
+        if relative_path.parts and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS:
+            namespaces = self.OOXML_NAMESPACES
+        options = (
+            self.TEMPLATE_TAG_PATTERN,
+            f"{{{self.MC_NAMESPACE}}}Ignorable",
+            namespaces,
+        )
+
+        if isinstance(source, bytes):
+            return stream_validate(io.BytesIO(source), schema, *options)
+        if hasattr(source, "read"):
+            return stream_validate(source, schema, *options)
+        self.package.count_read(source.stat().st_size)
+        with open_part(source) as f:
+            return stream_validate(f, schema, *options)
+
     def _get_original_file_errors(self, xml_file):
         """Get XSD validation errors from a single file in the original document.
 
@@ -875,33 +1283,12 @@ class BaseSchemaValidator:
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
-        xml_file = Path(xml_file).resolve()
+        xml_file = self._part_path(xml_file)
         unpacked_dir = self.unpacked_dir.resolve()
         relative_path = xml_file.relative_to(unpacked_dir)
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
-
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
-
-            if not original_xml_file.exists():
-                # File didn't exist in original, so no original errors
-                return set()
-
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
+        return self.original_baseline.errors_for(relative_path)
 
     def _remove_template_tags_from_text_nodes(self, xml_doc):
         """Remove template tags from XML text nodes and collect warnings.
@@ -947,5 +1334,30 @@ class BaseSchemaValidator:
         return lxml.etree.ElementTree(xml_copy), warnings
 
 
+# Validator owned by the current XSD worker process (see _iter_xsd_results)
+_worker_validator = None
+
+
+def _init_xsd_worker(validator_class, unpacked_dir, original_file, schema_bundle):
+    """Set up a pool worker with its own validator and warm compiled schemas."""
+    global _worker_validator
+    _worker_validator = validator_class(
+        unpacked_dir, original_file, schema_bundle=schema_bundle
+    )
+    _worker_validator.warm_schemas()
+
+
+def _validate_xsd_in_worker(xml_file):
+    """Validate one part in a pool worker. Returns (is_valid, errors_set)."""
+    return _worker_validator._validate_single_file_xsd(
+        xml_file, _worker_validator.unpacked_dir
+    )
+
+
+def _original_xsd_errors_in_worker(name):
+    """Validate one part of the original in a pool worker. Returns its sorted errors."""
+    return _worker_validator.original_baseline.part_errors(name)
+
+
 if __name__ == "__main__":
     raise RuntimeError("This module should not be run directly.")
@@ -3,12 +3,12 @@ Validator for Word document XML files against XSD schemas.
 """
 
 import re
-import tempfile
-import zipfile
 
 import lxml.etree
 
 from .base import BaseSchemaValidator
+from .package import original_package
+from .rules import Rule
 
 
 class DOCXSchemaValidator(BaseSchemaValidator):
@@ -24,51 +24,62 @@ class DOCXSchemaValidator(BaseSchemaValidator):
     def validate(self):
         """Run all validation checks and return True if all pass."""
         # Test 0: XML well-formedness
-        if not self.validate_xml():
+        if not self.run_check(self.validate_xml):
             return False
 
         # Test 1: Namespace declarations
         all_valid = True
-        if not self.validate_namespaces():
+        if not self.run_check(self.validate_namespaces):
             all_valid = False
 
         # Test 2: Unique IDs
-        if not self.validate_unique_ids():
+        if not self.run_check(self.validate_unique_ids):
             all_valid = False
 
         # Test 3: Relationship and file reference validation
-        if not self.validate_file_references():
+        if not self.run_check(self.validate_file_references):
             all_valid = False
 
         # Test 4: Content type declarations
-        if not self.validate_content_types():
+        if not self.run_check(self.validate_content_types):
             all_valid = False
 
         # Test 5: XSD schema validation
-        if not self.validate_against_xsd():
+        if not self.run_check(self.validate_against_xsd):
             all_valid = False
 
         # Test 6: Whitespace preservation
-        if not self.validate_whitespace_preservation():
+        if not self.run_check(self.validate_whitespace_preservation):
             all_valid = False
 
         # Test 7: Deletion validation
-        if not self.validate_deletions():
+        if not self.run_check(self.validate_deletions):
             all_valid = False
 
         # Test 8: Insertion validation
-        if not self.validate_insertions():
+        if not self.run_check(self.validate_insertions):
             all_valid = False
 
         # Test 9: Relationship ID reference validation
-        if not self.validate_all_relationship_ids():
+        if not self.run_check(self.validate_all_relationship_ids):
             all_valid = False
 
         # Count and compare paragraphs
-        self.compare_paragraph_counts()
+        self._measured("compare_paragraph_counts", self.compare_paragraph_counts)
 
         return all_valid
 
+    def _stream_rules(self, xml_file):
+        """Add the tracked-change and text checks for document.xml to the pass."""
+        rules = super()._stream_rules(xml_file)
+        if xml_file.name == "document.xml":
+            part = xml_file.relative_to(self.unpacked_dir)
+            rules["whitespace"] = WhitespacePreservationRule(part)
+            rules["deletions"] = DeletedTextRule(part)
+            rules["insertions"] = InsertedDelTextRule(part)
+            rules["paragraphs"] = ParagraphCountRule(part)
+        return rules
+
     def validate_whitespace_preservation(self):
         """
         Validate that w:t elements with whitespace have xml:space='preserve'.
@@ -81,30 +92,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements
-                for elem in root.iter(f"{{{self.WORD_2006_NAMESPACE}}}t"):
-                    if elem.text:
-                        text = elem.text
-                        # Check if text starts or ends with whitespace
-                        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
-                            # Check if xml:space="preserve" attribute exists
-                            xml_space_attr = f"{{{self.XML_NAMESPACE}}}space"
-                            if (
-                                xml_space_attr not in elem.attrib
-                                or elem.attrib[xml_space_attr] != "preserve"
-                            ):
-                                # Show a preview of the text
-                                text_preview = (
-                                    repr(text)[:50] + "..."
-                                    if len(repr(text)) > 50
-                                    else repr(text)
-                                )
-                                errors.append(
-                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {text_preview}"
-                                )
+                errors.extend(self._rule_results(xml_file)["whitespace"].errors)
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
                 errors.append(
@@ -134,26 +122,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements that are descendants of w:del elements
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-                xpath_expression = ".//w:del//w:t"
-                problematic_t_elements = root.xpath(
-                    xpath_expression, namespaces=namespaces
-                )
-                for t_elem in problematic_t_elements:
-                    if t_elem.text:
-                        # Show a preview of the text
-                        text_preview = (
-                            repr(t_elem.text)[:50] + "..."
-                            if len(repr(t_elem.text)) > 50
-                            else repr(t_elem.text)
-                        )
-                        errors.append(
-                            f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                            f"Line {t_elem.sourceline}: <w:t> found within <w:del>: {text_preview}"
-                        )
+                errors.extend(self._rule_results(xml_file)["deletions"].errors)
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
                 errors.append(
@@ -180,10 +149,8 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
                 # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+                count = self._rule_results(xml_file)["paragraphs"].count
             except Exception as e:
                 print(f"Error counting paragraphs in unpacked document: {e}")
 
@@ -194,19 +161,12 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         count = 0
 
         try:
-            # Create temporary directory to unpack original
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Unpack original docx
-                with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                    zip_ref.extractall(temp_dir)
-
-                # Parse document.xml
-                doc_xml_path = temp_dir + "/word/document.xml"
-                root = lxml.etree.parse(doc_xml_path).getroot()
-
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+            # Read document.xml from the shared, already open original archive
+            rule = ParagraphCountRule("word/document.xml")
+            original_package(self.original_file).apply_rules(
+                [rule], "word/document.xml", self.STREAMING_THRESHOLD
+            )
+            count = rule.count
 
         except Exception as e:
             print(f"Error counting paragraphs in original document: {e}")
@@ -225,25 +185,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-
-                # Find w:delText in w:ins that are NOT within w:del
-                invalid_elements = root.xpath(
-                    ".//w:ins//w:delText[not(ancestor::w:del)]",
-                    namespaces=namespaces
-                )
-
-                for elem in invalid_elements:
-                    text_preview = (
-                        repr(elem.text or "")[:50] + "..."
-                        if len(repr(elem.text or "")) > 50
-                        else repr(elem.text or "")
-                    )
-                    errors.append(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Line {elem.sourceline}: <w:delText> within <w:ins>: {text_preview}"
-                    )
+                errors.extend(self._rule_results(xml_file)["insertions"].errors)
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
                 errors.append(
@@ -270,5 +212,74 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         print(f"\nParagraphs: {original_count} → {new_count} ({diff_str})")
 
 
+W_NAMESPACE = DOCXSchemaValidator.WORD_2006_NAMESPACE
+
+
+def _text_preview(text):
+    """Return a repr of text truncated for error messages."""
+    return repr(text)[:50] + "..." if len(repr(text)) > 50 else repr(text)
+
+
+class WhitespacePreservationRule(Rule):
+    """w:t elements with leading or trailing whitespace need xml:space='preserve'."""
+
+    tags = (f"{{{W_NAMESPACE}}}t",)
+    xml_space_attr = f"{{{DOCXSchemaValidator.XML_NAMESPACE}}}space"
+
+    def end(self, elem, context):
+        text = elem.text
+        if not text:
+            return
+        # Check if text starts or ends with whitespace
+        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
+            if elem.get(self.xml_space_attr) != "preserve":
+                self.errors.append(
+                    f"  {self.part}: "
+                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {_text_preview(text)}"
+                )
+
+
+class DeletedTextRule(Rule):
+    """w:t elements with text must not appear within w:del."""
+
+    tags = (f"{{{W_NAMESPACE}}}t",)
+    del_tag = f"{{{W_NAMESPACE}}}del"
+
+    def end(self, elem, context):
+        if elem.text and context.inside(self.del_tag):
+            self.errors.append(
+                f"  {self.part}: "
+                f"Line {elem.sourceline}: <w:t> found within <w:del>: {_text_preview(elem.text)}"
+            )
+
+
+class InsertedDelTextRule(Rule):
+    """w:delText must not appear within w:ins unless nested within a w:del."""
+
+    tags = (f"{{{W_NAMESPACE}}}delText",)
+    ins_tag = f"{{{W_NAMESPACE}}}ins"
+    del_tag = f"{{{W_NAMESPACE}}}del"
+
+    def end(self, elem, context):
+        if context.inside(self.ins_tag) and not context.inside(self.del_tag):
+            self.errors.append(
+                f"  {self.part}: "
+                f"Line {elem.sourceline}: <w:delText> within <w:ins>: {_text_preview(elem.text or '')}"
+            )
+
+
+class ParagraphCountRule(Rule):
+    """Counts w:p elements."""
+
+    tags = (f"{{{W_NAMESPACE}}}p",)
+
+    def __init__(self, part):
+        super().__init__(part)
+        self.count = 0
+
+    def start(self, elem, context):
+        self.count += 1
+
+
 if __name__ == "__main__":
     raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,201 @@
+"""
+Content-hash manifest for incremental validation of an unpacked package.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+
+from .archive import package_root
+
+# Bump when the manifest layout changes
+MANIFEST_FORMAT = 2
+
+# Files modified this recently are hashed again on the next run, because a
+# rewrite within the filesystem's timestamp granularity may keep size and mtime
+RACY_WINDOW_NS = 2 * 10**9
+
+
+class ValidationManifest:
+    """Part hashes and per-check results from earlier validations of a package.
+
+    The manifest lives next to the unpacked directory (or packed file), in
+    ``.<name>.validation.json``, and holds one section per validator class.
+    A section is discarded when the original file it was validated against,
+    the schemas (see SchemaRegistry.digest) or the validation code (see
+    baseline.code_digest) change.
+
+    Two kinds of results are recorded:
+
+    - Per-part checks remember the signature (part hash plus the hash of the
+      part's .rels file) of every part they last passed on, so only parts that
+      changed since are validated again.
+    - Cross-part checks remember a digest of all the parts they read, so they
+      are skipped entirely while those parts are unchanged since their last pass.
+    """
+
+    def __init__(
+        self,
+        unpacked_dir,
+        validator_name,
+        original_digest,
+        id_pattern=None,
+        schemas_digest=None,
+        code_digest=None,
+    ):
+        """
+        Args:
+            unpacked_dir: Unpacked directory (or packed file) being validated
+            validator_name: Name of the validator class owning the section
+            original_digest: Hash of the original file
+            id_pattern: Compiled bytes pattern of the parts with global-scope IDs
+            schemas_digest: Hash of the schemas the checks validate against
+            code_digest: Hash of the code of the checks
+        """
+        self.unpacked_dir = package_root(unpacked_dir).resolve()
+        self.path = (
+            self.unpacked_dir.parent / f".{self.unpacked_dir.name}.validation.json"
+        )
+        self.validator_name = validator_name
+        # Results are only reused while all of these are unchanged
+        self.section_key = {
+            "original": original_digest,
+            "schemas": schemas_digest,
+            "code": code_digest,
+        }
+        self.id_pattern = id_pattern
+
+        data = self._read()
+        # relative path -> [size, mtime_ns or None, sha256 or None, id_bearing]
+        self._known_files = data.get("files", {})
+        section = data.get("validators", {}).get(validator_name, {})
+        if section.get("key") != self.section_key:
+            section = {}
+        self.checks = section.get("checks", {})
+        self._files = None
+
+    @property
+    def files(self):
+        """Current state of every file, keyed by path relative to the package root."""
+        if self._files is None:
+            self._files = self._scan()
+        return self._files
+
+    def _scan(self):
+        """Hash every XML part whose size or modification time changed."""
+        files = {}
+        now = time.time_ns()
+        for path in self.unpacked_dir.rglob("*"):
+            if not path.is_file():
+                continue
+            rel_path = path.relative_to(self.unpacked_dir).as_posix()
+            stat = path.stat()
+
+            known = self._known_files.get(rel_path)
+            if known and known[:2] == [stat.st_size, stat.st_mtime_ns]:
+                files[rel_path] = known
+                continue
+
+            # Only XML parts are read by the checks, so only they need a content hash
+            digest = None
+            id_bearing = False
+            if rel_path.endswith((".xml", ".rels")):
+                data = path.read_bytes()
+                digest = hashlib.sha256(data).hexdigest()
+                id_bearing = bool(self.id_pattern and self.id_pattern.search(data))
+
+            mtime = stat.st_mtime_ns if now - stat.st_mtime_ns > RACY_WINDOW_NS else None
+            files[rel_path] = [stat.st_size, mtime, digest, id_bearing]
+        return files
+
+    def part_signature(self, rel_path):
+        """Return the hash of a part combined with the hash of its .rels file."""
+        parent, _, name = rel_path.rpartition("/")
+        rels_path = f"{parent}/_rels/{name}.rels" if parent else f"_rels/{name}.rels"
+        rels_entry = self.files.get(rels_path)
+        return f"{self.files[rel_path][2]}:{rels_entry[2] if rels_entry else ''}"
+
+    def inputs_digest(self, pattern=None, file_list=False, id_bearing=False):
+        """Return a digest of the parts a cross-part check reads.
+
+        Args:
+            pattern: Regex matching the relative paths of the parts read
+            file_list: Whether adding or removing any file affects the check
+            id_bearing: Whether parts carrying global-scope IDs are read
+        """
+        digest = hashlib.sha256()
+        for rel_path, entry in sorted(self.files.items()):
+            if (pattern and re.search(pattern, rel_path)) or (id_bearing and entry[3]):
+                digest.update(f"{rel_path}\0{entry[2]}\n".encode())
+            elif file_list:
+                digest.update(f"{rel_path}\n".encode())
+        return digest.hexdigest()
+
+    def dirty_parts(self, check_name, rel_paths):
+        """Return the parts that changed since check_name last passed on them."""
+        clean = self.checks.get(check_name, {}).get("clean", {})
+        return [
+            rel_path
+            for rel_path in rel_paths
+            if clean.get(rel_path) != self.part_signature(rel_path)
+        ]
+
+    def record_parts(self, check_name, rel_paths, passed):
+        """Record the outcome of a per-part check that ran on rel_paths."""
+        record = self.checks.setdefault(check_name, {})
+        clean = {
+            rel_path: signature
+            for rel_path, signature in record.get("clean", {}).items()
+            if rel_path in self.files
+        }
+        for rel_path in rel_paths:
+            if passed:
+                clean[rel_path] = self.part_signature(rel_path)
+            else:
+                clean.pop(rel_path, None)
+        record["clean"] = clean
+
+    def inputs_unchanged(self, check_name, digest):
+        """Return True if a cross-part check last passed on the same inputs."""
+        return self.checks.get(check_name, {}).get("passed_inputs") == digest
+
+    def record_inputs(self, check_name, digest, passed):
+        """Record the outcome of a cross-part check."""
+        self.checks.setdefault(check_name, {})["passed_inputs"] = (
+            digest if passed else None
+        )
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("format") != MANIFEST_FORMAT:
+            return {}
+        return data
+
+    def save(self):
+        """Write this validator's section, keeping the sections of other validators."""
+        data = self._read()
+        data["format"] = MANIFEST_FORMAT
+        data["files"] = self.files
+        data.setdefault("validators", {})[self.validator_name] = {
+            "key": self.section_key,
+            "checks": self.checks,
+        }
+
+        # Best effort: an unwritable location only costs speed
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            temp_path.replace(self.path)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
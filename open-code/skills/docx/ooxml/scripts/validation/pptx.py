@@ -2,6 +2,7 @@
 Validator for PowerPoint presentation XML files against XSD schemas.
 """
 
+import posixpath
 import re
 
 from .base import BaseSchemaValidator
@@ -15,6 +16,14 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         "http://schemas.openxmlformats.org/presentationml/2006/main"
     )
 
+    # PowerPoint checks that read several parts (see BaseSchemaValidator)
+    CROSS_PART_CHECKS = {
+        **BaseSchemaValidator.CROSS_PART_CHECKS,
+        "validate_slide_layout_ids": (r"^ppt/slideMasters/", False),
+        "validate_no_duplicate_slide_layouts": (r"^ppt/slides/_rels/", False),
+        "validate_notes_slide_references": (r"^ppt/slides/_rels/", False),
+    }
+
     # PowerPoint-specific element to relationship type mappings
     ELEMENT_RELATIONSHIP_TYPES = {
         "sldid": "slide",
@@ -28,48 +37,48 @@ class PPTXSchemaValidator(BaseSchemaValidator):
     def validate(self):
         """Run all validation checks and return True if all pass."""
         # Test 0: XML well-formedness
-        if not self.validate_xml():
+        if not self.run_check(self.validate_xml):
             return False
 
         # Test 1: Namespace declarations
         all_valid = True
-        if not self.validate_namespaces():
+        if not self.run_check(self.validate_namespaces):
             all_valid = False
 
         # Test 2: Unique IDs
-        if not self.validate_unique_ids():
+        if not self.run_check(self.validate_unique_ids):
             all_valid = False
 
         # Test 3: UUID ID validation
-        if not self.validate_uuid_ids():
+        if not self.run_check(self.validate_uuid_ids):
             all_valid = False
 
         # Test 4: Relationship and file reference validation
-        if not self.validate_file_references():
+        if not self.run_check(self.validate_file_references):
             all_valid = False
 
         # Test 5: Slide layout ID validation
-        if not self.validate_slide_layout_ids():
+        if not self.run_check(self.validate_slide_layout_ids):
             all_valid = False
 
         # Test 6: Content type declarations
-        if not self.validate_content_types():
+        if not self.run_check(self.validate_content_types):
             all_valid = False
 
         # Test 7: XSD schema validation
-        if not self.validate_against_xsd():
+        if not self.run_check(self.validate_against_xsd):
             all_valid = False
 
         # Test 8: Notes slide reference validation
-        if not self.validate_notes_slide_references():
+        if not self.run_check(self.validate_notes_slide_references):
             all_valid = False
 
         # Test 9: Relationship ID reference validation
-        if not self.validate_all_relationship_ids():
+        if not self.run_check(self.validate_all_relationship_ids):
             all_valid = False
 
         # Test 10: Duplicate slide layout references validation
-        if not self.validate_no_duplicate_slide_layouts():
+        if not self.run_check(self.validate_no_duplicate_slide_layouts):
             all_valid = False
 
         return all_valid
@@ -86,7 +95,7 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self.package.getroot(xml_file)
 
                 # Check all elements for ID attributes
                 for elem in root.iter():
@@ -130,9 +139,13 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         import lxml.etree
 
         errors = []
+        graph = self._relationship_graph()
 
         # Find all slide master files
-        slide_masters = list(self.unpacked_dir.glob("ppt/slideMasters/*.xml"))
+        slide_masters = [
+            self.file_index.path(name)
+            for name in self.file_index.glob("ppt/slideMasters/*.xml")
+        ]
 
         if not slide_masters:
             if self.verbose:
@@ -142,29 +155,21 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         for slide_master in slide_masters:
             try:
                 # Parse the slide master file
-                root = lxml.etree.parse(str(slide_master)).getroot()
-
-                # Find the corresponding _rels file for this slide master
-                rels_file = slide_master.parent / "_rels" / f"{slide_master.name}.rels"
+                root = self.package.getroot(slide_master)
 
-                if not rels_file.exists():
+                # The slide master's relationships must exist
+                part = slide_master.relative_to(self.unpacked_dir).as_posix()
+                if not graph.has_relationships(part):
                     errors.append(
-                        f"  {slide_master.relative_to(self.unpacked_dir)}: "
-                        f"Missing relationships file: {rels_file.relative_to(self.unpacked_dir)}"
+                        f"  {part}: Missing relationships file: "
+                        f"{graph.rels_part_of(part)}"
                     )
                     continue
 
-                # Parse the relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Build a set of valid relationship IDs that point to slide layouts
-                valid_layout_rids = set()
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rel_type = rel.get("Type", "")
-                    if "slideLayout" in rel_type:
-                        valid_layout_rids.add(rel.get("Id"))
+                # Relationship IDs that point to slide layouts
+                valid_layout_rids = {
+                    rel.id for rel in graph.of_type(part, "slideLayout")
+                }
 
                 # Find all sldLayoutId elements in the slide master
                 for sld_layout_id in root.findall(
@@ -202,33 +207,26 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
     def validate_no_duplicate_slide_layouts(self):
         """Validate that each slide has exactly one slideLayout reference."""
-        import lxml.etree
-
         errors = []
-        slide_rels_files = list(self.unpacked_dir.glob("ppt/slides/_rels/*.xml.rels"))
+        graph = self._relationship_graph()
+        slide_rels_files = self.file_index.glob("ppt/slides/_rels/*.xml.rels")
 
         for rels_file in slide_rels_files:
             try:
-                root = lxml.etree.parse(str(rels_file)).getroot()
-
                 # Find all slideLayout relationships
                 layout_rels = [
                     rel
-                    for rel in root.findall(
-                        f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                    )
-                    if "slideLayout" in rel.get("Type", "")
+                    for rel in graph.relationships_in(rels_file)
+                    if "slideLayout" in rel.type
                 ]
 
                 if len(layout_rels) > 1:
                     errors.append(
-                        f"  {rels_file.relative_to(self.unpacked_dir)}: has {len(layout_rels)} slideLayout references"
+                        f"  {rels_file}: has {len(layout_rels)} slideLayout references"
                     )
 
             except Exception as e:
-                errors.append(
-                    f"  {rels_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                errors.append(f"  {rels_file}: Error: {e}")
 
         if errors:
             print("FAILED - Found slides with duplicate slideLayout references:")
@@ -242,13 +240,12 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
     def validate_notes_slide_references(self):
         """Validate that each notesSlide file is referenced by only one slide."""
-        import lxml.etree
-
         errors = []
         notes_slide_references = {}  # Track which slides reference each notesSlide
 
         # Find all slide relationship files
-        slide_rels_files = list(self.unpacked_dir.glob("ppt/slides/_rels/*.xml.rels"))
+        graph = self._relationship_graph()
+        slide_rels_files = self.file_index.glob("ppt/slides/_rels/*.xml.rels")
 
         if not slide_rels_files:
             if self.verbose:
@@ -257,23 +254,17 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
         for rels_file in slide_rels_files:
             try:
-                # Parse the relationships file
-                root = lxml.etree.parse(str(rels_file)).getroot()
-
                 # Find all notesSlide relationships
-                for rel in root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rel_type = rel.get("Type", "")
-                    if "notesSlide" in rel_type:
-                        target = rel.get("Target", "")
+                for rel in graph.relationships_in(rels_file):
+                    if "notesSlide" in rel.type:
+                        target = rel.target_ref
                         if target:
                             # Normalize the target path to handle relative paths
                             normalized_target = target.replace("../", "")
 
                             # Track which slide references this notesSlide
-                            slide_name = rels_file.stem.replace(
-                                ".xml", ""
+                            slide_name = posixpath.basename(rels_file).replace(
+                                ".xml.rels", ""
                             )  # e.g., "slide1"
 
                             if normalized_target not in notes_slide_references:
@@ -282,10 +273,8 @@ class PPTXSchemaValidator(BaseSchemaValidator):
                                 (slide_name, rels_file)
                             )
 
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {rels_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+            except Exception as e:
+                errors.append(f"  {rels_file}: Error: {e}")
 
         # Check for duplicate references
         for target, references in notes_slide_references.items():
@@ -295,7 +284,7 @@ class PPTXSchemaValidator(BaseSchemaValidator):
                     f"  Notes slide '{target}' is referenced by multiple slides: {', '.join(slide_names)}"
                 )
                 for slide_name, rels_file in references:
-                    errors.append(f"    - {rels_file.relative_to(self.unpacked_dir)}")
+                    errors.append(f"    - {rels_file}")
 
         if errors:
             print(
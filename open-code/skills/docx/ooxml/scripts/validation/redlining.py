@@ -2,119 +2,144 @@
 Validator for tracked changes in Word documents.
 """
 
-import subprocess
-import tempfile
-import zipfile
 from pathlib import Path
 
+import lxml.etree
+
+from .archive import package_root
+from .base import BaseSchemaValidator
+from .baseline import code_digest, file_digest
+from .manifest import ValidationManifest
+from .package import ParsedPackage, original_package
+from .rules import TrackedTextRule
+from .textdiff import word_diff
+
 
 class RedliningValidator:
     """Validator for tracked changes in Word documents."""
 
-    def __init__(self, unpacked_dir, original_docx, verbose=False):
-        self.unpacked_dir = Path(unpacked_dir)
+    def __init__(
+        self,
+        unpacked_dir,
+        original_docx,
+        verbose=False,
+        package=None,
+        incremental=False,
+        report=None,
+        author="Claude",
+    ):
+        self.unpacked_dir = package_root(unpacked_dir).resolve()
         self.original_docx = Path(original_docx)
         self.verbose = verbose
+        self.incremental = incremental
+        self.report = report  # Optional ValidationReport
+        self.author = author  # Author whose tracked changes are checked
+        if package is None:
+            package = ParsedPackage(self.unpacked_dir)
+        self.package = package
         self.namespaces = {
             "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
         }
 
     def validate(self):
         """Main validation method that returns True if valid, False otherwise."""
+        if self.report is None:
+            return self._validate()
+        return self.report.run(
+            type(self).__name__, "validate_tracked_changes", self.package, self._validate
+        )
+
+    def _validate(self):
+        if not self.incremental:
+            return self._validate_tracked_changes()
+
+        # Skip the comparison if document.xml is unchanged since it last passed
+        manifest = ValidationManifest(
+            self.unpacked_dir,
+            type(self).__name__,
+            file_digest(self.original_docx),
+            code_digest=code_digest(type(self)),
+        )
+        digest = manifest.inputs_digest(r"^word/document\.xml$")
+        # Results are recorded per author, since each author's changes differ
+        check_name = f"validate:{self.author}"
+        if manifest.inputs_unchanged(check_name, digest):
+            if self.verbose:
+                print("SKIPPED - document.xml unchanged since last pass")
+            if self.report is not None:
+                self.report.mark_skipped()
+            return True
+
+        passed = self._validate_tracked_changes()
+        manifest.record_inputs(check_name, digest, passed)
+        manifest.save()
+        return passed
+
+    def _validate_tracked_changes(self):
+        """Compare the document text with the original after undoing the author's changes."""
         # Verify unpacked directory exists and has correct structure
         modified_file = self.unpacked_dir / "word" / "document.xml"
         if not modified_file.exists():
             print(f"FAILED - Modified document.xml not found at {modified_file}")
             return False
 
-        # First, check if there are any tracked changes by Claude to validate
         try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(modified_file)
-            root = tree.getroot()
-
-            # Check for w:del or w:ins tags authored by Claude
-            del_elements = root.findall(".//w:del", self.namespaces)
-            ins_elements = root.findall(".//w:ins", self.namespaces)
-
-            # Filter to only include changes by Claude
-            claude_del_elements = [
-                elem
-                for elem in del_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-            claude_ins_elements = [
-                elem
-                for elem in ins_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-
-            # Redlining validation is only needed if tracked changes by Claude have been used.
-            if not claude_del_elements and not claude_ins_elements:
-                if self.verbose:
-                    print("PASSED - No tracked changes by Claude found.")
-                return True
-
-        except Exception:
-            # If we can't parse the XML, continue with full validation
-            pass
-
-        # Create temporary directory for unpacking original docx
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Unpack original docx
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
-                return False
+            modified = self._tracked_text(self.package, modified_file)
+        except lxml.etree.XMLSyntaxError as e:
+            print(f"FAILED - Error parsing XML files: {e}")
+            return False
 
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
-                print(
-                    f"FAILED - Original document.xml not found in {self.original_docx}"
-                )
-                return False
+        # Redlining validation is only needed if the author made tracked changes
+        if not modified.changes:
+            if self.verbose:
+                print(f"PASSED - No tracked changes by {self.author} found.")
+            return True
 
-            # Parse both XML files using xml.etree.ElementTree for redlining validation
-            try:
-                import xml.etree.ElementTree as ET
+        # Read the original's document.xml from the shared original package
+        try:
+            original_parts = original_package(self.original_docx)
+        except Exception as e:
+            print(f"FAILED - Error unpacking original docx: {e}")
+            return False
+        original_file = original_parts.unpacked_dir / "word" / "document.xml"
+        if not original_file.exists():
+            print(f"FAILED - Original document.xml not found in {self.original_docx}")
+            return False
+        try:
+            original = self._tracked_text(original_parts, original_file)
+        except lxml.etree.XMLSyntaxError as e:
+            print(f"FAILED - Error parsing XML files: {e}")
+            return False
 
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
-                original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
-                return False
+        # Compare the text content
+        modified_text = "\n".join(modified.paragraphs)
+        original_text = "\n".join(original.paragraphs)
 
-            # Remove Claude's tracked changes from both documents
-            self._remove_claude_tracked_changes(original_root)
-            self._remove_claude_tracked_changes(modified_root)
+        if modified_text != original_text:
+            # Show detailed character-level differences for each paragraph
+            error_message = self._generate_detailed_diff(original_text, modified_text)
+            print(error_message)
+            return False
 
-            # Extract and compare text content
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
+        if self.verbose:
+            print(f"PASSED - All changes by {self.author} are properly tracked")
+        return True
 
-            if modified_text != original_text:
-                # Show detailed character-level differences for each paragraph
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
-                )
-                print(error_message)
-                return False
+    def _tracked_text(self, package, path):
+        """Run a TrackedTextRule over a document part of a package and return it.
 
-            if self.verbose:
-                print("PASSED - All changes by Claude are properly tracked")
-            return True
+        Raises:
+            lxml.etree.XMLSyntaxError: If the part is not well-formed
+        """
+        rule = TrackedTextRule("word/document.xml", self.author, self.namespaces["w"])
+        package.apply_rules([rule], path, BaseSchemaValidator.STREAMING_THRESHOLD)
+        return rule
 
     def _generate_detailed_diff(self, original_text, modified_text):
-        """Generate detailed word-level differences using git word diff."""
+        """Generate detailed character/word-level differences per changed paragraph."""
         error_parts = [
-            "FAILED - Document text doesn't match after removing Claude's tracked changes",
+            f"FAILED - Document text doesn't match after removing {self.author}'s "
+            "tracked changes",
             "",
             "Likely causes:",
             "  1. Modified text inside another author's <w:ins> or <w:del> tags",
@@ -127,153 +152,15 @@ class RedliningValidator:
             "",
         ]
 
-        # Show git word diff
-        git_diff = self._get_git_word_diff(original_text, modified_text)
-        if git_diff:
-            error_parts.extend(["Differences:", "============", git_diff])
+        # Show the word diff of the changed paragraphs
+        diff = word_diff(original_text, modified_text)
+        if diff:
+            error_parts.extend(["Differences:", "============", diff])
         else:
-            error_parts.append("Unable to generate word diff (git not available)")
+            error_parts.append("Unable to generate word diff")
 
         return "\n".join(error_parts)
 
-    def _get_git_word_diff(self, original_text, modified_text):
-        """Generate word diff using git with character-level precision."""
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                # Create two files
-                original_file = temp_path / "original.txt"
-                modified_file = temp_path / "modified.txt"
-
-                original_file.write_text(original_text, encoding="utf-8")
-                modified_file.write_text(modified_text, encoding="utf-8")
-
-                # Try character-level diff first for precise differences
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "--word-diff-regex=.",  # Character-by-character diff
-                        "-U0",  # Zero lines of context - show only changed lines
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    # Clean up the output - remove git diff header lines
-                    lines = result.stdout.split("\n")
-                    # Skip the header lines (diff --git, index, +++, ---, @@)
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-
-                    if content_lines:
-                        return "\n".join(content_lines)
-
-                # Fallback to word-level diff if character-level is too verbose
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "-U0",  # Zero lines of context
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    lines = result.stdout.split("\n")
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-                    return "\n".join(content_lines)
-
-        except (subprocess.CalledProcessError, FileNotFoundError, Exception):
-            # Git not available or other error, return None to use fallback
-            pass
-
-        return None
-
-    def _remove_claude_tracked_changes(self, root):
-        """Remove tracked changes authored by Claude from the XML root."""
-        ins_tag = f"{{{self.namespaces['w']}}}ins"
-        del_tag = f"{{{self.namespaces['w']}}}del"
-        author_attr = f"{{{self.namespaces['w']}}}author"
-
-        # Remove w:ins elements
-        for parent in root.iter():
-            to_remove = []
-            for child in parent:
-                if child.tag == ins_tag and child.get(author_attr) == "Claude":
-                    to_remove.append(child)
-            for elem in to_remove:
-                parent.remove(elem)
-
-        # Unwrap content in w:del elements where author is "Claude"
-        deltext_tag = f"{{{self.namespaces['w']}}}delText"
-        t_tag = f"{{{self.namespaces['w']}}}t"
-
-        for parent in root.iter():
-            to_process = []
-            for child in parent:
-                if child.tag == del_tag and child.get(author_attr) == "Claude":
-                    to_process.append((child, list(parent).index(child)))
-
-            # Process in reverse order to maintain indices
-            for del_elem, del_index in reversed(to_process):
-                # Convert w:delText to w:t before moving
-                for elem in del_elem.iter():
-                    if elem.tag == deltext_tag:
-                        elem.tag = t_tag
-
-                # Move all children of w:del to its parent before removing w:del
-                for child in reversed(list(del_elem)):
-                    parent.insert(del_index, child)
-                parent.remove(del_elem)
-
-    def _extract_text_content(self, root):
-        """Extract text content from Word XML, preserving paragraph structure.
-
-        Empty paragraphs are skipped to avoid false positives when tracked
-        insertions add only structural elements without text content.
-        """
-        p_tag = f"{{{self.namespaces['w']}}}p"
-        t_tag = f"{{{self.namespaces['w']}}}t"
-
-        paragraphs = []
-        for p_elem in root.findall(f".//{p_tag}"):
-            # Get all text elements within this paragraph
-            text_parts = []
-            for t_elem in p_elem.findall(f".//{t_tag}"):
-                if t_elem.text:
-                    text_parts.append(t_elem.text)
-            paragraph_text = "".join(text_parts)
-            # Skip empty paragraphs - they don't affect content validation
-            if paragraph_text:
-                paragraphs.append(paragraph_text)
-
-        return "\n".join(paragraphs)
-
 
 if __name__ == "__main__":
     raise RuntimeError("This module should not be run directly.")
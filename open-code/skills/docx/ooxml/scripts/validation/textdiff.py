@@ -0,0 +1,104 @@
+"""
+In-process word diff of paragraph text, in the style of git diff --word-diff=plain.
+"""
+
+import re
+from difflib import SequenceMatcher
+
+# Paragraphs longer than this are diffed word by word instead of character by character
+CHAR_DIFF_LIMIT = 2000
+
+# Characters of diff output kept before the rest is summarized
+MAX_DIFF_CHARS = 10000
+
+WORD_PATTERN = re.compile(r"\s+|\w+|[^\w\s]")
+
+
+def word_diff(original_text, modified_text, budget=MAX_DIFF_CHARS):
+    """Return the changed paragraphs of two texts, marked up like git's word diff.
+
+    Paragraphs (lines) are aligned by their hashes, so unchanged paragraphs cost
+    one comparison each; only paragraphs that changed are diffed, character by
+    character or, when long, word by word. Removed text is shown as [-text-]
+    and added text as {+text+}, one output line per changed paragraph.
+
+    Args:
+        original_text: Text of the original document, one paragraph per line
+        modified_text: Text of the modified document, one paragraph per line
+        budget: Maximum number of output characters, or None for no limit
+
+    Returns:
+        str: The diff, empty if the texts have the same paragraphs
+    """
+    original = original_text.split("\n")
+    modified = modified_text.split("\n")
+
+    # Skip the common prefix and suffix before aligning the rest
+    shorter = min(len(original), len(modified))
+    start = 0
+    while start < shorter and original[start] == modified[start]:
+        start += 1
+    tail = 0
+    while tail < shorter - start and original[-tail - 1] == modified[-tail - 1]:
+        tail += 1
+    original = original[start : len(original) - tail]
+    modified = modified[start : len(modified) - tail]
+
+    lines = []
+    matcher = SequenceMatcher(
+        None, [hash(p) for p in original], [hash(p) for p in modified], autojunk=False
+    )
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == "equal":
+            continue
+        # Pair replaced paragraphs in order; the rest were removed or added whole
+        pairs = min(i2 - i1, j2 - j1)
+        for offset in range(pairs):
+            lines.append(_paragraph_diff(original[i1 + offset], modified[j1 + offset]))
+        lines.extend(f"[-{p}-]" for p in original[i1 + pairs : i2])
+        lines.extend(f"{{+{p}+}}" for p in modified[j1 + pairs : j2])
+
+    return _cap(lines, budget)
+
+
+def _paragraph_diff(original, modified):
+    """Mark up the changes between two versions of one paragraph."""
+    if len(original) + len(modified) > CHAR_DIFF_LIMIT:
+        original = WORD_PATTERN.findall(original)
+        modified = WORD_PATTERN.findall(modified)
+    matcher = SequenceMatcher(None, original, modified, autojunk=False)
+
+    parts = []
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == "equal":
+            parts.append("".join(original[i1:i2]))
+            continue
+        if i2 > i1:
+            parts.append(f"[-{''.join(original[i1:i2])}-]")
+        if j2 > j1:
+            parts.append(f"{{+{''.join(modified[j1:j2])}+}}")
+    return "".join(parts)
+
+
+def _cap(lines, budget):
+    """Join diff lines, dropping whole lines once the budget is spent."""
+    if budget is None:
+        return "\n".join(lines)
+    kept = []
+    used = 0
+    for line in lines:
+        used += len(line) + 1
+        if used > budget:
+            if not kept:
+                # Show at least the start of the first change
+                kept.append(f"{line[:budget]}...")
+            break
+        kept.append(line)
+    omitted = len(lines) - len(kept)
+    if omitted:
+        kept.append(f"... {omitted} more changed paragraph(s) not shown")
+    return "\n".join(kept)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
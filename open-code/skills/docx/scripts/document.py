@@ -36,6 +36,7 @@ from pathlib import Path
 from defusedxml import minidom
 from ooxml.scripts.pack import pack_document
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
+from ooxml.scripts.validation.package import ParsedPackage
 from ooxml.scripts.validation.redlining import RedliningValidator
 
 from .utilities import XMLEditor
@@ -842,12 +843,23 @@ class Document:
         Raises:
             ValueError: If validation fails.
         """
-        # Create validators with current state
+        # Create validators with current state, sharing parsed parts between them
+        package = ParsedPackage(self.unpacked_path)
+        # Incremental mode only re-validates parts changed since the last save
         schema_validator = DOCXSchemaValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            self.unpacked_path,
+            self.original_docx,
+            verbose=False,
+            package=package,
+            incremental=True,
         )
         redlining_validator = RedliningValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            self.unpacked_path,
+            self.original_docx,
+            verbose=False,
+            package=package,
+            incremental=True,
+            author=self.author,
         )
 
         # Run validations
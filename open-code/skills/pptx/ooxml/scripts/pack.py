@@ -3,29 +3,141 @@
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
 Example usage:
-    python pack.py <input_directory> <office_file> [--force]
+    python pack.py <input_directory> <office_file> [--force] [--jobs N] [--incremental]
+    python pack.py <input_directory> <office_file> --compression-level 9
 """
 
 import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
 import shutil
 import subprocess
+import struct
 import sys
 import tempfile
+import time
+import xml.dom.minidom
+import xml.parsers.expat
 import defusedxml.minidom
 import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from defusedxml import EntitiesForbidden, ExternalReferenceForbidden
 from pathlib import Path
 
+# Parts condensed before they are written to the archive (matched on the
+# name, since Path(".rels").suffix is empty)
+XML_SUFFIXES = (".xml", ".rels")
+
+# Parts stored without compression, since their formats are already compressed
+# (EMF and WMF metafiles are not, and are deflated; .emz/.wmz are gzipped ones)
+STORED_SUFFIXES = (
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".jpe",
+    ".gif",
+    ".webp",
+    ".wdp",
+    ".emz",
+    ".wmz",
+    ".mp3",
+    ".m4a",
+    ".wma",
+    ".mp4",
+    ".m4v",
+    ".mov",
+    ".wmv",
+    ".mpg",
+    ".mpeg",
+)
+
+# Deflate level of the other parts (zlib's default)
+DEFAULT_COMPRESSION_LEVEL = 6
+
+# Parts written first, in this order, so consumers find the package's content
+# types and relationships without reading the central directory
+FIRST_PARTS = ("[Content_Types].xml", "_rels/.rels")
+
+# Timestamp of every entry (the earliest a zip file can hold), so packing the
+# same content always gives the same archive
+FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Size of the chunks binary parts are copied into the archive in
+CHUNK_SIZE = 1024 * 1024
+
+# Bytes of XML parts condensed per worker task, so small parts share a round trip
+BATCH_BYTES = 256 * 1024
+
+# Tasks per worker submitted ahead of the part being written
+PREFETCH_BATCHES = 4
+
+# Characters of an XML part fed to the streaming condenser at a time
+READ_SIZE = 64 * 1024
+
+# Pieces of condensed output collected before they are encoded and written
+FLUSH_PIECES = 4096
+
+# Zip records written by _ArchiveWriter (see the .ZIP File Format
+# Specification), with the versions and ZIP64 threshold zipfile uses
+LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+CENTRAL_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+END_RECORD = struct.Struct("<4s4H2LH")
+ZIP64_END_RECORD = struct.Struct("<4sQ2H2L4Q")
+ZIP64_LOCATOR = struct.Struct("<4sLQL")
+DEFAULT_VERSION = 20
+ZIP64_VERSION = 45
+ZIP64_LIMIT = (1 << 31) - 1
+
+# Bump when the pack manifest layout or the way parts are written changes
+PACK_MANIFEST_FORMAT = 3
+
+# Files modified this recently are hashed again on the next incremental pack,
+# because a rewrite within the filesystem's timestamp granularity may keep
+# size and mtime
+RACY_WINDOW_NS = 2 * 10**9
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for condensing XML parts (0 = one per CPU, default: 1)",
+    )
+    parser.add_argument(
+        "--compression-level",
+        type=int,
+        choices=range(1, 10),
+        default=DEFAULT_COMPRESSION_LEVEL,
+        metavar="{1-9}",
+        help="Deflate level for XML and other compressible parts; media is "
+        f"stored uncompressed (default: {DEFAULT_COMPRESSION_LEVEL})",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Copy the compressed entries of parts unchanged since the last "
+        "incremental pack from the existing output (manifest stored next to it)",
+    )
     args = parser.parse_args()
 
     try:
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            jobs=args.jobs,
+            incremental=args.incremental,
+            compression_level=args.compression_level,
         )
 
         # Show warning if validation was skipped
@@ -42,51 +154,617 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(
+    input_dir,
+    output_file,
+    validate=False,
+    jobs=1,
+    incremental=False,
+    compression_level=DEFAULT_COMPRESSION_LEVEL,
+):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        jobs: Worker processes for condensing XML parts (0 = one per CPU)
+        incremental: If True, parts unchanged since the last incremental pack
+            to output_file are copied from it without recompressing them
+        compression_level: Deflate level (1-9) for parts other than media
 
     Returns:
         bool: True if successful, False if validation failed
     """
     input_dir = Path(input_dir)
     output_file = Path(output_file)
+    jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
 
     if not input_dir.is_dir():
         raise ValueError(f"{input_dir} is not a directory")
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+    # Write to a temporary file next to the output, so a part that fails to
+    # condense leaves any existing output untouched
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = output_file.with_name(f".{output_file.name}.{os.getpid()}.tmp")
+    manifest = PackManifest(output_file, compression_level) if incremental else None
+    try:
+        write_archive(
+            input_dir,
+            temp_file,
+            jobs=jobs,
+            manifest=manifest,
+            compression_level=compression_level,
+        )
+        os.replace(temp_file, output_file)
+    except BaseException:
+        temp_file.unlink(missing_ok=True)
+        raise
+    if manifest is not None:
+        manifest.save()
+
+    # Validate if requested
+    if validate:
+        if not validate_document(output_file):
+            output_file.unlink()  # Delete the corrupt file
+            return False
 
     return True
 
 
+def write_archive(
+    input_dir,
+    output_file,
+    jobs=1,
+    manifest=None,
+    compression_level=DEFAULT_COMPRESSION_LEVEL,
+):
+    """Write the files of a directory to a zip archive, condensing XML parts.
+
+    Each part is read straight from the input directory: XML parts are
+    condensed while streaming and other parts are copied in CHUNK_SIZE
+    chunks, so nothing is staged on disk besides the archive itself.
+
+    The archive depends only on the content of the parts: FIRST_PARTS come
+    first, then the other parts sorted by name, all with FIXED_DATE_TIME and
+    the same attributes. Media (STORED_SUFFIXES) is stored as it is, and the
+    other parts are deflated at compression_level.
+
+    With more than one job, XML parts are condensed ahead in a process pool.
+    This thread stays the only writer and adds the parts in archive order
+    (FIRST_PARTS, then the rest sorted by name), so the archive does not
+    depend on which worker finishes first.
+
+    With a PackManifest, parts unchanged since the previous pack are copied
+    from the previous archive as they are, compressed bytes included.
+    """
+    parts = sorted(
+        (f.relative_to(input_dir).as_posix(), f)
+        for f in input_dir.rglob("*")
+        if f.is_file()
+    )
+    parts.sort(key=_archive_order)
+    names = [name for name, _ in parts]
+    files = [f for _, f in parts]
+    with contextlib.ExitStack() as stack:
+        previous = manifest.open_previous() if manifest is not None else None
+        if previous is not None:
+            stack.enter_context(previous)
+
+        # Parts to copy from the previous archive: file -> its entry there
+        reused = {}
+        if manifest is not None:
+            for f, name in zip(files, names):
+                entry = manifest.reusable_entry(name, f, previous)
+                if entry is not None:
+                    reused[f] = entry
+
+        changed = [f for f in files if f not in reused]
+        written = stack.enter_context(
+            contextlib.closing(_iter_condensed(changed, jobs))
+        )
+        writer = _ArchiveWriter(
+            stack.enter_context(open(output_file, "wb")),
+            compresslevel=compression_level,
+        )
+        if reused:
+            # The entries' data is copied straight from the previous file
+            source = stack.enter_context(open(previous.filename, "rb"))
+        for f, name in zip(files, names):
+            size_hint = f.stat().st_size
+            if f in reused:
+                writer.copy(source, reused[f], size_hint)
+                manifest.record(name, reused[f].CRC)
+                continue
+
+            _, condensed = next(written)
+            with writer.open(name, _compress_type(name), size_hint) as dst:
+                if condensed is not None:
+                    dst.write(condensed)
+                elif f.name.endswith(XML_SUFFIXES):
+                    write_condensed_xml(f, dst)
+                else:
+                    with open(f, "rb") as src:
+                        shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            if manifest is not None:
+                manifest.record(name, dst.crc)
+        writer.close()
+
+
+def _archive_order(part):
+    """Sort key putting FIRST_PARTS first, in their order, before the other parts."""
+    name, _ = part
+    if name in FIRST_PARTS:
+        return FIRST_PARTS.index(name)
+    return len(FIRST_PARTS)
+
+
+def _compress_type(name):
+    """Return how a part is compressed: stored for media, deflated otherwise."""
+    if name.lower().endswith(STORED_SUFFIXES):
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+class _ArchiveWriter:
+    """Writer of the zip archives of write_archive().
+
+    zipfile has no way to add an entry that is already compressed, so the
+    archive is written here: every entry gets FIXED_DATE_TIME and the same
+    attributes, and entries of a previous archive can be copied without
+    recompressing them. The records are laid out as zipfile writes them, so a
+    copied entry comes out as a full pack would write it.
+    """
+
+    def __init__(self, fp, compresslevel=DEFAULT_COMPRESSION_LEVEL):
+        """
+        Args:
+            fp: Binary file the archive is written to, open for writing
+            compresslevel: Deflate level of deflated entries
+        """
+        self.fp = fp
+        self.compresslevel = compresslevel
+        # Central directory records: (name, compress type, crc, compressed
+        # size, size, local header offset, extract version)
+        self._entries = []
+
+    @contextlib.contextmanager
+    def open(self, name, compress_type, size_hint):
+        """Add an entry, yielding an _EntryWriter its content is written to.
+
+        Args:
+            name: Name of the entry
+            compress_type: zipfile.ZIP_STORED or zipfile.ZIP_DEFLATED
+            size_hint: Expected size of the content, which decides whether
+                the entry gets ZIP64 sizes (as ZipFile.open does)
+        """
+        offset = self.fp.tell()
+        zip64 = size_hint * 1.05 > ZIP64_LIMIT
+        self._write_local_header(name, compress_type, 0, 0, 0, zip64)
+        dst = _EntryWriter(self.fp, compress_type, self.compresslevel)
+        yield dst
+        dst.flush()
+        if not zip64 and max(dst.file_size, dst.compress_size) > ZIP64_LIMIT:
+            raise zipfile.LargeZipFile(f"{name} grew beyond its ZIP64 size hint")
+
+        # Fill in the CRC and sizes, now that they are known
+        end = self.fp.tell()
+        self.fp.seek(offset)
+        version = self._write_local_header(
+            name, compress_type, dst.crc, dst.compress_size, dst.file_size, zip64
+        )
+        self.fp.seek(end)
+        self._entries.append(
+            (
+                name,
+                compress_type,
+                dst.crc,
+                dst.compress_size,
+                dst.file_size,
+                offset,
+                version,
+            )
+        )
+
+    def copy(self, source, info, size_hint):
+        """Add an entry of another archive without recompressing its data.
+
+        Args:
+            source: Binary file of the other archive, open for reading
+            info: ZipInfo of the entry in that archive
+            size_hint: Size hint open() would get for the entry's part
+        """
+        source.seek(info.header_offset)
+        header = source.read(LOCAL_HEADER.size)
+        if len(header) != LOCAL_HEADER.size or header[:4] != b"PK\x03\x04":
+            raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+        name_length, extra_length = struct.unpack("<HH", header[26:30])
+        data_offset = info.header_offset + len(header) + name_length + extra_length
+
+        offset = self.fp.tell()
+        version = self._write_local_header(
+            info.filename,
+            info.compress_type,
+            info.CRC,
+            info.compress_size,
+            info.file_size,
+            size_hint * 1.05 > ZIP64_LIMIT,
+        )
+        _copy_range(source, self.fp, data_offset, info.compress_size)
+        self._entries.append(
+            (
+                info.filename,
+                info.compress_type,
+                info.CRC,
+                info.compress_size,
+                info.file_size,
+                offset,
+                version,
+            )
+        )
+
+    def close(self):
+        """Write the central directory, completing the archive."""
+        start = self.fp.tell()
+        for entry in self._entries:
+            name, compress_type, crc, compress_size, size, offset, version = entry
+            encoded, flags = _encode_name(name)
+            # ZIP64 values, in the order of the extra field
+            large = []
+            if size > ZIP64_LIMIT or compress_size > ZIP64_LIMIT:
+                large += [size, compress_size]
+                size = compress_size = 0xFFFFFFFF
+            if offset > ZIP64_LIMIT:
+                large.append(offset)
+                offset = 0xFFFFFFFF
+            extra = b""
+            if large:
+                extra = struct.pack(f"<HH{len(large)}Q", 1, 8 * len(large), *large)
+                version = max(version, ZIP64_VERSION)
+            date, time_ = _dos_date_time()
+            self.fp.write(
+                CENTRAL_HEADER.pack(
+                    b"PK\x01\x02",
+                    version,
+                    3,  # created on Unix, so external_attr holds the mode
+                    version,
+                    0,
+                    flags,
+                    compress_type,
+                    time_,
+                    date,
+                    crc,
+                    compress_size,
+                    size,
+                    len(encoded),
+                    len(extra),
+                    0,
+                    0,
+                    0,
+                    0o644 << 16,
+                    offset,
+                )
+            )
+            self.fp.write(encoded)
+            self.fp.write(extra)
+
+        end = self.fp.tell()
+        count, size, offset = len(self._entries), end - start, start
+        if count > 0xFFFF or size > ZIP64_LIMIT or offset > ZIP64_LIMIT:
+            self.fp.write(
+                ZIP64_END_RECORD.pack(
+                    b"PK\x06\x06", 44, 45, 45, 0, 0, count, count, size, offset
+                )
+            )
+            self.fp.write(ZIP64_LOCATOR.pack(b"PK\x06\x07", 0, end, 1))
+            count = min(count, 0xFFFF)
+            size = min(size, 0xFFFFFFFF)
+            offset = min(offset, 0xFFFFFFFF)
+        self.fp.write(
+            END_RECORD.pack(b"PK\x05\x06", 0, 0, count, count, size, offset, 0)
+        )
+        self.fp.flush()
+
+    def _write_local_header(self, name, compress_type, crc, compress_size, size, zip64):
+        """Write the local header of an entry, returning its extract version."""
+        encoded, flags = _encode_name(name)
+        extra = b""
+        version = DEFAULT_VERSION
+        if zip64:
+            extra = struct.pack("<HHQQ", 1, 16, size, compress_size)
+        if size > ZIP64_LIMIT or compress_size > ZIP64_LIMIT:
+            size = compress_size = 0xFFFFFFFF
+            version = ZIP64_VERSION
+        date, time_ = _dos_date_time()
+        self.fp.write(
+            LOCAL_HEADER.pack(
+                b"PK\x03\x04",
+                version,
+                0,
+                flags,
+                compress_type,
+                time_,
+                date,
+                crc,
+                compress_size,
+                size,
+                len(encoded),
+                len(extra),
+            )
+        )
+        self.fp.write(encoded)
+        self.fp.write(extra)
+        return version
+
+
+class _EntryWriter:
+    """Binary stream compressing the content of an entry into the archive."""
+
+    def __init__(self, fp, compress_type, compresslevel):
+        self._fp = fp
+        self._compressor = None
+        if compress_type == zipfile.ZIP_DEFLATED:
+            self._compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -15)
+        self.crc = 0
+        self.file_size = 0
+        self.compress_size = 0
+
+    def write(self, data):
+        self.crc = zlib.crc32(data, self.crc)
+        self.file_size += len(data)
+        written = self._compressor.compress(data) if self._compressor else data
+        self.compress_size += len(written)
+        self._fp.write(written)
+        return len(data)
+
+    def flush(self):
+        """Write out the rest of the compressed content."""
+        if self._compressor is not None:
+            tail = self._compressor.flush()
+            self.compress_size += len(tail)
+            self._fp.write(tail)
+            self._compressor = None
+
+
+def _encode_name(name):
+    """Return the encoded name of an entry and its flag bits, as zipfile does."""
+    try:
+        return name.encode("ascii"), 0
+    except UnicodeEncodeError:
+        return name.encode("utf-8"), 0x800  # the name is UTF-8
+
+
+def _dos_date_time():
+    """Return FIXED_DATE_TIME as the MS-DOS date and time of zip records."""
+    year, month, day, hour, minute, second = FIXED_DATE_TIME
+    return (
+        (year - 1980) << 9 | month << 5 | day,
+        hour << 11 | minute << 5 | second // 2,
+    )
+
+
+def _copy_range(source, target, offset, length):
+    """Append length bytes of source, starting at offset, to target.
+
+    The kernel copies the bytes where it can (os.copy_file_range), so they
+    never pass through this process.
+    """
+    target.flush()
+    position = target.tell()
+    copied = 0
+    if hasattr(os, "copy_file_range"):
+        try:
+            while copied < length:
+                count = os.copy_file_range(
+                    source.fileno(),
+                    target.fileno(),
+                    length - copied,
+                    offset + copied,
+                    position + copied,
+                )
+                if not count:
+                    break
+                copied += count
+        except OSError:
+            pass  # e.g. not supported for these files: copy the rest by hand
+
+    source.seek(offset + copied)
+    target.seek(position + copied)
+    while copied < length:
+        chunk = source.read(min(CHUNK_SIZE, length - copied))
+        if not chunk:
+            raise zipfile.BadZipFile("Truncated entry data")
+        target.write(chunk)
+        copied += len(chunk)
+
+
+class PackManifest:
+    """Part hashes of the last incremental pack of an output file.
+
+    The manifest lives next to the output, in ``.<name>.pack.json``, and holds
+    for every part the size, mtime and SHA-256 of its source file and the CRC
+    of the entry written for it. A part whose content hash is unchanged is
+    copied from the previous archive, provided that archive still has an
+    entry for it with the recorded CRC. Files whose size and mtime are
+    unchanged are not read again.
+
+    The manifest also records the size, mtime and SHA-256 of the archive it
+    describes, and no entries are reused once the output was replaced by
+    anything else (a pack without the manifest, for instance).
+    """
+
+    def __init__(self, output_file, compression_level=DEFAULT_COMPRESSION_LEVEL):
+        self.output_file = Path(output_file)
+        # Entries are only reused while they were compressed the same way
+        self.compression_level = compression_level
+        self.path = self.output_file.with_name(f".{self.output_file.name}.pack.json")
+        # [size, mtime_ns, sha256] of the archive the manifest describes
+        self._archive = None
+        # relative path -> [size, mtime_ns or None, sha256, crc]
+        self._known = self._read()
+        self._parts = {}
+        self._scanned = {}  # relative path -> [size, mtime_ns or None, sha256]
+
+    def open_previous(self):
+        """Return the previous archive opened for reading, or None."""
+        if not self._known or self._archive is None:
+            return None
+        try:
+            stat = self.output_file.stat()
+            if self._archive[:2] != [stat.st_size, stat.st_mtime_ns]:
+                return None
+            if self._archive[2] != _file_digest(self.output_file):
+                return None
+            return zipfile.ZipFile(self.output_file)
+        except (OSError, zipfile.BadZipFile):
+            return None
+
+    def reusable_entry(self, rel_path, path, previous):
+        """Return the entry of previous to copy for a part, or None.
+
+        Also hashes the part, if its size or mtime changed, for record().
+
+        Args:
+            rel_path: Name of the part (its POSIX path relative to the package root)
+            path: Path of the part's file
+            previous: Previous archive from open_previous()
+        """
+        stat = path.stat()
+        known = self._known.get(rel_path)
+        if known and known[:2] == [stat.st_size, stat.st_mtime_ns]:
+            digest = known[2]
+        else:
+            digest = _file_digest(path)
+        racy = time.time_ns() - stat.st_mtime_ns <= RACY_WINDOW_NS
+        mtime = None if racy else stat.st_mtime_ns
+        self._scanned[rel_path] = [stat.st_size, mtime, digest]
+
+        if previous is None or not known or known[2] != digest:
+            return None
+        try:
+            info = previous.getinfo(rel_path)
+        except KeyError:
+            return None
+        # Entries with a data descriptor (flag bit 3) are not copied as they are
+        if info.CRC != known[3] or info.flag_bits & 0x08:
+            return None
+        return info
+
+    def record(self, rel_path, crc):
+        """Record the entry written for a part checked by reusable_entry()."""
+        self._parts[rel_path] = self._scanned[rel_path] + [crc]
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("format") != PACK_MANIFEST_FORMAT:
+            return {}
+        if data.get("compression_level") != self.compression_level:
+            return {}
+        self._archive = data.get("archive")
+        return data.get("parts", {})
+
+    def save(self):
+        """Write the parts recorded by this pack, replacing the previous manifest.
+
+        Call once the archive is in place at output_file.
+        """
+        # Best effort: an unwritable location only costs speed
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            stat = self.output_file.stat()
+            data = {
+                "format": PACK_MANIFEST_FORMAT,
+                "compression_level": self.compression_level,
+                "archive": [
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                    _file_digest(self.output_file),
+                ],
+                "parts": self._parts,
+            }
+            # json.dumps uses the C encoder, which json.dump does not
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(data))
+            temp_path.replace(self.path)
+        except OSError:
+            pass
+
+
+def _file_digest(path):
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _iter_condensed(files, jobs):
+    """Yield (file, condensed XML or None) for files, in order.
+
+    With more than one job, XML parts are condensed in a process pool, in
+    batches of about BATCH_BYTES and at most PREFETCH_BATCHES per worker ahead
+    of the part being yielded. None is yielded for other parts, and for all
+    parts with a single job, which the writer then reads itself. Closing the
+    generator early cancels the work not yet started.
+    """
+    xml_files = [f for f in files if f.name.endswith(XML_SUFFIXES)]
+    jobs = min(jobs, len(xml_files))
+    if jobs <= 1:
+        for f in files:
+            yield f, None
+        return
+
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        batches = _batches(xml_files)
+        pending = {}  # XML part -> (future of its batch, index in the batch)
+        in_flight = 0
+        for f in files:
+            while in_flight < jobs * PREFETCH_BATCHES:
+                batch = next(batches, None)
+                if batch is None:
+                    break
+                future = executor.submit(_condense_batch, batch)
+                for index, xml_file in enumerate(batch):
+                    pending[xml_file] = (future, index)
+                in_flight += 1
+            if f not in pending:
+                yield f, None
+                continue
+            future, index = pending.pop(f)
+            results = future.result()
+            if index == len(results) - 1:
+                in_flight -= 1
+            yield f, results[index]
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _batches(xml_files):
+    """Yield consecutive runs of XML parts of about BATCH_BYTES each."""
+    batch, size = [], 0
+    for xml_file in xml_files:
+        batch.append(xml_file)
+        size += xml_file.stat().st_size
+        if size >= BATCH_BYTES:
+            yield batch
+            batch, size = [], 0
+    if batch:
+        yield batch
+
+
+def _condense_batch(xml_files):
+    """Condense a batch of XML parts in a worker process."""
+    return [condensed_xml(xml_file) for xml_file in xml_files]
+
+
 def validate_document(doc_path):
     """Validate document by converting to HTML with soffice."""
     # Determine the correct filter based on file extension
@@ -131,7 +809,39 @@ def validate_document(doc_path):
 
 
 def condense_xml(xml_file):
-    """Strip unnecessary whitespace and remove comments."""
+    """Strip unnecessary whitespace and remove comments, in place."""
+    condensed = condensed_xml(xml_file)
+    with open(xml_file, "wb") as f:
+        f.write(condensed)
+
+
+def condensed_xml(xml_file):
+    """Return an XML file with unnecessary whitespace and comments removed."""
+    output = io.BytesIO()
+    write_condensed_xml(xml_file, output)
+    return output.getvalue()
+
+
+def write_condensed_xml(xml_file, output):
+    """Write an XML file to a binary stream with whitespace and comments removed.
+
+    The file is streamed through expat and written out as it is parsed, so
+    memory use does not grow with its size. The output is byte-identical to
+    condensed_xml_dom(), which documents with a DOCTYPE still go through.
+    """
+    try:
+        _Condenser(output).condense(xml_file)
+    except _DoctypeFound:
+        # Nothing has been written yet: output is flushed after the root starts
+        output.write(condensed_xml_dom(xml_file))
+
+
+def condensed_xml_dom(xml_file):
+    """Condense an XML file by building and editing a minidom tree.
+
+    Reference implementation of write_condensed_xml(), also used by it for
+    documents with a DOCTYPE. The tree takes many times the size of the part.
+    """
     with open(xml_file, "r", encoding="utf-8") as f:
         dom = defusedxml.minidom.parse(f)
 
@@ -150,9 +860,203 @@ def condense_xml(xml_file):
             ) or child.nodeType == child.COMMENT_NODE:
                 element.removeChild(child)
 
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+    return dom.toxml(encoding="UTF-8")
+
+
+class _DoctypeFound(Exception):
+    """Raised by the streaming condenser for documents with a DOCTYPE."""
+
+
+def _minidom_escapes():
+    """Return the (char, escaped) replacements minidom makes in text and attributes.
+
+    They are read off minidom itself, since its escaping differs between Python
+    versions. "&" comes first, so the replacements can be applied in order.
+    """
+    document = xml.dom.minidom.Document()
+    element = document.createElement("e")
+    text, attribute = [], []
+    for char in "&<>\"'\r\n\t":
+        escaped = document.createTextNode(char).toxml()
+        if escaped != char:
+            text.append((char, escaped))
+        element.setAttribute("a", char)
+        escaped = element.toxml()[len('<e a="') : -len('"/>')]
+        if escaped != char:
+            attribute.append((char, escaped))
+    return text, attribute
+
+
+_TEXT_ESCAPES, _ATTRIBUTE_ESCAPES = _minidom_escapes()
+
+
+def _escape(data, escapes):
+    for char, escaped in escapes:
+        if char in data:
+            data = data.replace(char, escaped)
+    return data
+
+
+class _Condenser:
+    """expat handlers that write a condensed copy of the document being parsed.
+
+    Mirrors condensed_xml_dom() event by event: whitespace-only text and
+    comments are dropped unless their parent's name ends with ":t", adjacent
+    text is judged as one node (as minidom merges it), and the result is
+    serialized the way minidom's toxml() would.
+    """
+
+    def __init__(self, output):
+        self.output = output
+        self.pieces = ['<?xml version="1.0" encoding="UTF-8"?>']
+        self.stack = []  # (qname, keeps_whitespace) of the open elements
+        self.start_pending = False  # Whether the last start tag lacks its ">"
+        self.text = []  # Character data since the last markup
+        self.cdata = None  # Character data of the open CDATA section
+        self.namespaces = []  # (prefix, uri) declared by the next element
+        self.qnames = {}  # expat name -> qualified name
+
+    def condense(self, xml_file):
+        # Configured like minidom's namespace-aware expat builder
+        parser = xml.parsers.expat.ParserCreate(namespace_separator=" ")
+        parser.namespace_prefixes = True
+        parser.buffer_text = True
+        parser.ordered_attributes = True
+        parser.specified_attributes = True
+        parser.StartNamespaceDeclHandler = self.start_namespace
+        parser.StartElementHandler = self.start_element
+        parser.EndElementHandler = self.end_element
+        parser.CharacterDataHandler = self.characters
+        parser.CommentHandler = self.comment
+        parser.ProcessingInstructionHandler = self.processing_instruction
+        parser.StartCdataSectionHandler = self.start_cdata
+        parser.EndCdataSectionHandler = self.end_cdata
+        parser.StartDoctypeDeclHandler = self.start_doctype
+        # Same protections as defusedxml.minidom.parse
+        parser.EntityDeclHandler = _forbid_entity_decl
+        parser.UnparsedEntityDeclHandler = _forbid_unparsed_entity_decl
+        parser.ExternalEntityRefHandler = _forbid_external_entity_ref
+
+        with open(xml_file, "r", encoding="utf-8") as f:
+            while chunk := f.read(READ_SIZE):
+                parser.Parse(chunk, False)
+        parser.Parse("", True)
+        self.flush()
+
+    def flush(self):
+        """Encode and write the output collected so far."""
+        data = "".join(self.pieces)
+        self.output.write(data.encode("utf-8", "xmlcharrefreplace"))
+        self.pieces = []
+
+    def start_doctype(self, *args):
+        raise _DoctypeFound()
+
+    def start_namespace(self, prefix, uri):
+        self.namespaces.append((prefix, uri))
+
+    def start_element(self, name, attributes):
+        self._flush_text()
+        self._close_start_tag()
+        pieces = self.pieces
+        qname = self._qname(name)
+        pieces.append(f"<{qname}")
+        # minidom lists namespace declarations before the other attributes
+        for prefix, uri in self.namespaces:
+            value = _escape(uri or "", _ATTRIBUTE_ESCAPES)
+            pieces.append(
+                f' xmlns:{prefix}="{value}"' if prefix else f' xmlns="{value}"'
+            )
+        self.namespaces = []
+        for i in range(0, len(attributes), 2):
+            value = _escape(attributes[i + 1], _ATTRIBUTE_ESCAPES)
+            pieces.append(f' {self._qname(attributes[i])}="{value}"')
+        self.stack.append((qname, qname.endswith(":t")))
+        self.start_pending = True
+
+    def end_element(self, name):
+        self._flush_text()
+        qname, _ = self.stack.pop()
+        if self.start_pending:
+            self.pieces.append("/>")
+            self.start_pending = False
+        else:
+            self.pieces.append(f"</{qname}>")
+        if len(self.pieces) >= FLUSH_PIECES:
+            self.flush()
+
+    def characters(self, data):
+        if self.cdata is not None:
+            self.cdata.append(data)
+        else:
+            self.text.append(data)
+
+    def comment(self, data):
+        self._flush_text()
+        # Comments outside the root element are kept
+        if not self.stack or self.stack[-1][1]:
+            self._close_start_tag()
+            self.pieces.append(f"<!--{data}-->")
+
+    def processing_instruction(self, target, data):
+        self._flush_text()
+        self._close_start_tag()
+        self.pieces.append(f"<?{target} {data}?>")
+
+    def start_cdata(self):
+        self.cdata = []
+
+    def end_cdata(self):
+        data = "".join(self.cdata)
+        self.cdata = None
+        # An empty section adds no node, so the text around it stays one node
+        if data:
+            self._flush_text()
+            self._close_start_tag()
+            self.pieces.append(f"<![CDATA[{data}]]>")
+
+    def _flush_text(self):
+        """Write the pending text node unless it is whitespace to drop."""
+        if not self.text:
+            return
+        text = "".join(self.text)
+        self.text = []
+        if self.stack[-1][1] or text.strip():
+            self._close_start_tag()
+            self.pieces.append(_escape(text, _TEXT_ESCAPES))
+
+    def _close_start_tag(self):
+        if self.start_pending:
+            self.pieces.append(">")
+            self.start_pending = False
+
+    def _qname(self, name):
+        """Return the qualified name for an expat "uri localname prefix" name."""
+        qname = self.qnames.get(name)
+        if qname is None:
+            parts = name.split(" ")
+            if len(parts) == 3:
+                qname = f"{parts[2]}:{parts[1]}"
+            elif len(parts) <= 2:
+                qname = parts[-1]
+            else:
+                raise ValueError(
+                    f"Unsupported syntax: spaces in URIs not supported: {name!r}"
+                )
+            self.qnames[name] = qname
+        return qname
+
+
+def _forbid_entity_decl(name, is_parameter_entity, value, base, sysid, pubid, notation):
+    raise EntitiesForbidden(name, value, base, sysid, pubid, notation)
+
+
+def _forbid_unparsed_entity_decl(name, base, sysid, pubid, notation):
+    raise EntitiesForbidden(name, None, base, sysid, pubid, notation)
+
+
+def _forbid_external_entity_ref(context, base, sysid, pubid):
+    raise ExternalReferenceForbidden(context, base, sysid, pubid)
 
 
 if __name__ == "__main__":
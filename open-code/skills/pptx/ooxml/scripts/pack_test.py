@@ -0,0 +1,117 @@
+import unittest
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from pack import pack_document
+
+
+PARTS = {
+    "[Content_Types].xml": '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">\n'
+    '  <Default Extension="png" ContentType="image/png"/>\n'
+    "</Types>\n",
+    "_rels/.rels": '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships"/>\n',
+    "word/document.xml": '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">\n'
+    "  <!-- comment -->\n"
+    "  <w:body><w:p><w:r><w:t> Hello </w:t></w:r></w:p></w:body>\n"
+    "</w:document>\n",
+    "word/styles.xml": '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<w:styles xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>\n',
+}
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestPackDocument(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+        self.input_dir = self.root / "doc"
+        for name, content in PARTS.items():
+            path = self.input_dir / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+        (self.input_dir / "word/media").mkdir()
+        (self.input_dir / "word/media/image1.png").write_bytes(os.urandom(100000))
+
+    def pack(self, name, **kwargs):
+        """Helper to pack the test document and return the archive's bytes"""
+        output_file = self.root / name
+        self.assertTrue(pack_document(self.input_dir, output_file, **kwargs))
+        return output_file.read_bytes()
+
+    def test_archive_layout(self):
+        """Test entry order, compression and attributes of a packed document"""
+        self.pack("out.docx")
+        with zipfile.ZipFile(self.root / "out.docx") as zf:
+            self.assertIsNone(zf.testzip())
+            infos = zf.infolist()
+            self.assertEqual(
+                [info.filename for info in infos],
+                [
+                    "[Content_Types].xml",
+                    "_rels/.rels",
+                    "word/document.xml",
+                    "word/media/image1.png",
+                    "word/styles.xml",
+                ],
+            )
+            for info in infos:
+                self.assertEqual(info.date_time, (1980, 1, 1, 0, 0, 0))
+                self.assertEqual(info.external_attr, 0o644 << 16)
+                expected = (
+                    zipfile.ZIP_STORED
+                    if info.filename.endswith(".png")
+                    else zipfile.ZIP_DEFLATED
+                )
+                self.assertEqual(info.compress_type, expected)
+            self.assertEqual(
+                zf.read("word/document.xml").decode("utf-8"),
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                "<w:body><w:p><w:r><w:t> Hello </w:t></w:r></w:p></w:body>"
+                "</w:document>",
+            )
+
+    def test_reproducible(self):
+        """Test that packing the same content twice gives the same bytes"""
+        self.assertEqual(self.pack("a.docx"), self.pack("b.docx"))
+
+    def test_compression_level(self):
+        """Test that the compression level changes only deflated entries"""
+        self.pack("fast.docx", compression_level=1)
+        self.pack("best.docx", compression_level=9)
+        with zipfile.ZipFile(self.root / "fast.docx") as fast, zipfile.ZipFile(
+            self.root / "best.docx"
+        ) as best:
+            for info in fast.infolist():
+                self.assertEqual(fast.read(info), best.read(info.filename))
+
+    def test_incremental_matches_full_pack(self):
+        """Test that an incremental pack is byte-identical to a full pack"""
+        self.pack("incremental.docx", incremental=True)
+        document = self.input_dir / "word/document.xml"
+        document.write_text(
+            PARTS["word/document.xml"].replace("Hello", "Changed"), encoding="utf-8"
+        )
+        incremental = self.pack("incremental.docx", incremental=True)
+        self.assertEqual(incremental, self.pack("full.docx"))
+        # Again, with every part copied from the previous archive
+        self.assertEqual(self.pack("incremental.docx", incremental=True), incremental)
+
+    def test_incremental_after_other_pack(self):
+        """Test that entries are not reused from an archive packed without the manifest"""
+        fast = self.pack("out.docx", incremental=True, compression_level=1)
+        best = self.pack("out.docx", compression_level=9)
+        self.assertNotEqual(fast, best)
+        self.assertEqual(
+            self.pack("out.docx", incremental=True, compression_level=1), fast
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
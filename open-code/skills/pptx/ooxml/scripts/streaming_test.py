@@ -0,0 +1,79 @@
+import unittest
+import tempfile
+from pathlib import Path, PurePosixPath
+from validation import DOCXSchemaValidator
+
+
+def document(body):
+    """Helper to build a word/document.xml part with the given body content"""
+    return f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"
+    xmlns:w14="http://schemas.microsoft.com/office/word/2010/wordml"
+    mc:Ignorable="w14">
+  <w:body>{{{{ body_tag }}}}
+    <w:p w14:paraId="1A2B3C4D">
+      <w:r><w:t xml:space="preserve">Hello {{{{ name }}}}</w:t></w:r>
+      <w14:foreign/>
+    </w:p>
+    {body}
+    <w:sectPr/>
+  </w:body>
+</w:document>
+"""
+
+
+VALID = document("<w:p><w:pPr><w:jc w:val='center'/></w:pPr></w:p>")
+
+INVALID = document(
+    "<w:p><w:pPr><w:jc w:val='sideways'/></w:pPr></w:p>"
+    "<w:p><w:r><w:t>{{ tag }}</w:t><w:unknown/></w:r></w:p>"
+    "<w:bogus/>"
+)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestStreamValidate(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+        (self.root / "word").mkdir()
+        self.part = self.root / "word/document.xml"
+
+    def validate_both_ways(self, xml):
+        """Helper to validate a part as a tree and streamed, from disk and from bytes"""
+        self.part.write_text(xml, encoding="utf-8")
+        relative_path = PurePosixPath("word/document.xml")
+        tree = DOCXSchemaValidator(self.root, self.root / "original.docx")
+        streamed = DOCXSchemaValidator(self.root, self.root / "original.docx")
+        streamed.STREAMING_THRESHOLD = 0
+        self.assertFalse(tree._streams_xsd(self.part, relative_path))
+        self.assertTrue(streamed._streams_xsd(self.part, relative_path))
+
+        expected = tree._validate_part_xsd(self.part, relative_path)
+        self.assertEqual(
+            streamed._validate_part_xsd(self.part, relative_path), expected
+        )
+        data = xml.encode("utf-8")
+        self.assertEqual(tree._validate_part_xsd(data, relative_path), expected)
+        self.assertEqual(streamed._validate_part_xsd(data, relative_path), expected)
+        return expected
+
+    def test_valid_part(self):
+        """Test that both paths accept a valid part"""
+        self.assertEqual(self.validate_both_ways(VALID), (True, set()))
+
+    def test_invalid_part(self):
+        """Test that both paths report the same schema errors"""
+        is_valid, errors = self.validate_both_ways(INVALID)
+        self.assertFalse(is_valid)
+        self.assertEqual(len(errors), 3, errors)
+        self.assertTrue(any("bogus" in error for error in errors), errors)
+        self.assertTrue(any("sideways" in error for error in errors), errors)
+        self.assertTrue(any("unknown" in error for error in errors), errors)
+
+
+if __name__ == "__main__":
+    unittest.main()
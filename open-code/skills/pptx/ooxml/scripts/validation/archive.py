@@ -0,0 +1,256 @@
+"""
+Read-only view of a packed Office document, so it can be validated without unpacking.
+"""
+
+import os
+import posixpath
+import threading
+import zipfile
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+from fnmatch import fnmatchcase
+from pathlib import Path, PurePath, PurePosixPath
+
+# Archives kept open per process, so paths sent to pool workers reuse one handle
+MAX_OPEN_ARCHIVES = 8
+
+# (pid, path, size, mtime_ns) -> PackageArchive; the pid keeps forked workers
+# from sharing (and seeking) the parent's file handle
+_archives = OrderedDict()
+_lock = threading.Lock()
+
+ArchiveStat = namedtuple("ArchiveStat", ["st_size", "st_mtime_ns"])
+
+
+class PackageArchive:
+    """Central directory of a .docx/.pptx/.xlsx file, read once when opened."""
+
+    def __init__(self, path):
+        self.path = Path(path).resolve()
+        stat = self.path.stat()
+        self.signature = (str(self.path), stat.st_size, stat.st_mtime_ns)
+        self._zip = zipfile.ZipFile(self.path, "r")
+
+        # Member names in central directory order, and every directory they imply
+        self.files = {}
+        self.dirs = {""}
+        for info in self._zip.infolist():
+            name = info.filename.lstrip("/")
+            if not info.is_dir():
+                self.files[name] = info
+            parent = name.rstrip("/")
+            while parent:
+                parent = posixpath.dirname(parent)
+                self.dirs.add(parent)
+            if info.is_dir():
+                self.dirs.add(name.rstrip("/"))
+
+    def stat(self, name):
+        """Return the size of a member; every member shares the archive's mtime."""
+        return ArchiveStat(self.files[name].file_size, self.signature[2])
+
+    def open(self, name):
+        """Open a member for streaming reads."""
+        return self._zip.open(self.files[name], "r")
+
+    def read(self, name):
+        return self._zip.read(self.files[name])
+
+
+def open_archive(path):
+    """Return the PackageArchive for a file, reusing one opened earlier if unchanged."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    signature = (os.getpid(), str(path), stat.st_size, stat.st_mtime_ns)
+    with _lock:
+        archive = _archives.get(signature)
+        if archive is not None:
+            _archives.move_to_end(signature)
+            return archive
+
+    archive = PackageArchive(path)
+    with _lock:
+        _archives[signature] = archive
+        while len(_archives) > MAX_OPEN_ARCHIVES:
+            _archives.popitem(last=False)
+    return archive
+
+
+class ArchivePath:
+    """A path inside a packed Office document.
+
+    Implements the subset of pathlib.Path the validators use (joining,
+    name/suffix/parent, relative_to, resolve, exists, is_file, glob/rglob, stat,
+    read_bytes) and answers it from the archive's central directory. Parts are
+    only decompressed when read. glob() and rglob() yield files only.
+
+    The root of a package is named after the archive, and its parent is the
+    directory holding the archive on disk, so files kept "next to the package"
+    (such as the incremental validation manifest) land next to the archive.
+    """
+
+    def __init__(self, archive, at=""):
+        self.archive = archive
+        self.at = at  # Member path relative to the package root, "" for the root
+
+    def __reduce__(self):
+        # Reopen by file name when sent to a pool worker
+        return _reopen, (str(self.archive.path), self.at)
+
+    def __repr__(self):
+        return f"ArchivePath({str(self.archive.path)!r}, {self.at!r})"
+
+    def __str__(self):
+        if not self.at:
+            return str(self.archive.path)
+        return f"{self.archive.path}/{self.at}"
+
+    def __eq__(self, other):
+        if not isinstance(other, ArchivePath):
+            return NotImplemented
+        return (self.archive.path, self.at) == (other.archive.path, other.at)
+
+    def __hash__(self):
+        return hash((self.archive.path, self.at))
+
+    def __lt__(self, other):
+        if not isinstance(other, ArchivePath):
+            return NotImplemented
+        return (str(self.archive.path), self.at) < (str(other.archive.path), other.at)
+
+    def __truediv__(self, other):
+        return self.joinpath(other)
+
+    def joinpath(self, *others):
+        at = self.at
+        for other in others:
+            if isinstance(other, PurePath):
+                other = other.as_posix()
+            other = str(other).replace("\\", "/")
+            # Absolute part names start at the package root
+            at = (
+                other.lstrip("/")
+                if other.startswith("/")
+                else posixpath.join(at, other)
+            )
+        return ArchivePath(self.archive, at.strip("/"))
+
+    @property
+    def name(self):
+        if not self.at:
+            return self.archive.path.name
+        return posixpath.basename(self.at)
+
+    @property
+    def suffix(self):
+        return PurePosixPath(self.name).suffix
+
+    @property
+    def stem(self):
+        return PurePosixPath(self.name).stem
+
+    @property
+    def parts(self):
+        return self.archive.path.parts + PurePosixPath(self.at).parts
+
+    @property
+    def parent(self):
+        if not self.at:
+            return self.archive.path.parent
+        return ArchivePath(self.archive, posixpath.dirname(self.at))
+
+    def is_absolute(self):
+        return True
+
+    def resolve(self):
+        """Return the path with "." and ".." segments collapsed."""
+        at = posixpath.normpath(self.at) if self.at else ""
+        return ArchivePath(self.archive, "" if at == "." else at)
+
+    def relative_to(self, other):
+        """Return this path relative to other as a PurePosixPath."""
+        if (
+            not isinstance(other, ArchivePath)
+            or other.archive.path != self.archive.path
+        ):
+            raise ValueError(f"{self} is not in the subpath of {other}")
+        if not other.at:
+            return PurePosixPath(self.at)
+        if not self.at.startswith(other.at + "/"):
+            raise ValueError(f"{self} is not in the subpath of {other}")
+        return PurePosixPath(self.at[len(other.at) + 1 :])
+
+    def exists(self):
+        return self.at in self.archive.files or self.at in self.archive.dirs
+
+    def is_file(self):
+        return self.at in self.archive.files
+
+    def is_dir(self):
+        return self.at in self.archive.dirs
+
+    def stat(self):
+        if not self.is_file():
+            raise FileNotFoundError(f"No such part: {self}")
+        return self.archive.stat(self.at)
+
+    def open(self, mode="rb"):
+        if mode not in ("r", "rb"):
+            raise ValueError(f"Archive parts can only be opened for reading: {mode}")
+        return self.archive.open(self.at)
+
+    def read_bytes(self):
+        return self.archive.read(self.at)
+
+    def glob(self, pattern):
+        """Yield files below this path whose relative path matches pattern."""
+        segments = pattern.split("/")
+        for name in self._members():
+            relative = name[len(self.at) + 1 :] if self.at else name
+            parts = relative.split("/")
+            if len(parts) == len(segments) and all(
+                fnmatchcase(part, segment) for part, segment in zip(parts, segments)
+            ):
+                yield ArchivePath(self.archive, name)
+
+    def rglob(self, pattern):
+        """Yield files anywhere below this path whose name matches pattern."""
+        for name in self._members():
+            if fnmatchcase(posixpath.basename(name), pattern):
+                yield ArchivePath(self.archive, name)
+
+    def _members(self):
+        prefix = f"{self.at}/" if self.at else ""
+        return [name for name in self.archive.files if name.startswith(prefix)]
+
+
+def _reopen(path, at):
+    return ArchivePath(open_archive(path), at)
+
+
+def package_root(path):
+    """Return the root of a package given as a directory or as a packed file.
+
+    Directories are returned as pathlib.Path; .docx/.pptx/.xlsx files (any zip
+    archive) as an ArchivePath that reads parts straight from the archive.
+    """
+    if isinstance(path, ArchivePath):
+        return path
+    path = Path(path)
+    if path.is_file():
+        return ArchivePath(open_archive(path))
+    return path
+
+
+@contextmanager
+def open_part(path):
+    """Yield something lxml can parse a part from: a file name, or an open archive member."""
+    if isinstance(path, ArchivePath):
+        with path.open() as f:
+            yield f
+    else:
+        yield str(path)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,231 @@
+"""
+Baseline XSD errors of the original document, read straight from its archive.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import stat
+import threading
+from pathlib import Path, PurePosixPath
+
+from .package import original_package
+
+# Bump when the format of the cached error sets changes
+CACHE_FORMAT = 2
+
+_memo = {}  # cache key -> {part name: tuple of error messages}
+_digests = {}  # (path, size, mtime_ns) -> content hash
+_code_digests = {}  # validator class -> hash of the code of its checks
+_lock = threading.Lock()
+
+
+def default_cache_dir():
+    """Return the per-user directory used for on-disk validation caches."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "ooxml-validation"
+
+
+def private_dir(path, create=False):
+    """Return True if a directory exists and only the current user can write to it.
+
+    Args:
+        path: Directory to check
+        create: Create the directory (mode 0700) if it does not exist
+    """
+    path = Path(path)
+    try:
+        if create:
+            path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        info = path.lstat()
+    except OSError:
+        return False
+    return stat.S_ISDIR(info.st_mode) and _owned_privately(info)
+
+
+def _owned_privately(info):
+    """Return True if stat info is of the current user's file, writable by no one else.
+
+    Always True on systems without user IDs.
+    """
+    if not hasattr(os, "getuid"):
+        return True
+    return info.st_uid == os.getuid() and not info.st_mode & 0o022
+
+
+def file_digest(path):
+    """Return the SHA-256 hex digest of a file, memoized on its stat signature."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    signature = (str(path), stat.st_size, stat.st_mtime_ns)
+    with _lock:
+        if signature in _digests:
+            return _digests[signature]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+
+    with _lock:
+        _digests[signature] = digest.hexdigest()
+    return digest.hexdigest()
+
+
+class OriginalBaseline:
+    """XSD errors of every part in the original .docx/.pptx/.xlsx file.
+
+    Parts are read directly from the archive, never extracted. The first lookup
+    validates every schema-mapped part of the original in one pass; the result
+    is memoized for the process and cached on disk keyed by the content hash of
+    the original file, so repeated validations against the same baseline skip
+    the work entirely.
+
+    Cached error sets are only reused for the same original, schema sources
+    (see SchemaRegistry.digest) and validation code, and only from a cache
+    directory and files that belong to the current user.
+    """
+
+    def __init__(self, validator, cache_dir=None):
+        self.validator = validator
+        self.original_file = Path(validator.original_file)
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self._errors = None
+
+    def errors_for(self, relative_path):
+        """Return the set of XSD errors the original had for a part.
+
+        Args:
+            relative_path: Part path relative to the package root
+
+        Returns:
+            set: Error messages, empty if the part did not exist in the original
+        """
+        if self._errors is None:
+            self._errors = self._load()
+        return set(self._errors.get(PurePosixPath(relative_path).as_posix(), ()))
+
+    def prepare(self, map_parts):
+        """Load the error sets now, unless they are already loaded.
+
+        Args:
+            map_parts: Called with the names of the original's parts when they
+                have to be validated; returns their part_errors results in
+                order, e.g. from a process pool
+        """
+        if self._errors is None:
+            self._errors = self._load(map_parts)
+
+    def _load(self, map_parts=None):
+        """Return the error sets from memory, disk cache or a fresh pass."""
+        inputs = hashlib.sha256()
+        for digest in (
+            file_digest(self.original_file),
+            self.validator.schema_registry.digest(),
+            code_digest(type(self.validator)),
+        ):
+            inputs.update(digest.encode("ascii"))
+        key = f"{type(self.validator).__name__}-{CACHE_FORMAT}-{inputs.hexdigest()}"
+        with _lock:
+            if key in _memo:
+                return _memo[key]
+
+        errors = self._read_cache(key)
+        if errors is None:
+            if map_parts is None:
+                map_parts = lambda names: map(self.part_errors, names)
+            errors = self._compute(map_parts)
+            self._write_cache(key, errors)
+
+        with _lock:
+            _memo[key] = errors
+        return errors
+
+    def _compute(self, map_parts):
+        """Validate every XML part of the original archive through map_parts."""
+        # Parts are read from the shared original package, opened once per process
+        root = original_package(self.original_file).unpacked_dir
+        names = [
+            part.relative_to(root).as_posix()
+            for part in root.rglob("*")
+            if part.name.endswith((".xml", ".rels"))
+        ]
+        return {
+            name: part_errors
+            for name, part_errors in zip(names, map_parts(names))
+            if part_errors
+        }
+
+    def part_errors(self, name):
+        """Return the sorted XSD errors of one part of the original archive."""
+        part = original_package(self.original_file).unpacked_dir / name
+        # Large parts are streamed from the archive instead of read whole
+        if part.stat().st_size >= self.validator.STREAMING_THRESHOLD:
+            with part.open() as f:
+                _, errors = self.validator._validate_part_xsd(f, PurePosixPath(name))
+        else:
+            _, errors = self.validator._validate_part_xsd(
+                part.read_bytes(), PurePosixPath(name)
+            )
+        return tuple(sorted(errors or ()))
+
+    def _cache_file(self, key):
+        return self.cache_dir / f"baseline-{key}.json"
+
+    def _read_cache(self, key):
+        # Error sets planted by another user could hide new errors
+        if not private_dir(self.cache_dir):
+            return None
+        try:
+            with open(self._cache_file(key), "r", encoding="utf-8") as f:
+                if not _owned_privately(os.fstat(f.fileno())):
+                    return None
+                data = json.load(f)
+            return {name: tuple(errors) for name, errors in data["errors"].items()}
+        except (OSError, ValueError, KeyError, AttributeError):
+            return None
+
+    def _write_cache(self, key, errors):
+        # Best effort: an unwritable cache directory only costs speed
+        if not private_dir(self.cache_dir, create=True):
+            return
+        try:
+            cache_file = self._cache_file(key)
+            temp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+            fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with open(fd, "w", encoding="utf-8") as f:
+                json.dump({"errors": errors}, f)
+            temp_file.replace(cache_file)
+        except OSError:
+            pass
+
+
+def code_digest(validator_class):
+    """Return a hash of the source of the modules a validator's checks run.
+
+    That is every module of this package, plus the module of the validator
+    class and of each of its bases, so changing how parts are preprocessed or
+    checked invalidates cached baselines and incremental validation results.
+    """
+    with _lock:
+        if validator_class in _code_digests:
+            return _code_digests[validator_class]
+
+    modules = {inspect.getmodule(cls) for cls in validator_class.__mro__}
+    sources = {
+        module.__file__ for module in modules if getattr(module, "__file__", None)
+    }
+    sources.update(str(path) for path in Path(__file__).parent.glob("*.py"))
+    sources = sorted(sources)
+    digest = hashlib.sha256()
+    for source in sources:
+        digest.update(Path(source).read_bytes())
+
+    with _lock:
+        _code_digests[validator_class] = digest.hexdigest()
+    return digest.hexdigest()
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
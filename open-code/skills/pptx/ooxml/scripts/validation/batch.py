@@ -0,0 +1,275 @@
+"""
+Validation of one document, and of whole batches of documents over a worker pool.
+"""
+
+import contextlib
+import io
+import json
+import os
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from .base import BaseSchemaValidator, warm_schema_cache
+from .budget import ErrorBudget
+from .docx import DOCXSchemaValidator
+from .package import ParsedPackage
+from .pptx import PPTXSchemaValidator
+from .redlining import RedliningValidator
+from .report import ValidationReport
+from .xlsx import XLSXSchemaValidator
+
+# Validators run for each kind of original document
+VALIDATORS = {
+    ".docx": [DOCXSchemaValidator, RedliningValidator],
+    ".pptx": [PPTXSchemaValidator],
+    ".xlsx": [XLSXSchemaValidator],
+}
+
+
+def validate_document(
+    unpacked_dir,
+    original_file,
+    verbose=False,
+    schema_bundle=None,
+    jobs=1,
+    incremental=False,
+    report=None,
+    error_budget=None,
+):
+    """Run every validator for the original's file type on one document.
+
+    Args:
+        unpacked_dir: Unpacked directory or packed file to validate
+        original_file: Original .docx/.pptx the document was derived from
+        report: Optional ValidationReport to record the checks in
+        error_budget: Optional ErrorBudget; once it is exhausted the remaining
+            checks and validators are skipped
+
+    Returns:
+        bool: True if all validators pass
+
+    Raises:
+        ValueError: If the original's file type has no validators
+    """
+    original_file = Path(original_file)
+    validators = VALIDATORS.get(original_file.suffix.lower())
+    if validators is None:
+        raise ValueError(
+            f"Validation not supported for file type {original_file.suffix.lower()}"
+        )
+
+    # Run validators, sharing parsed parts between them
+    package = ParsedPackage(unpacked_dir)
+    success = True
+    for V in validators:
+        if error_budget is not None and error_budget.exhausted():
+            break
+        if issubclass(V, BaseSchemaValidator):
+            validator = V(
+                unpacked_dir,
+                original_file,
+                verbose=verbose,
+                schema_bundle=schema_bundle,
+                package=package,
+                jobs=jobs,
+                incremental=incremental,
+                report=report,
+                error_budget=error_budget,
+            )
+        else:
+            validator = V(
+                unpacked_dir,
+                original_file,
+                verbose=verbose,
+                package=package,
+                incremental=incremental,
+                report=report,
+            )
+        if not validator.validate():
+            success = False
+    return success
+
+
+def read_batch_manifest(manifest_file):
+    """Read (candidate, original) pairs from a JSON Lines manifest.
+
+    Each non-empty line is an object with "candidate" and "original" paths;
+    relative paths are taken relative to the manifest's directory.
+    """
+    manifest_file = Path(manifest_file)
+    pairs = []
+    with open(manifest_file, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                candidate, original = entry["candidate"], entry["original"]
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(
+                    f"{manifest_file}: Line {line_number}: expected an object with "
+                    f'"candidate" and "original": {e}'
+                ) from e
+            pairs.append(
+                (manifest_file.parent / candidate, manifest_file.parent / original)
+            )
+    return pairs
+
+
+class BatchValidator:
+    """Validates many (candidate, original) pairs, optionally over a process pool.
+
+    Compiled schemas are warmed before the pool starts, so forked workers
+    share them; each worker validates whole documents with jobs=1. After
+    max_failures documents fail (0: never), documents not yet started are
+    skipped. error_limits, if given, are the ErrorBudget arguments each
+    document is validated with.
+    """
+
+    def __init__(
+        self,
+        pairs,
+        workers=1,
+        max_failures=0,
+        schema_bundle=None,
+        incremental=False,
+        progress=None,
+        error_limits=None,
+    ):
+        self.pairs = [(Path(c), Path(o)) for c, o in pairs]
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.max_failures = max_failures
+        self.schema_bundle = schema_bundle
+        self.incremental = incremental
+        self.progress = progress  # Optional callable receiving each document result
+        self.error_limits = error_limits
+
+    def run(self):
+        """Validate every pair and return the aggregated report as a dict."""
+        start = time.perf_counter()
+        warm_schema_cache(self.schema_bundle)
+
+        results = [None] * len(self.pairs)
+        options = (self.schema_bundle, self.incremental, self.error_limits)
+        workers = min(self.workers, len(self.pairs))
+        if workers <= 1:
+            for index, (candidate, original) in enumerate(self.pairs):
+                if self._stopped(results):
+                    break
+                self._finish(
+                    results, index, _validate_pair(candidate, original, *options)
+                )
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending = {
+                    executor.submit(
+                        _validate_pair, candidate, original, *options
+                    ): index
+                    for index, (candidate, original) in enumerate(self.pairs)
+                }
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._finish(results, pending.pop(future), future.result())
+                    if self._stopped(results):
+                        for future in pending:
+                            future.cancel()
+                        # Wait only for documents already being validated
+                        for future in [f for f in pending if not f.cancelled()]:
+                            self._finish(results, pending[future], future.result())
+                        break
+
+        for index, (candidate, original) in enumerate(self.pairs):
+            if results[index] is None:
+                results[index] = _document_result(candidate, original, "skipped")
+
+        counts = {"passed": 0, "failed": 0, "error": 0, "skipped": 0}
+        for result in results:
+            counts[result["status"]] += 1
+        return {
+            "passed": counts["failed"] == 0
+            and counts["error"] == 0
+            and counts["skipped"] == 0,
+            "documents": len(results),
+            "counts": counts,
+            "stopped_early": counts["skipped"] > 0,
+            "seconds": round(time.perf_counter() - start, 6),
+            "results": results,
+        }
+
+    def _finish(self, results, index, result):
+        results[index] = result
+        if self.progress:
+            self.progress(result)
+
+    def _stopped(self, results):
+        """Return True once the fail-fast threshold is reached."""
+        if not self.max_failures:
+            return False
+        failures = sum(
+            1
+            for result in results
+            if result and result["status"] in ("failed", "error")
+        )
+        return failures >= self.max_failures
+
+
+def _document_result(candidate, original, status, **details):
+    return {
+        "candidate": str(candidate),
+        "original": str(original),
+        "status": status,
+        **details,
+    }
+
+
+def _validate_pair(candidate, original, schema_bundle, incremental, error_limits):
+    """Validate one document, capturing its output. Returns its result dict."""
+    report = ValidationReport(echo=False)
+    error_budget = ErrorBudget(**error_limits) if error_limits else None
+    output = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output):
+            if not (candidate.is_dir() or candidate.is_file()):
+                raise FileNotFoundError(f"{candidate} is not a directory or a file")
+            if not original.is_file():
+                raise FileNotFoundError(f"{original} is not a file")
+            passed = validate_document(
+                candidate,
+                original,
+                schema_bundle=schema_bundle,
+                incremental=incremental,
+                report=report,
+                error_budget=error_budget,
+            )
+    except Exception as e:
+        return _document_result(
+            candidate,
+            original,
+            "error",
+            seconds=round(time.perf_counter() - start, 6),
+            error=f"{type(e).__name__}: {e}",
+            traceback=traceback.format_exc(),
+        )
+
+    summary = report.to_dict(passed)
+    return _document_result(
+        candidate,
+        original,
+        "passed" if passed else "failed",
+        seconds=round(time.perf_counter() - start, 6),
+        error_count=summary["error_count"],
+        errors=[
+            {"check": check["check"], **error}
+            for check in summary["checks"]
+            for error in check["errors"]
+        ],
+        checks={check["check"]: check["seconds"] for check in summary["checks"]},
+    )
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
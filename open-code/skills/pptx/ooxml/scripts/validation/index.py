@@ -0,0 +1,118 @@
+"""
+In-memory index of the files in a package, built with one directory scan.
+"""
+
+import os
+import posixpath
+from fnmatch import fnmatchcase
+from pathlib import PurePosixPath
+
+from .archive import ArchivePath
+
+
+class PackageIndex:
+    """Names and sizes of every file in a package.
+
+    Names are part names relative to the package root, in POSIX form, listed in
+    the order pathlib's rglob("*") would visit them (or central directory order
+    for packed files). Existence, reference and content-type questions are
+    answered from memory instead of hitting the filesystem per file.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        if isinstance(root, ArchivePath):
+            self.sizes = {
+                name: info.file_size for name, info in root.archive.files.items()
+            }
+        else:
+            self.sizes = dict(_scan(root, ""))
+
+        # Lower-cased extension without the dot -> part names
+        self.extensions = {}
+        for name in self.sizes:
+            extension = PurePosixPath(name).suffix.lstrip(".").lower()
+            self.extensions.setdefault(extension, []).append(name)
+
+    def __contains__(self, name):
+        return name in self.sizes
+
+    def __iter__(self):
+        return iter(self.sizes)
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def path(self, name):
+        """Return the path of a part (a Path, or an ArchivePath for packed files)."""
+        return self.root / name
+
+    def size(self, name):
+        return self.sizes[name]
+
+    def with_suffix(self, *suffixes):
+        """Return the names ending with any of the given suffixes, in index order."""
+        return [name for name in self.sizes if name.endswith(suffixes)]
+
+    def glob(self, pattern):
+        """Return the names matching a relative glob pattern, segment by segment."""
+        segments = pattern.split("/")
+        return [
+            name
+            for name in self.sizes
+            if name.count("/") == len(segments) - 1
+            and all(
+                fnmatchcase(part, segment)
+                for part, segment in zip(name.split("/"), segments)
+            )
+        ]
+
+    @staticmethod
+    def normalize(base_dir, target):
+        """Return the part name a relative target resolves to from base_dir.
+
+        Targets that are absolute or climb above the package root resolve to
+        None, since they cannot name a part of the package.
+        """
+        if target.startswith("/"):
+            return None
+        name = posixpath.normpath(posixpath.join(base_dir, target))
+        if name == ".." or name.startswith("../"):
+            return None
+        return name
+
+    @staticmethod
+    def resolve_target(base_dir, target):
+        """Return the part name a relationship target refers to.
+
+        Unlike normalize(), absolute targets (/xl/styles.xml) are taken relative
+        to the package root, as OPC part names.
+        """
+        if target.startswith("/"):
+            return PackageIndex.normalize("", target.lstrip("/"))
+        return PackageIndex.normalize(base_dir, target)
+
+
+def _scan(directory, prefix):
+    """Yield (name, size) for the files under a directory, in rglob order."""
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return
+
+    subdirs = []
+    for entry in entries:
+        try:
+            if entry.is_file():
+                yield prefix + entry.name, entry.stat().st_size
+            elif entry.is_dir():
+                subdirs.append(entry)
+        except OSError:
+            continue
+
+    for entry in subdirs:
+        yield from _scan(entry.path, f"{prefix}{entry.name}/")
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
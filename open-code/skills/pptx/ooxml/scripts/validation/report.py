@@ -0,0 +1,127 @@
+"""
+Per-check measurements of validation runs, for machine-readable reports.
+"""
+
+import contextlib
+import io
+import sys
+import time
+
+
+class ValidationReport:
+    """Wall time, parse counts and errors of every check a validator runs.
+
+    Validators constructed with a report route each check through run(), which
+    records how long it took, how many parts it parsed and how many bytes those
+    parts had (parsing done by XSD pool workers is not included), and the
+    errors it reported. Errors are taken from the check's own FAILED output,
+    so checks keep reporting through print.
+    """
+
+    def __init__(self, echo=True):
+        self.echo = echo  # Also pass check output through to stdout
+        self.checks = []
+        self._skipped = False
+
+    def run(self, validator_name, check_name, package, check):
+        """Run check() and record its measurements. Returns its result."""
+        parts_before = package.parse_count if package else 0
+        bytes_before = package.bytes_read if package else 0
+        buffer = io.StringIO()
+        output = _Tee(sys.stdout, buffer) if self.echo else buffer
+
+        result = None
+        self._skipped = False
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(output):
+                result = check()
+            return result
+        finally:
+            seconds = time.perf_counter() - start
+            lines = buffer.getvalue().splitlines()
+            errors = _errors_from_output(lines)
+            self.checks.append(
+                {
+                    "validator": validator_name,
+                    "check": check_name,
+                    "passed": result,
+                    "skipped": self._skipped,
+                    "seconds": round(seconds, 6),
+                    "parts_parsed": (package.parse_count if package else 0)
+                    - parts_before,
+                    "bytes_read": (package.bytes_read if package else 0) - bytes_before,
+                    "error_count": len(errors),
+                    "errors": errors,
+                    "output": lines,
+                }
+            )
+
+    def mark_skipped(self):
+        """Note that the running check was skipped (e.g. as unchanged)."""
+        self._skipped = True
+
+    def to_dict(self, passed):
+        """Return the report as a JSON-serializable dict."""
+        return {
+            "passed": passed,
+            "seconds": round(sum(check["seconds"] for check in self.checks), 6),
+            "parts_parsed": sum(check["parts_parsed"] for check in self.checks),
+            "bytes_read": sum(check["bytes_read"] for check in self.checks),
+            "error_count": sum(check["error_count"] for check in self.checks),
+            "checks": self.checks,
+        }
+
+
+class _Tee(io.TextIOBase):
+    """Text stream writing to several streams at once."""
+
+    def __init__(self, *streams):
+        self.streams = streams
+
+    def write(self, text):
+        for stream in self.streams:
+            stream.write(text)
+        return len(text)
+
+    def flush(self):
+        for stream in self.streams:
+            stream.flush()
+
+
+def _errors_from_output(lines):
+    """Extract the errors a check printed after its FAILED line.
+
+    Lines indented by two spaces directly under a FAILED line are errors; more
+    deeply indented lines are details of the error above them. A failure that
+    lists no errors is reported as its FAILED line.
+    """
+    errors = []
+    failure = None  # FAILED line whose errors are being collected
+    found = 0  # Errors listed under it so far
+    for line in lines:
+        if line.startswith("FAILED"):
+            if failure is not None and not found:
+                errors.append(failure)
+            failure = {"message": line.removeprefix("FAILED - "), "details": []}
+            found = 0
+            continue
+        if failure is None or not line.strip():
+            continue
+        if line.startswith("    ") and found:
+            errors[-1]["details"].append(line.strip())
+        elif line.startswith("  "):
+            errors.append({"message": line.strip(), "details": []})
+            found += 1
+        else:
+            if not found:
+                errors.append(failure)
+            failure = None
+
+    if failure is not None and not found:
+        errors.append(failure)
+    return errors
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,817 @@
+"""
+Validator for Excel workbook XML files against XSD schemas.
+"""
+
+import re
+from array import array
+from bisect import bisect_left
+
+import lxml.etree
+
+from .base import BaseSchemaValidator
+from .opc import RelationshipGraph
+from .rules import Rule
+
+
+class XLSXSchemaValidator(BaseSchemaValidator):
+    """Validator for Excel workbook XML files against XSD schemas.
+
+    Worksheets, shared strings, styles and the calculation chain are checked
+    through the single rule pass over each part. Worksheets and the calcChain
+    are always streamed, never kept as trees, and only counts and errors are
+    kept of them, plus a compact sorted array of the calcChain's cells per
+    sheet (about 17 bytes per entry) that formula cells are matched against
+    while their sheet streams by.
+    """
+
+    # Excel spreadsheet namespace
+    SPREADSHEETML_NAMESPACE = (
+        "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+    )
+
+    # Excel checks that read several parts (see BaseSchemaValidator)
+    CROSS_PART_CHECKS = {
+        **BaseSchemaValidator.CROSS_PART_CHECKS,
+        "validate_sheet_relationships": (
+            r"^(_rels/\.rels|xl/workbook\.xml|xl/_rels/workbook\.xml\.rels)$",
+            True,
+        ),
+        "validate_cell_indices": (r"^(_rels/\.rels|xl/)", False),
+        "validate_defined_names": (r"^(_rels/\.rels|xl/workbook\.xml)$", False),
+        "validate_calc_chain": (r"^(_rels/\.rels|xl/)", False),
+    }
+
+    # Excel-specific element to relationship type mappings
+    ELEMENT_RELATIONSHIP_TYPES = {
+        "sheet": "sheet",
+        "drawing": "drawing",
+        "legacydrawing": "vmldrawing",
+        "legacydrawinghf": "vmldrawing",
+        "hyperlink": "hyperlink",
+        "tablepart": "table",
+        "pivotcache": "pivotcachedefinition",
+        "externalreference": "externallink",
+    }
+
+    # Folders below xl/ whose parts are SpreadsheetML, validated against sml.xsd
+    SPREADSHEETML_FOLDERS = {
+        "worksheets",
+        "chartsheets",
+        "dialogsheets",
+        "tables",
+        "pivotTables",
+        "pivotCache",
+        "externalLinks",
+        "queryTables",
+    }
+
+    # Relationship types (last URL segment) a <sheet> may point to
+    SHEET_RELATIONSHIP_TYPES = {
+        "worksheet",
+        "chartsheet",
+        "dialogsheet",
+        "xlMacrosheet",
+    }
+
+    # Relationship types of sheets that hold cells
+    CELL_SHEET_RELATIONSHIP_TYPES = {"worksheet", "xlMacrosheet"}
+
+    # Characters Excel does not allow in sheet names, and its length limit
+    INVALID_SHEET_NAME_CHARACTERS = set("[]:*?/\\")
+    MAX_SHEET_NAME_LENGTH = 31
+
+    # Valid defined names, and names Excel rejects because they read as cell
+    # references: R1C1-style names, and A1-style ones within the sheet's bounds
+    DEFINED_NAME_PATTERN = re.compile(r"^(?:[^\W\d]|\\)[\w.\\?]*$")
+    CELL_LIKE_NAME_PATTERN = re.compile(
+        r"^(?:([A-Za-z]{1,3})(\d+)|[RrCc]|[Rr]\d*[Cc]\d*)$"
+    )
+
+    # Size of a sheet: columns A to XFD, rows 1 to 1048576
+    MAX_COLUMN = 16384
+    MAX_ROW = 1048576
+
+    # Sheet prefixes of references in formulas: 'Quoted Name'! or Name!
+    SHEET_REFERENCE_PATTERN = re.compile(r"(?:'((?:[^']|'')+)'|([^\W\d][\w.]*))!")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Sheets, defined names and relationships of the workbook (see _workbook)
+        self._workbook_info = None
+
+    def validate(self):
+        """Run all validation checks and return True if all pass."""
+        # Test 0: XML well-formedness
+        if not self.run_check(self.validate_xml):
+            return False
+
+        # Test 1: Namespace declarations
+        all_valid = True
+        if not self.run_check(self.validate_namespaces):
+            all_valid = False
+
+        # Test 2: Unique IDs
+        if not self.run_check(self.validate_unique_ids):
+            all_valid = False
+
+        # Test 3: Relationship and file reference validation
+        if not self.run_check(self.validate_file_references):
+            all_valid = False
+
+        # Test 4: Content type declarations
+        if not self.run_check(self.validate_content_types):
+            all_valid = False
+
+        # Test 5: XSD schema validation
+        if not self.run_check(self.validate_against_xsd):
+            all_valid = False
+
+        # Test 6: Sheet relationship validation
+        if not self.run_check(self.validate_sheet_relationships):
+            all_valid = False
+
+        # Test 7: Shared string and cell format index validation
+        if not self.run_check(self.validate_cell_indices):
+            all_valid = False
+
+        # Test 8: Defined name validation
+        if not self.run_check(self.validate_defined_names):
+            all_valid = False
+
+        # Test 9: Calculation chain validation
+        if not self.run_check(self.validate_calc_chain):
+            all_valid = False
+
+        # Test 10: Relationship ID reference validation
+        if not self.run_check(self.validate_all_relationship_ids):
+            all_valid = False
+
+        return all_valid
+
+    def _get_schema_path(self, xml_file):
+        """Also map the SpreadsheetML parts in subfolders of xl/ to sml.xsd."""
+        schema_path = super()._get_schema_path(xml_file)
+        if (
+            schema_path is None
+            and xml_file.parent.name in self.SPREADSHEETML_FOLDERS
+            and xml_file.parent.parent.name == "xl"
+        ):
+            return self.schemas_dir / self.SCHEMA_MAPPINGS["xl"]
+        return schema_path
+
+    def _streams_part(self, name, size):
+        """Also stream the worksheets and the calcChain, whatever their size."""
+        if super()._streams_part(name, size):
+            return True
+        try:
+            workbook = self._workbook()
+        except Exception:
+            return False  # Reported by the workbook checks
+        return workbook is not None and (
+            name in workbook["cell_sheets"] or name == workbook["calc_chain"]
+        )
+
+    def _stream_rules(self, xml_file):
+        """Add the shared string, style, cell and calcChain rules to the pass."""
+        rules = super()._stream_rules(xml_file)
+        try:
+            workbook = self._workbook()
+        except Exception:
+            return rules  # Reported by the workbook checks
+        if workbook is None:
+            return rules
+
+        part = xml_file.relative_to(self.unpacked_dir)
+        name = part.as_posix()
+        if name == workbook["shared_strings"]:
+            rules["shared_strings"] = SharedStringCountRule(part)
+        elif name == workbook["styles"]:
+            rules["cell_formats"] = CellFormatCountRule(part)
+        elif name == workbook["calc_chain"]:
+            rules["calc_chain"] = CalcChainRule(
+                part, set(workbook["cell_sheets"].values())
+            )
+        elif name in workbook["cell_sheets"]:
+            rules["cells"] = CellRule(
+                part,
+                shared_strings=self._part_count(
+                    workbook["shared_strings"], "shared_strings"
+                ),
+                cell_formats=self._part_count(workbook["styles"], "cell_formats"),
+                calc_chain=self._calc_chain_cells(workbook["cell_sheets"][name]),
+            )
+        return rules
+
+    def _calc_chain_cells(self, sheet_id):
+        """Return the CalcChainCells of a sheet, or None if it has no calcChain entries."""
+        calc_chain = self._workbook()["calc_chain"]
+        if calc_chain is None:
+            return None
+        try:
+            rule = self._rule_results(self.file_index.path(calc_chain))["calc_chain"]
+        except Exception:
+            return None  # Reported by validate_xml
+        return rule.cells(sheet_id)
+
+    def _part_count(self, name, rule_name):
+        """Return the count a rule took of a part: 0 if the part is absent, None if unreadable."""
+        if name is None:
+            return 0
+        try:
+            return self._rule_results(self.file_index.path(name))[rule_name].count
+        except Exception:
+            return None  # Reported by validate_xml
+
+    def _workbook(self):
+        """Return the sheets, defined names and relationships of the workbook.
+
+        The workbook part is found through the package relationships. Returns
+        None if they do not lead to a SpreadsheetML workbook; the result is
+        read once.
+        """
+        if self._workbook_info is None:
+            self._workbook_info = self._read_workbook() or {}
+        return self._workbook_info or None
+
+    def _read_workbook(self):
+        workbook_part = "xl/workbook.xml"
+        if "_rels/.rels" in self.file_index:
+            for rel_type, target, _ in self._read_relationships("_rels/.rels").values():
+                if rel_type == "officeDocument" and target:
+                    workbook_part = target
+                    break
+        if workbook_part not in self.file_index:
+            return None
+
+        ns = f"{{{self.SPREADSHEETML_NAMESPACE}}}"
+        root = self.package.getroot(self.file_index.path(workbook_part))
+        if root.tag != f"{ns}workbook":
+            return None
+        sheets = [
+            {
+                "name": sheet.get("name", ""),
+                "sheet_id": sheet.get("sheetId"),
+                "r_id": sheet.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id"),
+                "line": sheet.sourceline,
+            }
+            for sheet in root.findall(f"{ns}sheets/{ns}sheet")
+        ]
+        defined_names = [
+            {
+                "name": defined_name.get("name", ""),
+                "local_sheet_id": defined_name.get("localSheetId"),
+                "text": defined_name.text or "",
+                "line": defined_name.sourceline,
+            }
+            for defined_name in root.findall(f"{ns}definedNames/{ns}definedName")
+        ]
+
+        rels_part = RelationshipGraph.rels_part_of(workbook_part)
+        relationships = {}
+        if rels_part in self.file_index:
+            relationships = self._read_relationships(rels_part)
+
+        def related_part(rel_type):
+            for candidate_type, target, _ in relationships.values():
+                if candidate_type == rel_type and target in self.file_index:
+                    return target
+            return None
+
+        return {
+            "part": workbook_part,
+            "rels_part": rels_part,
+            "sheets": sheets,
+            "defined_names": defined_names,
+            "relationships": relationships,
+            "shared_strings": related_part("sharedStrings"),
+            "styles": related_part("styles"),
+            "calc_chain": related_part("calcChain"),
+            # Part name -> sheetId of the sheets holding cells
+            "cell_sheets": {
+                relationships[sheet["r_id"]][1]: sheet["sheet_id"]
+                for sheet in sheets
+                if sheet["r_id"] in relationships
+                and relationships[sheet["r_id"]][0]
+                in self.CELL_SHEET_RELATIONSHIP_TYPES
+                and relationships[sheet["r_id"]][1]
+            },
+        }
+
+    def _read_relationships(self, rels_part):
+        """Return {Id: (type name, target part name or None, line)} of a .rels part.
+
+        Targets of external relationships, and targets outside the package,
+        are None.
+        """
+        return {
+            rel.id: (rel.type_name, None if rel.external else rel.target, rel.line)
+            for rel in self._relationship_graph().relationships_in(rels_part)
+        }
+
+    def validate_sheet_relationships(self):
+        """Validate that every sheet in the workbook points to an existing sheet part."""
+        errors = []
+
+        try:
+            workbook = self._workbook()
+        except Exception as e:
+            print(f"FAILED - Could not read the workbook: {e}")
+            return False
+        if workbook is None:
+            print("FAILED - Found 1 sheet relationship errors:")
+            print(
+                "  _rels/.rels: The package relationships do not lead to a "
+                "SpreadsheetML workbook part"
+            )
+            return False
+
+        workbook_part = workbook["part"]
+        relationships = workbook["relationships"]
+        seen_names = {}
+        for sheet in workbook["sheets"]:
+            name, r_id, line = sheet["name"], sheet["r_id"], sheet["line"]
+
+            # Sheet names must be valid and unique (case-insensitively)
+            if (
+                not name
+                or len(name) > self.MAX_SHEET_NAME_LENGTH
+                or set(name) & self.INVALID_SHEET_NAME_CHARACTERS
+                or name.startswith("'")
+                or name.endswith("'")
+            ):
+                errors.append(
+                    f"  {workbook_part}: Line {line}: Invalid sheet name '{name}' "
+                    f"(1-{self.MAX_SHEET_NAME_LENGTH} characters, none of "
+                    f"{''.join(sorted(self.INVALID_SHEET_NAME_CHARACTERS))}, "
+                    f"not starting or ending with ')"
+                )
+            if name.lower() in seen_names:
+                errors.append(
+                    f"  {workbook_part}: Line {line}: Duplicate sheet name '{name}' "
+                    f"(first used at line {seen_names[name.lower()]})"
+                )
+            else:
+                seen_names[name.lower()] = line
+
+            # The sheet's relationship must exist and point to a sheet part
+            if not r_id:
+                errors.append(
+                    f"  {workbook_part}: Line {line}: Sheet '{name}' has no r:id"
+                )
+                continue
+            if r_id not in relationships:
+                errors.append(
+                    f"  {workbook_part}: Line {line}: Sheet '{name}' references "
+                    f"'{r_id}', which is not in {workbook['rels_part']}"
+                )
+                continue
+            rel_type, target, _ = relationships[r_id]
+            if rel_type not in self.SHEET_RELATIONSHIP_TYPES:
+                errors.append(
+                    f"  {workbook_part}: Line {line}: Sheet '{name}' references "
+                    f"'{r_id}', which points to '{rel_type}' instead of a sheet"
+                )
+            elif target not in self.file_index:
+                errors.append(
+                    f"  {workbook_part}: Line {line}: Sheet '{name}' references "
+                    f"'{r_id}', whose target part does not exist"
+                )
+
+        if errors:
+            print(f"FAILED - Found {len(errors)} sheet relationship errors:")
+            for error in errors:
+                print(error)
+            return False
+        else:
+            if self.verbose:
+                print("PASSED - All sheets reference existing sheet parts")
+            return True
+
+    def validate_cell_indices(self):
+        """Validate that cells reference existing shared strings and cell formats."""
+        errors = []
+
+        try:
+            workbook = self._workbook()
+        except Exception as e:
+            print(f"FAILED - Could not read the workbook: {e}")
+            return False
+
+        for name in workbook["cell_sheets"] if workbook else ():
+            xml_file = self.file_index.path(name)
+            try:
+                errors.extend(self._rule_results(xml_file)["cells"].errors)
+
+            except (lxml.etree.XMLSyntaxError, Exception) as e:
+                errors.append(f"  {name}: Error: {e}")
+
+        if errors:
+            print(f"FAILED - Found {len(errors)} cell index errors:")
+            for error in errors:
+                print(error)
+            return False
+        else:
+            if self.verbose:
+                print(
+                    "PASSED - All cells reference existing shared strings and formats"
+                )
+            return True
+
+    def validate_defined_names(self):
+        """Validate defined names: valid, unique per scope, with existing sheets."""
+        errors = []
+
+        try:
+            workbook = self._workbook()
+        except Exception as e:
+            print(f"FAILED - Could not read the workbook: {e}")
+            return False
+        if workbook is None:
+            if self.verbose:
+                print("PASSED - No workbook found")
+            return True
+
+        workbook_part = workbook["part"]
+        sheet_names = {sheet["name"].lower() for sheet in workbook["sheets"]}
+        seen = {}
+        for defined_name in workbook["defined_names"]:
+            name, scope = defined_name["name"], defined_name["local_sheet_id"]
+            line = defined_name["line"]
+
+            # Built-in names (_xlnm.Print_Area, ...) follow the same rules
+            if not self.DEFINED_NAME_PATTERN.match(name) or self._is_cell_like(name):
+                errors.append(
+                    f"  {workbook_part}: Line {line}: Invalid defined name '{name}'"
+                )
+
+            if scope is not None and (
+                not scope.isdigit() or int(scope) >= len(workbook["sheets"])
+            ):
+                errors.append(
+                    f"  {workbook_part}: Line {line}: Defined name '{name}' has "
+                    f"localSheetId {scope}, but the workbook has "
+                    f"{len(workbook['sheets'])} sheet(s)"
+                )
+
+            key = (name.lower(), scope)
+            if key in seen:
+                errors.append(
+                    f"  {workbook_part}: Line {line}: Duplicate defined name '{name}' "
+                    f"in the same scope (first defined at line {seen[key]})"
+                )
+            else:
+                seen[key] = line
+
+            for sheet in self._referenced_sheets(defined_name["text"]):
+                if sheet.lower() not in sheet_names:
+                    errors.append(
+                        f"  {workbook_part}: Line {line}: Defined name '{name}' "
+                        f"refers to sheet '{sheet}', which does not exist"
+                    )
+
+        if errors:
+            print(f"FAILED - Found {len(errors)} defined name errors:")
+            for error in errors:
+                print(error)
+            return False
+        else:
+            if self.verbose:
+                print("PASSED - All defined names are valid")
+            return True
+
+    def _is_cell_like(self, name):
+        """Return True if Excel would read a name as a cell reference."""
+        match = self.CELL_LIKE_NAME_PATTERN.match(name)
+        if not match:
+            return False
+        letters, row = match.groups()
+        if letters is None:
+            return True  # R1C1-style
+        return (
+            _column_number(letters) <= self.MAX_COLUMN and 1 <= int(row) <= self.MAX_ROW
+        )
+
+    def _referenced_sheets(self, formula):
+        """Return the names of the sheets a formula refers to, in order."""
+        # String literals cannot contain references
+        formula = re.sub(r'"(?:[^"]|"")*"', '""', formula)
+        sheets = []
+        for match in self.SHEET_REFERENCE_PATTERN.finditer(formula):
+            quoted, plain = match.groups()
+            preceding = formula[match.start() - 1] if match.start() else ""
+            # References into other workbooks ([1]Sheet1!) and #REF! are not checked
+            if preceding in ("]", "#") or (quoted and quoted.startswith("[")):
+                continue
+            name = quoted.replace("''", "'") if quoted else plain
+            # 3-D references name the first and last sheet of a range
+            sheets.extend(name.split(":"))
+        return sheets
+
+    def validate_calc_chain(self):
+        """Validate that every calcChain entry points to a formula cell of an existing sheet."""
+        errors = []
+
+        try:
+            workbook = self._workbook()
+        except Exception as e:
+            print(f"FAILED - Could not read the workbook: {e}")
+            return False
+        if workbook is None or workbook["calc_chain"] is None:
+            if self.verbose:
+                print("PASSED - No calculation chain found")
+            return True
+
+        calc_chain = workbook["calc_chain"]
+        try:
+            rule = self._rule_results(self.file_index.path(calc_chain))["calc_chain"]
+        except Exception as e:
+            print(f"FAILED - Could not read {calc_chain}: {e}")
+            return False
+
+        # (entry index, message), to report in calcChain order
+        entry_errors = [
+            (index, f"  {calc_chain}: Line {rule.lines[index]}: {message}")
+            for index, message in rule.entry_errors
+        ]
+        for name, sheet_id in workbook["cell_sheets"].items():
+            cells = rule.cells(sheet_id)
+            if cells is None:
+                continue
+            try:
+                # Formula cells are matched against cells during the sheet's pass
+                self._rule_results(self.file_index.path(name))
+            except Exception:
+                continue  # Reported by validate_xml
+            entry_errors.extend(
+                (
+                    index,
+                    f"  {calc_chain}: Line {rule.lines[index]}: Entry for {ref} in "
+                    f"{name}, but that cell has no formula",
+                )
+                for index, ref in cells.unmatched()
+            )
+        errors = [error for _, error in sorted(entry_errors)]
+
+        if errors:
+            print(f"FAILED - Found {len(errors)} calculation chain errors:")
+            for error in errors:
+                print(error)
+            print("Remove stale entries or delete calcChain.xml; Excel rebuilds it.")
+            return False
+        else:
+            if self.verbose:
+                print("PASSED - All calculation chain entries point to formula cells")
+            return True
+
+
+S_NAMESPACE = XLSXSchemaValidator.SPREADSHEETML_NAMESPACE
+
+# Cell references such as A1 or $B$2
+CELL_REFERENCE_PATTERN = re.compile(r"^\$?([A-Za-z]{1,3})\$?(\d+)$")
+
+# More than the largest column number a 3-letter reference can have (ZZZ)
+KEY_COLUMNS = 1 << 15
+
+
+def _cell_name(column, row):
+    """Return the A1-style name of a cell from its 1-based column and row."""
+    letters = ""
+    while column:
+        column, remainder = divmod(column - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return f"{letters}{row}"
+
+
+def _cell_key(column, row):
+    """Return an integer identifying a cell, ordered by row and then column."""
+    return row * KEY_COLUMNS + column
+
+
+def _column_number(letters):
+    number = 0
+    for letter in letters.upper():
+        number = number * 26 + ord(letter) - 64
+    return number
+
+
+class SharedStringCountRule(Rule):
+    """Counts the strings of the shared string table."""
+
+    tags = (f"{{{S_NAMESPACE}}}si",)
+    table_tag = f"{{{S_NAMESPACE}}}sst"
+
+    def __init__(self, part):
+        super().__init__(part)
+        self.count = 0
+
+    def start(self, elem, context):
+        if context.stack and context.stack[-1].tag == self.table_tag:
+            self.count += 1
+
+
+class CellFormatCountRule(Rule):
+    """Counts the cell formats (cellXfs) of the stylesheet."""
+
+    tags = (f"{{{S_NAMESPACE}}}xf",)
+    cell_formats_tag = f"{{{S_NAMESPACE}}}cellXfs"
+
+    def __init__(self, part):
+        super().__init__(part)
+        self.count = 0
+
+    def start(self, elem, context):
+        if context.stack and context.stack[-1].tag == self.cell_formats_tag:
+            self.count += 1
+
+
+class CellRule(Rule):
+    """Checks the shared string and cell format indices of a worksheet's cells.
+
+    Cells without an r attribute follow the previous cell of their row. Only
+    errors are kept; formula cells are marked in the sheet's CalcChainCells,
+    if it has any.
+    """
+
+    row_tag = f"{{{S_NAMESPACE}}}row"
+    cell_tag = f"{{{S_NAMESPACE}}}c"
+    value_tag = f"{{{S_NAMESPACE}}}v"
+    formula_tag = f"{{{S_NAMESPACE}}}f"
+    tags = (row_tag, cell_tag, value_tag, formula_tag)
+
+    def __init__(self, part, shared_strings, cell_formats, calc_chain=None):
+        """
+        Args:
+            part: Path of the worksheet relative to the package root
+            shared_strings: Number of shared strings (None: unknown, not checked)
+            cell_formats: Number of cell formats (None: unknown, not checked)
+            calc_chain: CalcChainCells of the sheet, to mark its formula cells in
+        """
+        super().__init__(part)
+        self.shared_strings = shared_strings
+        self.cell_formats = cell_formats
+        self.calc_chain = calc_chain
+        self.row = 0
+        self.column = 0
+        self.cell = None  # (name, type, line, key) of the current cell
+
+    def start(self, elem, context):
+        tag = elem.tag
+        if tag == self.row_tag:
+            r = elem.get("r")
+            self.row = int(r) if r and r.isdigit() else self.row + 1
+            self.column = 0
+        elif tag == self.cell_tag:
+            self._start_cell(elem)
+        elif (
+            tag == self.formula_tag
+            and self.calc_chain is not None
+            and self.cell is not None
+            and context.stack[-1].tag == self.cell_tag
+        ):
+            self.calc_chain.mark(self.cell[3])
+
+    def end(self, elem, context):
+        if (
+            elem.tag != self.value_tag
+            or self.cell is None
+            or self.cell[1] != "s"
+            or self.shared_strings is None
+            or context.stack[-1].tag != self.cell_tag
+        ):
+            return
+        name, _, line, _ = self.cell
+        value = (elem.text or "").strip()
+        if not value.isdigit() or int(value) >= self.shared_strings:
+            self.errors.append(
+                f"  {self.part}: Line {line}: Cell {name} references shared string "
+                f"{value!r}, but the shared string table has {self.shared_strings} "
+                f"string(s)"
+            )
+
+    def _start_cell(self, elem):
+        match = CELL_REFERENCE_PATTERN.match(elem.get("r", ""))
+        if match:
+            self.column = _column_number(match.group(1))
+            name = f"{match.group(1).upper()}{match.group(2)}"
+            key = _cell_key(self.column, int(match.group(2)))
+        else:
+            self.column += 1
+            name = _cell_name(self.column, self.row)
+            key = _cell_key(self.column, self.row)
+        self.cell = (name, elem.get("t", "n"), elem.sourceline, key)
+
+        style = elem.get("s")
+        if (
+            style is not None
+            and self.cell_formats is not None
+            and style.isdigit()
+            and int(style) >= self.cell_formats
+        ):
+            self.errors.append(
+                f"  {self.part}: Line {elem.sourceline}: Cell {name} uses cell format "
+                f"{style}, but the stylesheet has {self.cell_formats} cell format(s)"
+            )
+
+
+class CalcChainRule(Rule):
+    """Collects the entries of the calculation chain, by sheet.
+
+    An entry without i belongs to the same sheet as the entry before it.
+    Entries are numbered in document order. Those without a sheet, whose
+    sheet is not in sheet_ids, or whose reference is not a cell, are kept as
+    errors; the others go to the CalcChainCells of their sheet.
+    """
+
+    tags = (f"{{{S_NAMESPACE}}}c",)
+
+    def __init__(self, part, sheet_ids):
+        super().__init__(part)
+        self.sheet_ids = sheet_ids
+        self.lines = array("L")  # Line of each entry
+        self.entry_errors = []  # (entry index, message)
+        self.sheet_id = None
+        self._cells = {}  # Sheet id -> CalcChainCells
+
+    def start(self, elem, context):
+        index = len(self.lines)
+        self.lines.append(elem.sourceline or 0)
+        self.sheet_id = elem.get("i", self.sheet_id)
+        ref = elem.get("r", "")
+        if self.sheet_id is None:
+            self.entry_errors.append(
+                (index, f"Entry for {ref} has no sheet id (i) to inherit")
+            )
+            return
+        if self.sheet_id not in self.sheet_ids:
+            self.entry_errors.append(
+                (
+                    index,
+                    f"Entry for {ref} refers to sheet id {self.sheet_id}, which is "
+                    "not a worksheet of the workbook",
+                )
+            )
+            return
+        match = CELL_REFERENCE_PATTERN.match(ref)
+        key = None
+        if match:
+            key = _cell_key(_column_number(match.group(1)), int(match.group(2)))
+        # Keys are stored as 64-bit integers; no sheet has rows that far down
+        if key is None or key.bit_length() > 62:
+            self.entry_errors.append(
+                (index, f"Entry for {ref} is not a cell reference")
+            )
+            return
+        cells = self._cells.get(self.sheet_id)
+        if cells is None:
+            cells = self._cells[self.sheet_id] = CalcChainCells()
+        cells.add(key, index)
+
+    def cells(self, sheet_id):
+        """Return the CalcChainCells of a sheet, or None if it has no entries."""
+        return self._cells.get(sheet_id)
+
+
+class CalcChainCells:
+    """The calcChain entries of one sheet, matched against its formula cells.
+
+    Entries are kept as cell keys (see _cell_key) in two arrays, sorted by key
+    on first lookup, so a sheet's formula cells are matched in O(log n) each
+    without collecting them.
+    """
+
+    def __init__(self):
+        self.keys = array("q")
+        self.indices = array("L")  # Entry index of each key
+        self.matched = None  # Whether each key has a formula cell, once sorted
+
+    def add(self, key, index):
+        self.keys.append(key)
+        self.indices.append(index)
+
+    def mark(self, key):
+        """Record a formula cell, matching the entries for it."""
+        if self.matched is None:
+            self._sort()
+        position = bisect_left(self.keys, key)
+        while position < len(self.keys) and self.keys[position] == key:
+            self.matched[position] = 1
+            position += 1
+
+    def unmatched(self):
+        """Yield (entry index, cell name) of the entries without a formula cell."""
+        if self.matched is None:
+            self._sort()
+        for position, matched in enumerate(self.matched):
+            if not matched:
+                row, column = divmod(self.keys[position], KEY_COLUMNS)
+                yield self.indices[position], _cell_name(column, row)
+
+    def _sort(self):
+        order = sorted(range(len(self.keys)), key=self.keys.__getitem__)
+        self.keys = array("q", (self.keys[i] for i in order))
+        self.indices = array("L", (self.indices[i] for i in order))
+        self.matched = bytearray(len(self.keys))
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")